@@ -162,8 +162,13 @@ async function initTopicPage() {
     // Load current topic
     const topic = await topicLoader.loadTopic(topicId);
     
-    // Pre-load term links for linking in materials (load topic-specific terms)
-    await loadTermLinks(topicId);
+    // Pre-load term links for linking in materials (load topic-specific terms);
+    // pre-linked topics already have the links in their texts
+    if (topic && topic.prelinked) {
+      currentTopicTermLinks = {};
+    } else {
+      await loadTermLinks(topicId);
+    }
     if (!topic) {
       console.error(`Otázka ${topicId} nenalezena`);
       const titleElement = document.getElementById('topicTitle');
@@ -479,7 +484,8 @@ function renderTopicContent(topic) {
   if (topic.audio) {
     const audioContent = document.getElementById('audioContent');
     if (audioContent) {
-      const hasTranscript = topic.audio.transcript && topic.audio.transcript.trim() !== '';
+      // Transcript is either inline (older topics) or in a separate file loaded on first open
+      const hasTranscript = hasInlineTranscript(topic.audio) || Boolean(topic.audio.transcriptSource);
       
       // Check if we have multiple audio files
       const audioFiles = topic.audio.files && Array.isArray(topic.audio.files) ? topic.audio.files : null;
@@ -489,7 +495,7 @@ function renderTopicContent(topic) {
       if (audioFiles && audioFiles.length > 1) {
         // Render multiple audio files
         audioHtml = audioFiles.map((audioFile, index) => {
-          const fileHasTranscript = audioFile.transcript && audioFile.transcript.trim() !== '';
+          const fileHasTranscript = hasInlineTranscript(audioFile) || Boolean(audioFile.transcriptSource);
           const transcriptId = `transcriptToggle_${index}`;
           const transcriptContentId = `transcriptContent_${index}`;
           
@@ -503,7 +509,7 @@ function renderTopicContent(topic) {
             ${fileHasTranscript ? `
               <div class="audio-transcript">
                 <button class="audio-transcript-toggle" id="${transcriptId}">Zobrazit přepis</button>
-                <div class="audio-transcript-content" id="${transcriptContentId}">${markdownToHtml(audioFile.transcript)}</div>
+                <div class="audio-transcript-content" id="${transcriptContentId}">${hasInlineTranscript(audioFile) ? markdownToHtml(audioFile.transcript) : ''}</div>
               </div>
             ` : ''}
           </div>
@@ -513,6 +519,7 @@ function renderTopicContent(topic) {
         // Single audio file (backward compatibility)
         const audioSrc = audioFiles && audioFiles.length === 1 ? audioFiles[0].src : (topic.audio.src || '');
         const audioTitle = audioFiles && audioFiles.length === 1 ? audioFiles[0].title : (topic.audio.title || 'Audio');
+        const transcriptSource = topic.audio.transcriptSource || (audioFiles && audioFiles.length === 1 ? audioFiles[0].transcriptSource : null);
         
         audioHtml = `
           <div class="audio-item">
@@ -521,10 +528,10 @@ function renderTopicContent(topic) {
               <source src="${escapeHtml(audioSrc)}" type="audio/mpeg">
               Váš prohlížeč nepodporuje audio element.
             </audio>
-            ${hasTranscript ? `
+            ${hasTranscript || transcriptSource ? `
               <div class="audio-transcript">
                 <button class="audio-transcript-toggle" id="transcriptToggle">Zobrazit přepis</button>
-                <div class="audio-transcript-content" id="transcriptContent">${markdownToHtml(topic.audio.transcript)}</div>
+                <div class="audio-transcript-content" id="transcriptContent">${hasInlineTranscript(topic.audio) ? markdownToHtml(topic.audio.transcript) : ''}</div>
               </div>
             ` : ''}
           </div>
@@ -537,38 +544,18 @@ function renderTopicContent(topic) {
       if (audioFiles && audioFiles.length > 1) {
         // Multiple audio files - setup toggles for each
         audioFiles.forEach((audioFile, index) => {
-          if (audioFile.transcript && audioFile.transcript.trim() !== '') {
-            const toggle = document.getElementById(`transcriptToggle_${index}`);
-            const content = document.getElementById(`transcriptContent_${index}`);
-            if (toggle && content) {
-              toggle.addEventListener('click', () => {
-                const isVisible = content.classList.contains('show');
-                if (isVisible) {
-                  content.classList.remove('show');
-                  toggle.textContent = 'Zobrazit přepis';
-                } else {
-                  content.classList.add('show');
-                  toggle.textContent = 'Skrýt přepis';
-                }
-              });
-            }
+          const toggle = document.getElementById(`transcriptToggle_${index}`);
+          const content = document.getElementById(`transcriptContent_${index}`);
+          if (toggle && content) {
+            setupTranscriptToggle(toggle, content, hasInlineTranscript(audioFile) ? null : audioFile.transcriptSource);
           }
         });
-      } else if (hasTranscript) {
+      } else {
         // Single audio file
         const toggle = document.getElementById('transcriptToggle');
         const content = document.getElementById('transcriptContent');
         if (toggle && content) {
-          toggle.addEventListener('click', () => {
-            const isVisible = content.classList.contains('show');
-            if (isVisible) {
-              content.classList.remove('show');
-              toggle.textContent = 'Zobrazit přepis';
-            } else {
-              content.classList.add('show');
-              toggle.textContent = 'Skrýt přepis';
-            }
-          });
+          setupTranscriptToggle(toggle, content, hasInlineTranscript(topic.audio) ? null : transcriptSource);
         }
       }
     }
@@ -1108,6 +1095,16 @@ async function loadTermLinks(topicId = null) {
     return termLinksCache[cacheKey];
   }
 
+  // Build step output: one merged table, already sorted by length (scripts/prerender_term_links.py)
+  if (topicId) {
+    const sortedTerms = await loadTermTable(topicId);
+    if (sortedTerms) {
+      termLinksCache[cacheKey] = sortedTerms;
+      currentTopicTermLinks = sortedTerms;
+      return sortedTerms;
+    }
+  }
+
   let allTerms = {};
 
   try {
@@ -1155,6 +1152,31 @@ async function loadTermLinks(topicId = null) {
   return sortedTerms;
 }
 
+/**
+ * Load the merged term table of a topic written at build time
+ * The table lists terms longest first, each with an index into a shared URL table.
+ * @param {string} topicId - Topic ID (e.g., 'T02')
+ * @returns {Promise<Object|null>} Object mapping terms to URLs in table order, or null if there is no table
+ */
+async function loadTermTable(topicId) {
+  try {
+    const response = await fetch(`data/prelinked/terms/${topicId}_terms.json`);
+    if (!response.ok) {
+      return null;
+    }
+    const table = await response.json();
+    const terms = {};
+    table.terms.forEach((term, index) => {
+      terms[term] = table.urls[table.links[index]];
+    });
+    console.log(`Načteno ${table.terms.length} termínů pro ${topicId}`);
+    return terms;
+  } catch (error) {
+    console.warn(`Chyba při načítání tabulky termínů pro ${topicId}:`, error);
+    return null;
+  }
+}
+
 /**
  * Add links to terms in already-escaped HTML text
  * This function does NOT modify the original text, only the HTML output
@@ -1222,6 +1244,56 @@ function addTermLinksToHtml(html, termLinks) {
   return result;
 }
 
+/**
+ * Check whether an audio entry has a non-empty inline transcript
+ * @param {Object} audioEntry - topic.audio or one of topic.audio.files
+ * @returns {boolean}
+ */
+function hasInlineTranscript(audioEntry) {
+  return Boolean(audioEntry && audioEntry.transcript && audioEntry.transcript.trim() !== '');
+}
+
+/**
+ * Setup show/hide toggle for an audio transcript.
+ * Transcripts stored in a separate file are fetched only when the toggle is first opened.
+ * @param {HTMLElement} toggle - Toggle button
+ * @param {HTMLElement} content - Transcript container
+ * @param {string|null} transcriptSource - URL of the transcript file (null for inline transcripts)
+ */
+function setupTranscriptToggle(toggle, content, transcriptSource) {
+  let loaded = !transcriptSource;
+  
+  toggle.addEventListener('click', async () => {
+    const isVisible = content.classList.contains('show');
+    if (isVisible) {
+      content.classList.remove('show');
+      toggle.textContent = 'Zobrazit přepis';
+      return;
+    }
+    
+    content.classList.add('show');
+    toggle.textContent = 'Skrýt přepis';
+    
+    if (!loaded) {
+      loaded = true;
+      content.textContent = 'Načítání přepisu...';
+      try {
+        const response = await fetch(transcriptSource);
+        if (!response.ok) {
+          throw new Error(`${response.status} ${response.statusText}`);
+        }
+        const transcriptText = await response.text();
+        content.innerHTML = markdownToHtml(transcriptText.trim());
+      } catch (error) {
+        console.warn(`Nepodařilo se načíst přepis z ${transcriptSource}:`, error);
+        content.textContent = 'Přepis se nepodařilo načíst.';
+        // Allow another attempt on the next open
+        loaded = false;
+      }
+    }
+  });
+}
+
 /**
  * Escape HTML to prevent XSS
  * @param {string} text - Text to escape
@@ -1259,6 +1331,10 @@ function markdownToHtml(markdown) {
   html = html.replace(/\n\n/g, '</p><p>');
   html = html.replace(/\n/g, '<br>');
   
+  // Render term links added at build time as [term](url) (scripts/prerender_term_links.py)
+  html = html.replace(/\[([^\[\]\n]+)\]\((https?:\/\/[^\s()]+)\)/g,
+    '<a href="$2" target="_blank" rel="noopener noreferrer" class="term-link">$1</a>');
+  
   // Add term links to HTML (this does NOT modify the original text)
   // Use currentTopicTermLinks which is set when loading terms for a topic
   if (currentTopicTermLinks && Object.keys(currentTopicTermLinks).length > 0) {
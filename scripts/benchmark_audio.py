@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Zátěžový test generátoru audia bez přístupu k síti
+
+Spustí celý řetězec generate_audio.py (plánování, cache vět, skládání MP3 po rámcích,
+atomický zápis) nad syntetickou dávkou částí s offline backendem "silent", který
+vrací tiché MP3 rámce s realistickou latencí. Výstup jde do dočasného adresáře,
+skutečné soubory v assets/audio ani data/topics se nemění.
+
+Použití:
+    python scripts/benchmark_audio.py --parts 500 --concurrency 8 --latency 0.3
+"""
+
+import sys
+import io
+import time
+import asyncio
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+# Fix Windows console encoding for Czech characters
+if sys.platform == "win32":
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+import generate_audio
+from tts_backends import SilentTTSBackend
+from tts_cache import SentenceCache
+
+
+def build_synthetic_parts(count: int, output_dir: Path) -> list[dict]:
+    """
+    Sestaví dávku částí z reálných audio-scénářů (cyklicky, dokud jich není count).
+
+    Každá část dostane vlastní úvodní větu, takže se dávka chová jako skutečný kurz:
+    opakující se obsah se trefí do cache vět, unikátní věty se syntetizují.
+    """
+    scripts = sorted(generate_audio.AUDIO_SCRIPTS_DIR.glob("T*.txt"))
+    texts = [generate_audio.read_script(path) for path in scripts]
+    corpus = [(path, text) for path, text in zip(scripts, texts) if text]
+    if not corpus:
+        raise RuntimeError(f"V {generate_audio.AUDIO_SCRIPTS_DIR} nejsou zadne scenare")
+
+    parts = []
+    for i in range(count):
+        script_path, text = corpus[i % len(corpus)]
+        audio_filename = f"Benchmark-{i + 1:05d}.mp3"
+        parts.append({
+            "script_path": script_path,
+            "text": f"Toto je testovací část číslo {i + 1}. {text}",
+            "output_path": output_dir / audio_filename,
+            "audio_filename": audio_filename,
+            "audio_title": f"Benchmark {i + 1}",
+            "part": i + 1,
+        })
+    return parts
+
+
+async def run_pass(parts: list[dict], backend, cache, concurrency: int, scheduler) -> dict:
+    """Vygeneruje všechny části jednou dávkou a vrátí naměřené hodnoty"""
+    semaphore = asyncio.Semaphore(concurrency)
+    scheduler.retried_keys.clear()
+    manifest = {"version": generate_audio.MANIFEST_VERSION, "files": {}}
+    progress = generate_audio.SynthesisProgress(len(parts))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        generate_audio.generate_part_async(
+            part, generate_audio.CZECH_VOICES["female"], "+0%", "+0Hz",
+            semaphore, manifest, True, cache, progress, backend, scheduler
+        )
+        for part in parts
+    ))
+    elapsed = time.perf_counter() - started
+    return {
+        "elapsed": elapsed,
+        "generated": sum(1 for status, _, _ in results if status == "generated"),
+        "failed": sum(1 for status, _, _ in results if status == "failed"),
+        "retried": len(scheduler.retried_keys),
+        "chars": sum(len(part["text"]) for part in parts),
+        "bytes": progress.bytes_written,
+        "audio_seconds": progress.audio_seconds,
+    }
+
+
+def print_pass(label: str, stats: dict, cache):
+    """Vypíše výsledky jednoho průchodu"""
+    elapsed = stats["elapsed"] or 1e-9
+    print(f"\n{label}:")
+    print(f"  Casti: {stats['generated']} vygenerovano, {stats['failed']} selhalo, "
+          f"{stats['retried']} s opakovanim")
+    print(f"  Celkovy cas: {stats['elapsed']:.2f} s")
+    print(f"  Propustnost: {stats['generated'] / elapsed:.1f} casti/s, {stats['chars'] / elapsed:.0f} znaku/s")
+    print(f"  Zapsano: {stats['bytes'] / (1024 * 1024):.1f} MB, {stats['audio_seconds'] / 3600:.2f} h audia")
+    if cache:
+        print(f"  Cache vet: {cache.hits} zasahu, {cache.misses} vypadku")
+
+
+def peak_memory_mb() -> float:
+    """Vrátí maximální využití paměti procesu v MB (0 pokud není k dispozici)"""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux vrací kB, macOS bajty
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def main_async(args: argparse.Namespace) -> bool:
+    """Spustí měření; vrátí False, pokud kontrola velikosti cache vět selhala"""
+    consistent = True
+    backend = SilentTTSBackend(
+        latency=args.latency, jitter=args.jitter, bitrate=args.bitrate, failure_rate=args.failure_rate
+    )
+    # Krátké čekání před opakováním, aby simulované chyby neprodlužovaly měření o desítky sekund
+    scheduler = generate_audio.SynthesisScheduler(args.rps, args.max_in_flight, base_delay=0.05, max_delay=1.0)
+
+    with tempfile.TemporaryDirectory(prefix="audio-benchmark-") as tmp:
+        tmp_dir = Path(tmp)
+        output_dir = tmp_dir / "audio"
+        output_dir.mkdir()
+        cache = None if args.no_cache else SentenceCache(tmp_dir / "cache", args.cache_mb * 1024 * 1024)
+        parts = build_synthetic_parts(args.parts, output_dir)
+
+        print(f"Benchmark: {len(parts)} casti, soubeznost {args.concurrency}, "
+              f"latence {args.latency:.2f} s, bitrate {args.bitrate} kbps")
+
+        passes = [("Studena cache", parts)]
+        if args.warm and cache:
+            passes.append(("Tepla cache", parts))
+
+        for label, batch in passes:
+            if cache:
+                cache.hits = cache.misses = 0
+            output = io.StringIO() if args.quiet else sys.stdout
+            with contextlib.redirect_stdout(output):
+                stats = await run_pass(batch, backend, cache, args.concurrency, scheduler)
+            print_pass(label, stats, cache)
+            # Sledovaná velikost musí po zásazích, zápisech i mazání sedět se záznamy,
+            # jinak by LRU limit mazal celou cache
+            if cache and not cache.size_consistent():
+                print(f"[ERROR] Sledovana velikost cache vet nesouhlasi se souctem zaznamu")
+                consistent = False
+
+        scheduler.print_stats()
+
+    print(f"\nMaximalni vyuziti pameti: {peak_memory_mb():.1f} MB")
+    return consistent
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Zátěžový test generátoru audia s offline TTS backendem")
+    parser.add_argument("--parts", type=int, default=500, help="počet generovaných částí (výchozí 500)")
+    parser.add_argument("--concurrency", type=int, default=generate_audio.DEFAULT_CONCURRENCY,
+                        help="počet současně generovaných částí")
+    parser.add_argument("--latency", type=float, default=0.3, help="latence jedné syntézy v sekundách")
+    parser.add_argument("--jitter", type=float, default=0.1, help="náhodný rozptyl latence v sekundách")
+    parser.add_argument("--bitrate", type=int, default=48, help="bitrate tichých MP3 rámců v kbps")
+    parser.add_argument("--rps", type=float, default=1000.0,
+                        help="limit TTS požadavků za sekundu (výchozí 1000, tj. prakticky bez omezení)")
+    parser.add_argument("--max-in-flight", type=int, default=64,
+                        help="limit současně běžících TTS požadavků (výchozí 64)")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="podíl náhodně selhávajících syntéz (0-1) pro test opakování")
+    parser.add_argument("--cache-mb", type=int, default=500, help="limit cache vět v MB")
+    parser.add_argument("--no-cache", action="store_true", help="měřit bez cache vět")
+    parser.add_argument("--warm", action="store_true", help="spustit druhý průchod s naplněnou cache")
+    parser.add_argument("--quiet", action="store_true", help="potlačit výpis jednotlivých částí")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    try:
+        if not asyncio.run(main_async(args)):
+            sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n\n[ERROR] Preruseno uzivatelem")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
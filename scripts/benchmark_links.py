@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Throughput benchmark of the link checkers without internet access.
+
+Runs validate_resource_links.py, check_wiki_links.py and
+fix_wikipedia_links_improved.py (their corpus-wide check functions, the same
+code path as a real run) against synthetic corpora of 1k, 10k and 100k links
+served by the local mock web (mock_web.py). Corpus files and reports go to a
+temporary directory; data/ and the link status store are not touched.
+
+Every checker and corpus size runs in a fresh subprocess, so the peak memory
+of one run is not inflated by the previous ones. For each run the benchmark
+records wall time, requests per second (as seen by the mock web), links per
+second and peak memory; --output saves the results as JSON for comparing
+two revisions of the checking engine.
+
+Usage:
+    python scripts/benchmark_links.py --sizes 1000,10000 --latency 0.02
+    python scripts/benchmark_links.py --checkers validate --sizes 100000 --output bench.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Fix Windows console encoding for Czech characters
+if sys.platform == "win32":
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+from mock_web import MockWeb, add_arguments as add_mock_arguments, config_from_args
+
+CHECKERS = ('validate', 'check_wiki', 'fix_wiki')
+DEFAULT_SIZES = '1000,10000,100000'
+
+# Synthetic corpora resemble the real data: terms link mostly to cs.wikipedia.org
+# and each URL is used about twice; resources point to many third-party hosts
+LINKS_PER_FILE = 200
+RESOURCES_PER_SECTION = 20
+THIRD_PARTY_HOSTS = 50
+TERM_URL_REUSE = 2
+RESOURCE_URL_REUSE = 1.25
+
+RESULT_PREFIX = 'BENCHMARK_RESULT '
+
+
+def build_term_links(count, directory, seed=1):
+    """Write term_links files with count links in total and return their paths."""
+    rng = random.Random(seed)
+    distinct = max(1, int(count / TERM_URL_REUSE))
+    urls = []
+    for i in range(distinct):
+        roll = rng.random()
+        if roll < 0.85:
+            urls.append(f"http://cs.wikipedia.org/wiki/Tanecni_pojem_{i}")
+        elif roll < 0.95:
+            urls.append(f"http://en.wikipedia.org/wiki/Dance_term_{i}")
+        else:
+            urls.append(f"http://site{i % THIRD_PARTY_HOSTS}.example/terms/{i}")
+
+    paths = []
+    for file_index, start in enumerate(range(0, count, LINKS_PER_FILE)):
+        terms = {f"Pojem {start + i}": urls[rng.randrange(distinct)] for i in range(min(LINKS_PER_FILE, count - start))}
+        path = directory / f"T{file_index:04d}_terms.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'terms': terms}, f, ensure_ascii=False, indent=2)
+        paths.append(path)
+    return paths
+
+
+def build_resources(count, directory, seed=1):
+    """Write resource files with count links in total and return their paths."""
+    rng = random.Random(seed)
+    distinct = max(1, int(count / RESOURCE_URL_REUSE))
+    urls = [f"http://site{i % THIRD_PARTY_HOSTS}.example/resources/{i}" for i in range(distinct)]
+
+    paths = []
+    for file_index, start in enumerate(range(0, count, LINKS_PER_FILE)):
+        size = min(LINKS_PER_FILE, count - start)
+        sections = []
+        for section_start in range(0, size, RESOURCES_PER_SECTION):
+            resources = [
+                {
+                    'title': f"Zdroj {start + section_start + i}",
+                    'platform': 'Web',
+                    'url': urls[rng.randrange(distinct)],
+                    'explanation': 'Synteticky zdroj pro benchmark.',
+                }
+                for i in range(min(RESOURCES_PER_SECTION, size - section_start))
+            ]
+            sections.append({'heading': f"Sekce {section_start // RESOURCES_PER_SECTION + 1}", 'resources': resources})
+        path = directory / f"T{file_index:04d}_resources.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'sections': sections}, f, ensure_ascii=False, indent=2)
+        paths.append(path)
+    return paths
+
+
+def peak_memory_mb():
+    """Return the peak memory use of this process in MB (0 if not available)."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run_checker(name, files, checker, resolver, report_path):
+    """Run the corpus-wide check of one checker over the synthetic files."""
+    if name == 'validate':
+        import validate_resource_links
+        from link_report import LinkReport
+        report = LinkReport(report_path)
+        try:
+            await validate_resource_links.validate_all_files(files, checker, report)
+        finally:
+            report.close()
+    elif name == 'check_wiki':
+        import check_wiki_links
+        from link_report import LinkReport
+        report = LinkReport(report_path)
+        try:
+            await check_wiki_links.check_all_files(files, checker, resolver, report)
+        finally:
+            report.close()
+    else:
+        import fix_wikipedia_links_improved
+        await fix_wikipedia_links_improved.process_all_files(files, checker, resolver)
+
+
+def run_child(args):
+    """Benchmark one checker on one corpus size (runs in its own process)."""
+    from link_checker import LinkChecker
+    from wiki_api import WikiResolver
+
+    with tempfile.TemporaryDirectory(prefix='link-benchmark-') as tmp:
+        tmp_dir = Path(tmp)
+        if args.child == 'validate':
+            files = build_resources(args.size, tmp_dir)
+        else:
+            files = build_term_links(args.size, tmp_dir)
+
+        checker = LinkChecker(
+            max_in_flight=args.max_in_flight, per_host=args.per_host,
+            timeout=args.timeout, host_delay=args.host_delay,
+        )
+        resolver = WikiResolver(checker, api_url='http://{host}/w/api.php', rest_url='http://{host}/api/rest_v1')
+        output = sys.stdout if args.verbose else open(os.devnull, 'w', encoding='utf-8')
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(output):
+                asyncio.run(run_checker(args.child, files, checker, resolver, tmp_dir / 'report.jsonl'))
+        finally:
+            elapsed = time.perf_counter() - started
+            checker.close()
+            if output is not sys.stdout:
+                output.close()
+
+        result = {
+            'checker': args.child,
+            'links': args.size,
+            'wall_s': round(elapsed, 3),
+            'checker_requests': checker.requests,
+            'connections': checker.client.connections,
+            'api_queries': resolver.queries,
+            'peak_mb': round(peak_memory_mb(), 1),
+        }
+    print(RESULT_PREFIX + json.dumps(result))
+
+
+def run_benchmark(args, argv):
+    """Start the mock web and run every checker on every corpus size in a subprocess."""
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    checkers = [name.strip() for name in args.checkers.split(',') if name.strip()]
+    for name in checkers:
+        if name not in CHECKERS:
+            raise SystemExit(f"Unknown checker {name!r}, choose from {', '.join(CHECKERS)}")
+
+    results = []
+    with MockWeb(config_from_args(args)) as web:
+        env = dict(os.environ, http_proxy=web.proxy_url, HTTP_PROXY=web.proxy_url)
+        # Synthetic hosts must go through the mock web, whatever the local proxy exceptions are
+        env.pop('no_proxy', None)
+        env.pop('NO_PROXY', None)
+        print(f"Mock web on {web.proxy_url}: latency {args.latency:.3f} s, 404 {args.rate_404:.0%}, "
+              f"redirects {args.rate_redirect:.0%}, 429 {args.rate_429:.1%}")
+
+        for size in sizes:
+            for name in checkers:
+                web.stats.reset()
+                command = [sys.executable, os.path.abspath(__file__), *argv, '--child', name, '--size', str(size)]
+                completed = subprocess.run(command, env=env, stdout=subprocess.PIPE, text=True, encoding='utf-8')
+                lines = [line for line in completed.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+                if completed.returncode != 0 or not lines:
+                    print(f"[ERROR] {name} with {size} links failed (exit code {completed.returncode})")
+                    if args.verbose:
+                        print(completed.stdout)
+                    continue
+                result = json.loads(lines[-1][len(RESULT_PREFIX):])
+                server = web.stats.snapshot()
+                wall = result['wall_s'] or 1e-9
+                result.update({
+                    'requests': server['requests'],
+                    'requests_per_s': round(server['requests'] / wall, 1),
+                    'links_per_s': round(size / wall, 1),
+                    'statuses': server['statuses'],
+                    'peak_per_host': server['peak_per_host'],
+                })
+                results.append(result)
+                print(f"  {name:<11} {size:>7} links: {result['wall_s']:8.2f} s, "
+                      f"{result['requests']:>6} requests ({result['requests_per_s']:.0f}/s), "
+                      f"{result['links_per_s']:.0f} links/s, peak {result['peak_mb']:.0f} MB")
+    return results
+
+
+def print_results(results):
+    """Print the results as a table."""
+    print(f"\n{'checker':<11} {'links':>7} {'wall s':>9} {'requests':>9} {'req/s':>8} "
+          f"{'links/s':>9} {'conns':>6} {'peak MB':>8}")
+    for r in results:
+        print(f"{r['checker']:<11} {r['links']:>7} {r['wall_s']:>9.2f} {r['requests']:>9} {r['requests_per_s']:>8.0f} "
+              f"{r['links_per_s']:>9.0f} {r['connections']:>6} {r['peak_mb']:>8.1f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the link checkers against a local mock web.')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'comma-separated corpus sizes in links (default {DEFAULT_SIZES})')
+    parser.add_argument('--checkers', default=','.join(CHECKERS),
+                        help=f'comma-separated checkers to run (default {",".join(CHECKERS)})')
+    parser.add_argument('--max-in-flight', type=int, default=16, help='maximum requests in flight (default 16)')
+    parser.add_argument('--per-host', type=int, default=8, help='maximum parallel requests to one host (default 8)')
+    parser.add_argument('--host-delay', type=float, default=0.0,
+                        help='minimum gap between requests to one host (default 0, measures the engine itself)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='timeout of one request in seconds (default 10)')
+    parser.add_argument('--output', type=Path, help='save the results as JSON to this file')
+    parser.add_argument('--verbose', action='store_true', help='show the output of the checkers')
+    add_mock_arguments(parser)
+    # Internal: run one checker on one corpus size in a subprocess
+    parser.add_argument('--child', choices=CHECKERS, help=argparse.SUPPRESS)
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main():
+    argv = sys.argv[1:]
+    args = parse_args(argv)
+    if args.child:
+        run_child(args)
+        return
+    try:
+        results = run_benchmark(args, argv)
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user")
+        sys.exit(1)
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Titulky WebVTT a časový index slov pro vygenerované audio
+
+Edge TTS posílá ve stejném streamu jako audio i události WordBoundary
+(čas začátku a délka každého vysloveného slova). Z nich se bez dalších
+požadavků na službu sestaví:
+- titulky .vtt (krátké úseky textu zarovnané na hranice vět),
+- kompaktní index slov .words.json (čas slova -> pozice ve scénáři),
+  podle kterého může stránka tématu zvýrazňovat přepis a přeskakovat v audiu.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+# Časové údaje WordBoundary jsou v jednotkách 100 ns
+TICKS_PER_MS = 10_000
+
+WORD_INDEX_VERSION = 1
+
+# Rozdělení titulků na úseky
+CUE_MAX_CHARS = 84
+CUE_MAX_DURATION_MS = 7000
+CUE_SENTENCE_END = re.compile(r'[.!?…:;]["“”»)]*$')
+
+
+def parse_word_boundary(event: dict) -> Optional[tuple[int, int, str]]:
+    """
+    Převede událost WordBoundary na (začátek ms, konec ms, slovo).
+
+    Returns:
+        Trojice časů relativních k začátku syntetizovaného bloku, nebo None
+        pokud událost není WordBoundary
+    """
+    if event.get("type") != "WordBoundary":
+        return None
+    start = event["offset"] // TICKS_PER_MS
+    end = (event["offset"] + event["duration"]) // TICKS_PER_MS
+    return start, end, event["text"]
+
+
+def align_words(text: str, words: list[tuple[int, int, str]]) -> list[list[int]]:
+    """
+    Najde vyslovená slova postupně v textu scénáře.
+
+    Returns:
+        Seznam [začátek ms, konec ms, první znak, znak za koncem] pro každé slovo;
+        slovo, které se v textu nepodařilo najít, má pozici -1, -1
+    """
+    aligned = []
+    cursor = 0
+    for start, end, word in words:
+        position = text.find(word, cursor) if word else -1
+        # Slovo se hledá jen v nejbližším okolí, aby jedno nenalezené slovo
+        # neposunulo zarovnání o celé odstavce dopředu
+        if position != -1 and position - cursor <= max(64, len(word) * 4):
+            aligned.append([start, end, position, position + len(word)])
+            cursor = position + len(word)
+        else:
+            aligned.append([start, end, -1, -1])
+    return aligned
+
+
+def build_cues(text: str, aligned: list[list[int]]) -> list[tuple[int, int, str]]:
+    """
+    Seskupí zarovnaná slova do titulků (začátek ms, konec ms, text).
+
+    Úsek končí na konci věty, po CUE_MAX_CHARS znacích nebo po CUE_MAX_DURATION_MS.
+    Text úseku se bere přímo ze scénáře, takže zachovává interpunkci.
+    """
+    cues = []
+    group: list[list[int]] = []
+
+    def flush():
+        if not group:
+            return
+        located = [word for word in group if word[2] >= 0]
+        if located:
+            cue_text = text[located[0][2]:located[-1][3]]
+        else:
+            cue_text = ""
+        cue_text = " ".join(cue_text.split())
+        if cue_text:
+            cues.append((group[0][0], group[-1][1], cue_text))
+        group.clear()
+
+    for word in aligned:
+        if group:
+            first = next((w for w in group if w[2] >= 0), None)
+            too_long = first is not None and word[3] >= 0 and word[3] - first[2] > CUE_MAX_CHARS
+            too_slow = word[1] - group[0][0] > CUE_MAX_DURATION_MS
+            if too_long or too_slow:
+                flush()
+        group.append(word)
+        if word[3] >= 0 and CUE_SENTENCE_END.search(text[word[2]:_token_end(text, word[3])]):
+            flush()
+    flush()
+    return cues
+
+
+def _token_end(text: str, position: int) -> int:
+    """Vrátí konec tokenu (slovo i s navazující interpunkcí) začínajícího před position"""
+    while position < len(text) and not text[position].isspace():
+        position += 1
+    return position
+
+
+def format_timestamp(ms: int) -> str:
+    """Naformátuje čas v ms jako časovou značku WebVTT (HH:MM:SS.mmm)"""
+    hours, ms = divmod(max(0, ms), 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{ms:03d}"
+
+
+def format_vtt(cues: list[tuple[int, int, str]]) -> str:
+    """Sestaví obsah souboru WebVTT z titulků"""
+    lines = ["WEBVTT", ""]
+    for index, (start, end, cue_text) in enumerate(cues, 1):
+        lines.append(str(index))
+        lines.append(f"{format_timestamp(start)} --> {format_timestamp(max(end, start + 1))}")
+        lines.append(cue_text)
+        lines.append("")
+    return "\n".join(lines)
+
+
+def build_word_index(audio_filename: str, aligned: list[list[int]], duration_ms: int) -> dict:
+    """
+    Sestaví kompaktní index slov.
+
+    Pozice znaků se vztahují k textu scénáře části (přepisu), časy k začátku MP3.
+    """
+    return {
+        "version": WORD_INDEX_VERSION,
+        "audio": audio_filename,
+        "duration": duration_ms,
+        "words": aligned,
+    }
+
+
+def caption_paths(output_path: Path) -> tuple[Path, Path]:
+    """Vrátí cesty k titulkům a indexu slov vedle MP3 souboru"""
+    return output_path.with_suffix(".vtt"), output_path.with_suffix(".words.json")
+
+
+def _write_text_atomically(path: Path, content: str):
+    # Přípona .part - pozůstatky po přerušeném běhu smaže generátor při dalším spuštění
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.part")
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def write_captions(output_path: Path, text: str, words: list[tuple[int, int, str]], duration_ms: int):
+    """
+    Zapíše titulky .vtt a index slov .words.json vedle MP3 souboru.
+
+    Args:
+        output_path: Cesta k MP3 souboru
+        text: Text scénáře části
+        words: Slova s časy relativními k začátku MP3 (začátek ms, konec ms, slovo)
+        duration_ms: Celková délka audia v ms
+    """
+    vtt_path, index_path = caption_paths(output_path)
+    aligned = align_words(text, words)
+    _write_text_atomically(vtt_path, format_vtt(build_cues(text, aligned)))
+    index = build_word_index(output_path.name, aligned, duration_ms)
+    _write_text_atomically(index_path, json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n")
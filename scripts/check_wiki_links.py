@@ -8,15 +8,20 @@ Script to check and fix Wikipedia links in term_links JSON files.
 - Prefers dance-related personalities
 """
 
+import argparse
+import asyncio
 import json
 import os
 import re
-import requests
 from pathlib import Path
 from urllib.parse import unquote, quote
-import time
 import sys
 
+from link_checker import add_arguments, checker_from_args
+from link_index import check_index, index_term_links, normalize_url
+from link_report import LinkReport, add_arguments as add_report_arguments, print_report_summary
+from wiki_api import add_arguments as add_wiki_arguments, resolver_from_args
+
 # Set UTF-8 encoding for output
 if sys.platform == 'win32':
     import io
@@ -70,8 +75,19 @@ PERSON_YEARS = {
     "Kenneth MacMillan": (1929, 1992),
 }
 
-def check_wiki_link(url, max_retries=2):
-    """Check if a Wikipedia link exists (returns 200, not 404)."""
+# How much of a page is read to recognize "article does not exist" pages
+# (only when the page summary of a Wikipedia article is not available)
+PAGE_SNIPPET_BYTES = 16 * 1024
+
+async def check_wiki_link(checker, url, resolver=None, pages=None):
+    """
+    Check if a Wikipedia link exists (returns 200, not 404).
+
+    When HEAD gives an unexpected status, Wikipedia articles are looked up through
+    the page summary (a few hundred bytes, reports disambiguation pages directly)
+    and the result is added to pages; other pages are fetched with GET, reading
+    only a bounded prefix.
+    """
     if not url or not url.startswith('http'):
         return False, None
     
@@ -79,54 +95,64 @@ def check_wiki_link(url, max_retries=2):
     if 'en.wikipedia.org' in url:
         return True, None  # Assume valid for now
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
+    # HEAD request first (faster), redirects are followed by the checker
+    response = await checker.fetch(url)
+    if response['error']:
+        return False, response['error']
+    if response.get('undecided'):
+        # Still throttled after being requeued: neither valid nor invalid, checked again next run
+        return None, f"Throttled (HTTP {response['status']})"
+    if response['status'] == 200:
+        return True, None
+    elif response['status'] == 404:
+        return False, "404 Not Found"
+    elif response['status'] == 403:
+        # Not decisive either way (bot filter or rate limiting): keep the link, check it again later
+        return None, "403 Forbidden"
     
-    for attempt in range(max_retries):
-        try:
-            # Use HEAD request first (faster)
-            response = requests.head(url, allow_redirects=True, timeout=10, headers=headers)
-            if response.status_code == 200:
-                return True, None
-            elif response.status_code == 404:
-                return False, "404 Not Found"
-            elif response.status_code == 403:
-                # Rate limiting, skip for now - don't mark as invalid
-                return True, None
-            elif response.status_code in [301, 302]:
-                # Follow redirect and check final destination
-                final_url = response.headers.get('Location', url)
-                final_response = requests.head(final_url, allow_redirects=True, timeout=10, headers=headers)
-                if final_response.status_code == 200:
-                    return True, final_url
-                return False, f"Redirect to {final_url} returns {final_response.status_code}"
-            else:
-                # Try GET for other status codes
-                response = requests.get(url, allow_redirects=True, timeout=10, headers=headers)
-                if response.status_code == 200:
-                    # Check if it's a disambiguation or "doesn't exist" page
-                    content = response.text.lower()
-                    if 'tento článek neexistuje' in content or 'this article does not exist' in content:
-                        return False, "Article doesn't exist"
-                    if 'disambiguation' in content or 'rozcestník' in content:
-                        return True, None  # Disambiguation page exists, but might need fixing
-                    return True, None
-                elif response.status_code == 403:
-                    return True, None  # Rate limiting
-                return False, f"Status {response.status_code}"
-        except requests.exceptions.Timeout:
-            if attempt < max_retries - 1:
-                time.sleep(2)
-                continue
-            return False, "Timeout"
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(2)
-                continue
-            return False, str(e)
+    # Other status codes: ask for the page summary instead of downloading the article
+    summary = await resolver.page_summary(url) if resolver else None
+    if summary is not None:
+        if not summary['exists']:
+            return False, "404 Not Found"
+        if pages is not None:
+            # Disambiguation pages exist too, they are reported for review
+            pages[normalize_url(url)] = {
+                'exists': True, 'invalid': False, 'disambiguation': summary['disambiguation'],
+                'redirected': False, 'url': url,
+            }
+        return True, None
     
-    return False, "Failed after retries"
+    # Try GET for other status codes; the checker stops reading after the prefix
+    response = await checker.fetch(url, method='GET', read_body=PAGE_SNIPPET_BYTES)
+    if response['error']:
+        return False, response['error']
+    if response['status'] == 200:
+        # Check if it's a disambiguation or "doesn't exist" page
+        content = (response['body'] or '').lower()
+        if 'tento článek neexistuje' in content or 'this article does not exist' in content:
+            return False, "Article doesn't exist"
+        if 'disambiguation' in content or 'rozcestník' in content:
+            return True, None  # Disambiguation page exists, but might need fixing
+        return True, None
+    elif response['status'] == 403:
+        return None, "403 Forbidden"  # Not decisive, see above
+    return False, f"Status {response['status']}"
+
+def page_check_result(page):
+    """Turn a page resolved through the Wikipedia API into (is_valid, error)."""
+    if page['invalid']:
+        return False, "Invalid title"
+    if not page['exists']:
+        return False, "Page does not exist"
+    return True, None
+
+async def check_term_link(checker, resolver, url, pages):
+    """Use the batched API result when there is one, otherwise check the page itself."""
+    page = pages.get(normalize_url(url))
+    if page is not None:
+        return page_check_result(page)
+    return await check_wiki_link(checker, url, resolver, pages)
 
 def extract_wiki_title(url):
     """Extract the title from a Wikipedia URL."""
@@ -171,10 +197,16 @@ def fix_ambiguous_name(term, url, file_path):
     
     return None
 
-def process_term_links_file(file_path):
-    """Process a single term_links JSON file."""
+def process_term_links_file(file_path, checks, pages):
+    """
+    Process a single term_links JSON file using results of the corpus-wide check.
+
+    pages holds what the Wikipedia API reported about the linked pages; redirects
+    and disambiguation pages are reported for manual review, not changed.
+    """
     print(f"\nProcessing {file_path}...")
     
+    
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -190,7 +222,8 @@ def process_term_links_file(file_path):
     changes = {
         'removed': [],
         'fixed': [],
-        'needs_check': []
+        'needs_check': [],
+        'redirects': []
     }
     
     new_terms = {}
@@ -200,15 +233,26 @@ def process_term_links_file(file_path):
             continue
         
         # Check if link is valid
-        is_valid, redirect_url = check_wiki_link(url)
+        is_valid, redirect_url = checks[normalize_url(url)]
         
-        if not is_valid:
+        if is_valid is None:
+            # Undecided (throttled) - keep the link, the next run or --resume checks it again
+            print(f"  UNDECIDED, kept: {term} -> {url} ({redirect_url})")
+        elif not is_valid:
             # Link is invalid - remove it
             print(f"  REMOVING invalid link: {term} -> {url} ({redirect_url})")
             changes['removed'].append((term, url, redirect_url))
             # Don't add to new_terms - effectively removing it
             continue
         
+        page = pages.get(normalize_url(url))
+        if page and page['disambiguation']:
+            print(f"  DISAMBIGUATION page: {term} -> {page['url']}")
+            changes['needs_check'].append((term, url, page['url']))
+        elif page and page['redirected']:
+            print(f"  REDIRECT: {term} -> {page['url']}")
+            changes['redirects'].append((term, url, page['url']))
+        
         # Check for ambiguous names that might need fixing
         # For now, we'll keep valid links but flag potential issues
         fixed_url = find_dance_person_link(term, url)
@@ -220,34 +264,72 @@ def process_term_links_file(file_path):
             new_terms[term] = fixed_url
         else:
             new_terms[term] = url
-        
-        # Small delay to avoid rate limiting
-        time.sleep(0.1)
     
-    if changes['removed'] or changes['fixed']:
+    if any(changes.values()):
         return {
             'file': file_path,
             'changes': changes,
-            'new_terms': new_terms
+            'new_terms': new_terms,
+            'modified': bool(changes['removed'] or changes['fixed'])
         }
     
     return None
 
+async def check_all_files(json_files, checker, resolver, report):
+    """
+    Check every distinct URL of all term_links files once, then process the files in order.
+
+    Wikipedia pages are resolved first in batches through the API; only URLs the API
+    could not answer (and non-Wikipedia links) are requested one by one. Each result is
+    appended to the report as soon as it is known; URLs already in the report (resumed
+    run) are not checked again.
+    """
+    index = index_term_links(json_files)
+    index.print_stats('term links')
+    # English Wikipedia links are still assumed valid (see check_wiki_link)
+    pages = await resolver.resolve_urls(
+        index.request_url(key) for key in index.keys() if 'en.wikipedia.org' not in key
+    )
+    checks = await check_index(index, report.wrap(
+        index, lambda url: check_term_link(checker, resolver, url, pages)
+    ))
+    results = [process_term_links_file(json_file, checks, pages) for json_file in json_files]
+    return [result for result in results if result]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Check and fix Wikipedia links in term_links JSON files.')
+    add_arguments(parser)
+    add_wiki_arguments(parser)
+    add_report_arguments(parser, 'check_wiki_links')
+    return parser.parse_args()
+
 def main():
     """Main function to process all term_links files."""
+    args = parse_args()
     term_links_dir = Path('data/term_links')
     
     if not term_links_dir.exists():
         print(f"Directory {term_links_dir} does not exist!")
         return
     
-    all_changes = []
-    
-    # Process each JSON file
-    for json_file in sorted(term_links_dir.glob('*.json')):
-        result = process_term_links_file(json_file)
-        if result:
-            all_changes.append(result)
+    # Process all JSON files in one event loop; per-host limits keep Wikipedia happy
+    checker = checker_from_args(args)
+    resolver = resolver_from_args(args, checker)
+    report = LinkReport(args.report, resume=args.resume)
+    try:
+        all_changes = asyncio.run(check_all_files(sorted(term_links_dir.glob('*.json')), checker, resolver, report))
+    except KeyboardInterrupt:
+        print(f"\nInterrupted. {len(report.decided)} checked URLs are saved in {report.path}, "
+              f"continue with --resume")
+        return
+    finally:
+        checker.close()
+        resolver.close()
+        report.close()
+    report.finish()
+    print()
+    resolver.print_stats()
+    checker.print_stats()
     
     # Print summary
     print("\n" + "="*80)
@@ -256,6 +338,8 @@ def main():
     
     total_removed = 0
     total_fixed = 0
+    total_needs_check = 0
+    total_redirects = 0
     
     for result in all_changes:
         print(f"\n{result['file']}:")
@@ -265,14 +349,23 @@ def main():
         if result['changes']['fixed']:
             print(f"  Fixed {len(result['changes']['fixed'])} ambiguous links")
             total_fixed += len(result['changes']['fixed'])
+        if result['changes']['needs_check']:
+            print(f"  {len(result['changes']['needs_check'])} links to disambiguation pages (check manually)")
+            total_needs_check += len(result['changes']['needs_check'])
+        if result['changes']['redirects']:
+            print(f"  {len(result['changes']['redirects'])} links redirect to another page")
+            total_redirects += len(result['changes']['redirects'])
     
     print(f"\nTotal: {total_removed} links removed, {total_fixed} links fixed")
+    print(f"To review: {total_needs_check} disambiguation pages, {total_redirects} redirects")
+    print_report_summary(report.path)
     
     # Ask for confirmation before saving
-    if all_changes:
+    modified = [result for result in all_changes if result['modified']]
+    if modified:
         print("\nChanges will be saved. Review the changes above.")
         # Save changes
-        for result in all_changes:
+        for result in modified:
             data = {'terms': result['new_terms']}
             with open(result['file'], 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Index skloňovaných tvarů termínů z data/term_links
+
+Termíny se propojují jen v přesném tvaru, takže "Petipa" se propojí, ale
+"Petipovi" nebo "Petipových" ne. Tento skript ke každému termínu odvodí
+pravděpodobné tvary všech pádů (podle koncovek, se shodou přídavného jména
+a podstatného jména ve víceslovných termínech) a zapíše je do indexu
+data/inflection/variants.json (termín -> tvary). Propojování termínů
+(term_matcher.TermMatcher) z indexu bere tvary k termínům tématu, takže
+ruční varianty v TXX_terms.json už nejsou potřeba.
+
+Pravidla jsou záměrně jednoduchá: tvar, který v textu nikdy nebude, nevadí.
+Výjimky (cizí jména, nepravidelné tvary, tvary kolidující s běžnými slovy)
+patří do lexikonu data/inflection/lexicon.json:
+- "forms": termín -> úplný seznam tvarů (nahradí odvozené),
+- "indeclinable": termíny, které se neskloňují,
+- "exclude": tvary, které se nikdy nemají propojovat.
+
+Použití:
+    python scripts/czech_inflection.py            # přegeneruje index
+    python scripts/czech_inflection.py --details  # vypíše i nadbytečné ruční varianty
+    python scripts/czech_inflection.py --check    # jen ověří, že je index aktuální
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Fix Windows console encoding for Czech characters
+if sys.platform == "win32":
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+from term_matcher import COMMON_TERMS_FILE, TERM_LINKS_DIR, VARIANTS_PATH, fold, read_terms
+
+LEXICON_PATH = VARIANTS_PATH.parent / "lexicon.json"
+VARIANTS_VERSION = 1
+
+# Předložky a spojky ve víceslovných termínech: za nimi se už neskloňuje ("Epos o Gilgamešovi")
+STOP_WORDS = {"a", "i", "o", "v", "ve", "z", "ze", "s", "se", "k", "ke", "u", "na", "do", "od", "po", "za",
+              "pro", "při", "před", "nad", "pod", "mezi", "bez", "of", "the", "and", "und"}
+# Šlechtické a jiné částice ve jménech se ponechávají beze změny
+PARTICLES = {"de", "da", "di", "del", "della", "dell", "van", "von", "der", "la", "le", "el", "du", "des", "y"}
+
+SOFT_CONSONANTS = set("cčďjňřšťž")
+MIN_WORD_LENGTH = 3
+
+# Vzory: 14 pádů (7 v jednotném, 7 v množném čísle), každý se seznamem koncovek.
+# "*" znamená kmen se změkčením před -e/-ě (kultura -> kultuře, Egypt -> Egyptě).
+ADJECTIVE_PATTERNS = {
+    "masc": [["ý"], ["ého"], ["ému"], ["ý", "ého"], ["ý"], ["ém"], ["ým"],
+             ["í", "é"], ["ých"], ["ým"], ["é"], ["í", "é"], ["ých"], ["ými"]],
+    "fem": [["á"], ["é"], ["é"], ["ou"], ["á"], ["é"], ["ou"],
+            ["é"], ["ých"], ["ým"], ["é"], ["é"], ["ých"], ["ými"]],
+    "neut": [["é"], ["ého"], ["ému"], ["é"], ["é"], ["ém"], ["ým"],
+             ["á"], ["ých"], ["ým"], ["á"], ["á"], ["ých"], ["ými"]],
+    "soft": [["í"], ["ího"], ["ímu"], ["í"], ["í"], ["ím"], ["ím"],
+             ["í"], ["ích"], ["ím"], ["í"], ["í"], ["ích"], ["ími"]],
+}
+POSSESSIVE_PATTERNS = {
+    "fem": [["a"], ["y"], ["ě"], ["u"], ["a"], ["ě"], ["ou"],
+            ["y"], ["ých"], ["ým"], ["y"], ["y"], ["ých"], ["ými"]],
+    "masc": [[""], ["a"], ["u"], ["", "a"], [""], ["ě"], ["ým"],
+             ["i", "y"], ["ých"], ["ým"], ["y"], ["i", "y"], ["ých"], ["ými"]],
+    "neut": [["o"], ["a"], ["u"], ["o"], ["o"], ["ě"], ["ým"],
+             ["a"], ["ých"], ["ým"], ["a"], ["a"], ["ých"], ["ými"]],
+}
+NOUN_PATTERNS = {
+    # žena / předseda (rod neznámý: sjednocení obou vzorů)
+    "a_fem": [["a"], ["y"], ["*"], ["u"], ["o"], ["*"], ["ou"],
+              ["y"], [""], ["ám"], ["y"], ["y"], ["ách"], ["ami"]],
+    "a_masc": [["a"], ["y"], ["ovi"], ["u"], ["o"], ["ovi"], ["ou"],
+               ["ové"], ["ů"], ["ům"], ["y"], ["ové"], ["ech"], ["y"]],
+    # růže, Itálie
+    "e_fem": [["e"], ["e"], ["i"], ["i"], ["e"], ["i"], ["í"],
+              ["e"], ["í", ""], ["ím"], ["e"], ["e"], ["ích"], ["emi"]],
+    # moře
+    "e_neut": [["e"], ["e"], ["i"], ["e"], ["e"], ["i"], ["em"],
+               ["e"], ["í"], ["ím"], ["e"], ["e"], ["ích"], ["i"]],
+    # pán + hrad
+    "hard_masc": [[""], ["a", "u"], ["ovi", "u"], ["a", ""], ["e", "u"], ["ovi", "u", "*"], ["em"],
+                  ["ové", "y"], ["ů"], ["ům"], ["y"], ["ové", "y"], ["ech"], ["y"]],
+    # muž + stroj
+    "soft_masc": [[""], ["e"], ["i", "ovi"], ["e", ""], ["i"], ["i", "ovi"], ["em"],
+                  ["i", "ové", "e"], ["ů"], ["ům"], ["e"], ["i"], ["ích"], ["i", "emi"]],
+    # kost + píseň
+    "cons_fem": [[""], ["i", "e"], ["i"], [""], ["i"], ["i"], ["í"],
+                 ["i", "e"], ["í"], ["em", "ím"], ["i", "e"], ["i", "e"], ["ech", "ích"], ["mi", "emi"]],
+    # město
+    "o_neut": [["o"], ["a"], ["u"], ["o"], ["o"], ["u", "*"], ["em"],
+               ["a"], [""], ["ům"], ["a"], ["a"], ["ech"], ["y"]],
+    # Picasso, Camargo (množné číslo jako u města, "-ové" by se shodovalo s přídavnými jmény: "rokokové")
+    "o_masc": [["o"], ["a"], ["ovi"], ["a"], ["o"], ["ovi"], ["em"],
+               ["a"], [""], ["ům"], ["a"], ["a"], ["ech"], ["y"]],
+    # muzeum
+    "um_neut": [["um"], ["a"], ["u"], ["um"], ["um"], ["u"], ["em"],
+                ["a"], ["í"], ["ím"], ["a"], ["a"], ["ích"], ["y"]],
+    # Konfucius, humanismus, Sofokles, Aischylos (kmen bez -us/-es/-os)
+    "latin_masc": [[None], ["a", "u"], ["ovi", "u"], ["a", None], ["e"], ["ovi", "u"], ["em"],
+                   ["ové", "y"], ["ů"], ["ům"], ["y"], ["ové", "y"], ["ech"], ["y"]],
+}
+# Přivlastňovací přídavné jméno od jména osoby (Petipa -> Petipův, Petipových)
+POSSESSIVE_FORMS = ["ův", "ova", "ovo", "ovu", "ovou", "ovy", "ově", "ových", "ovým", "ovými"]
+
+
+def soften(stem: str) -> str:
+    """Kmen s koncovkou -e/-ě po změkčení (kultur -> kultuře, Prah -> Praze, Egypt -> Egyptě)"""
+    lower = stem.lower()
+    if lower.endswith("ch"):
+        return stem[:-2] + "še"
+    last = lower[-1:]
+    if last == "r":
+        return stem[:-1] + "ře"
+    if last in ("h", "g"):
+        return stem[:-1] + "ze"
+    if last == "k":
+        return stem[:-1] + "ce"
+    if last in ("d", "t", "n", "b", "p", "v", "f", "m"):
+        return stem + "ě"
+    return stem + "e"
+
+
+def apply_pattern(stem: str, pattern: list, word: str) -> list[list[str]]:
+    """Složí tvary všech pádů z kmene a koncovek vzoru (None = původní slovo)"""
+    cases = []
+    for endings in pattern:
+        forms = []
+        for ending in endings:
+            form = word if ending is None else soften(stem) if ending == "*" else stem + ending
+            if form not in forms:
+                forms.append(form)
+        cases.append(forms)
+    return cases
+
+
+def merge_patterns(*paradigms: list) -> list[list[str]]:
+    """Sjednotí tvary několika vzorů pád po pádu"""
+    merged = []
+    for forms in zip(*paradigms):
+        case = []
+        for alternatives in forms:
+            case.extend(form for form in alternatives if form not in case)
+        merged.append(case)
+    return merged
+
+
+def is_adjective(word: str) -> bool:
+    return len(word) > 3 and word[-1] in "ýáéí" and word[-2:] not in ("ie",)
+
+
+def adjective_gender(word: str):
+    """Rod přídavného jména podle koncovky (None, pokud to není přídavné jméno)"""
+    lower = word.lower()
+    if lower.endswith(("ova", "ina")) and len(lower) > 4:
+        return "fem"
+    if lower.endswith(("ův", "in")) and len(lower) > 4 and word[:1].isupper():
+        return "masc"
+    if lower.endswith(("ovo", "ino")) and len(lower) > 4:
+        return "neut"
+    if is_adjective(word):
+        return {"ý": "masc", "á": "fem", "é": "neut", "í": None}[lower[-1]]
+    return None
+
+
+def adjective_forms(word: str):
+    """Tvary přídavného jména, nebo None, pokud slovo přídavným jménem není"""
+    lower = word.lower()
+    for ending, gender in (("ova", "fem"), ("ina", "fem"), ("ovo", "neut"), ("ino", "neut")):
+        if lower.endswith(ending) and len(lower) > 4:
+            return apply_pattern(word[:-1], POSSESSIVE_PATTERNS[gender], word)
+    if lower.endswith(("ův", "in")) and len(lower) > 4 and word[:1].isupper():
+        return apply_pattern(word, POSSESSIVE_PATTERNS["masc"], word)
+    if is_adjective(word):
+        gender = {"ý": "masc", "á": "fem", "é": "neut", "í": "soft"}[lower[-1]]
+        return apply_pattern(word[:-1], ADJECTIVE_PATTERNS[gender], word)
+    return None
+
+
+def noun_forms(word: str, gender=None):
+    """
+    Tvary podstatného jména podle koncovky (a rodu, pokud ho určuje přídavné jméno).
+
+    Returns:
+        Seznam 14 pádů se seznamy tvarů, nebo None pro nesklonná slova
+    """
+    lower = word.lower()
+    capitalized = word[:1].isupper()
+    if lower.endswith(("i", "y", "u", "ů", "ou")) or lower[-1:] in "íéáóúý":
+        if lower.endswith("í"):
+            return apply_pattern(word[:-1], ADJECTIVE_PATTERNS["soft"], word)
+        return None
+    if lower.endswith("um") and len(lower) > 4:
+        return apply_pattern(word[:-2], NOUN_PATTERNS["um_neut"], word)
+    if lower.endswith("us") and len(lower) > 4:
+        return apply_pattern(word[:-2], NOUN_PATTERNS["latin_masc"], word)
+    if capitalized and lower.endswith(("es", "os", "és")) and len(lower) > 5:
+        return apply_pattern(word[:-2], NOUN_PATTERNS["latin_masc"], word)
+    if lower.endswith("a"):
+        stem = word[:-1]
+        if gender == "fem":
+            return apply_pattern(stem, NOUN_PATTERNS["a_fem"], word)
+        if gender == "masc":
+            return apply_pattern(stem, NOUN_PATTERNS["a_masc"], word)
+        return merge_patterns(apply_pattern(stem, NOUN_PATTERNS["a_fem"], word),
+                              apply_pattern(stem, NOUN_PATTERNS["a_masc"], word))
+    if lower.endswith("e"):
+        stem = word[:-1]
+        if gender == "neut":
+            return apply_pattern(stem, NOUN_PATTERNS["e_neut"], word)
+        forms = apply_pattern(stem, NOUN_PATTERNS["e_fem"], word)
+        if capitalized and gender is None and not lower.endswith(("ie", "ce")):
+            # Cizí jména s němým -e (Balanchine -> Balanchina)
+            forms = merge_patterns(forms, apply_pattern(stem, NOUN_PATTERNS["hard_masc"], word))
+        return forms
+    if lower.endswith("o"):
+        stem = word[:-1]
+        if gender == "neut" or not capitalized or lower.endswith(("sko", "cko")):
+            return apply_pattern(stem, NOUN_PATTERNS["o_neut"], word)
+        if gender == "masc":
+            return apply_pattern(stem, NOUN_PATTERNS["o_masc"], word)
+        return merge_patterns(apply_pattern(stem, NOUN_PATTERNS["o_neut"], word),
+                              apply_pattern(stem, NOUN_PATTERNS["o_masc"], word))
+    if not lower[-1:].isalpha():
+        return None
+    if gender == "fem":
+        return apply_pattern(word, NOUN_PATTERNS["cons_fem"], word)
+    if lower.endswith(("ec", "ek")) and len(lower) > 4:
+        # Pohyblivé -e-: tanec -> tance, Janek -> Janka
+        stem = word[:-2] + word[-1]
+        pattern = "soft_masc" if lower.endswith("ec") else "hard_masc"
+        forms = apply_pattern(stem, NOUN_PATTERNS[pattern], word)
+        forms[0] = [word]
+        forms[3] = [form if form != stem else word for form in forms[3]]
+        return forms
+    if lower[-1] in SOFT_CONSONANTS:
+        return apply_pattern(word, NOUN_PATTERNS["soft_masc"], word)
+    return apply_pattern(word, NOUN_PATTERNS["hard_masc"], word)
+
+
+def possessive_stem(word: str):
+    """Kmen přivlastňovacího tvaru jména (Petipa -> Petip, Sofokles -> Sofokl), None u nesklonných"""
+    lower = word.lower()
+    if lower.endswith(("sko", "cko")):
+        return None
+    if lower.endswith(("a", "o")):
+        return word[:-1]
+    if lower.endswith(("us", "es", "os", "és")) and len(lower) > 5:
+        return word[:-2]
+    if lower[-1] not in "aeiouyáéíóúůý":
+        return word
+    return None
+
+
+def is_inflectable(word: str) -> bool:
+    return len(word) >= MIN_WORD_LENGTH and word.isalpha() and not (word.isupper() and len(word) > 1)
+
+
+def term_variants(term: str, indeclinable=frozenset()) -> list[str]:
+    """
+    Odvodí skloňované tvary jednoho termínu (bez termínu samotného).
+
+    Víceslovné termíny se skloňují se shodou pádu: jména osob ve všech slovech
+    ("Johann Sebastian Bach" -> "Johanna Sebastiana Bacha"), jinak přídavná
+    jména a první podstatné jméno ("Harappská kultura" -> "Harappské kultury").
+    """
+    words = term.split(" ")
+    if term in indeclinable or any(not word for word in words):
+        return []
+
+    lowered = [word.lower().rstrip(".") for word in words]
+    is_name = all(word[:1].isupper() or lowered[i] in PARTICLES for i, word in enumerate(words))
+
+    cases_per_word = []
+    gender = None
+    inflecting = True
+    for word, lower in zip(words, lowered):
+        forms = None
+        if inflecting and lower in STOP_WORDS:
+            inflecting = False
+        elif inflecting and lower not in PARTICLES and is_inflectable(word) and word not in indeclinable:
+            last = word is words[-1]
+            forms = adjective_forms(word) if len(words) > 1 and (not last or is_adjective(word)) else None
+            if forms is not None:
+                gender = adjective_gender(word) or gender
+            else:
+                forms = noun_forms(word, gender)
+                # Za prvním podstatným jménem následuje přívlastek v původním tvaru ("dějiny tance")
+                inflecting = is_name
+        cases_per_word.append(forms or [[word]] * 14)
+
+    # Slova se kombinují po sobě jdoucích alternativách (ne všechny se všemi), jinak by u jmen
+    # vznikaly desítky smíšených tvarů ("Johannovi Sebastianu Bachovi")
+    variants = []
+    for case in zip(*cases_per_word):
+        for alternative in range(max(len(forms) for forms in case)):
+            variant = " ".join(forms[min(alternative, len(forms) - 1)] for forms in case)
+            if variant != term and variant not in variants and len(variant) >= MIN_WORD_LENGTH:
+                variants.append(variant)
+
+    # Přivlastňovací tvary jmen osob (Petipa -> Petipových)
+    if len(words) == 1 and words[0][:1].isupper() and is_inflectable(words[0]):
+        stem = possessive_stem(words[0])
+        if stem:
+            variants.extend(stem + ending for ending in POSSESSIVE_FORMS if stem + ending not in variants)
+    return variants
+
+
+def load_lexicon(path: Path = LEXICON_PATH) -> dict:
+    """Načte lexikon výjimek (chybějící soubor = prázdný lexikon)"""
+    lexicon = {"forms": {}, "indeclinable": [], "exclude": []}
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            lexicon.update(json.load(f))
+    return lexicon
+
+
+def build_variant_index(terms, lexicon: dict) -> dict:
+    """
+    Sestaví index termín -> skloňované tvary pro všechny termíny.
+
+    Tvar, který se shoduje s některým ručně zapsaným termínem, se vynechá:
+    ruční termín má vlastní odkaz a přednost.
+    """
+    terms = list(dict.fromkeys(terms))
+    explicit = {fold(term) for term in terms}
+    indeclinable = frozenset(lexicon["indeclinable"])
+    excluded = {fold(form) for form in lexicon["exclude"]}
+    index = {}
+    for term in terms:
+        forms = lexicon["forms"].get(term)
+        if forms is None:
+            forms = term_variants(term, indeclinable)
+        forms = [form for form in forms if fold(form) not in explicit and fold(form) not in excluded]
+        if forms:
+            index[term] = forms
+    return index
+
+
+def redundant_entries(term_files: list[Path], lexicon: dict) -> dict:
+    """
+    Najde ručně zapsané varianty, které index odvodí sám (stejná URL jako základní termín).
+
+    Returns:
+        {název souboru: [(varianta, základní termín)]}
+    """
+    indeclinable = frozenset(lexicon["indeclinable"])
+    common = read_terms(TERM_LINKS_DIR / COMMON_TERMS_FILE)
+    redundant = {}
+    for path in term_files:
+        terms = dict(common, **read_terms(path)) if path.name != COMMON_TERMS_FILE else common
+        by_form = {fold(term): term for term in terms}
+        found = []
+        derived = {term: lexicon["forms"].get(term) or term_variants(term, indeclinable) for term in terms}
+        for term, forms in derived.items():
+            for form in forms:
+                other = by_form.get(fold(form))
+                if not other or other == term or terms[other] != terms[term]:
+                    continue
+                if path.name != COMMON_TERMS_FILE and other in common:
+                    continue
+                # Odvozují-li se termíny navzájem (Beethoven / Beethovena), základní je ten kratší
+                if len(term) > len(other) and fold(term) in map(fold, derived[other]):
+                    continue
+                found.append((other, term))
+        if found:
+            redundant[path.name] = sorted(set(found))
+    return redundant
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Index skloňovaných tvarů termínů pro propojování")
+    parser.add_argument("--details", action="store_true",
+                        help="vypsat ručně zapsané varianty, které index odvodí sám")
+    parser.add_argument("--check", action="store_true",
+                        help="nic nezapisovat, jen ověřit aktuálnost indexu (návratový kód 1 = zastaralý)")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    term_files = sorted(TERM_LINKS_DIR.glob("*.json"))
+    lexicon = load_lexicon()
+
+    terms = []
+    for path in term_files:
+        terms.extend(read_terms(path))
+    index = build_variant_index(terms, lexicon)
+    content = json.dumps(
+        {"version": VARIANTS_VERSION, "variants": dict(sorted(index.items()))},
+        ensure_ascii=False, separators=(",", ":"),
+    ) + "\n"
+
+    try:
+        with open(VARIANTS_PATH, "r", encoding="utf-8") as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = None
+
+    total = sum(len(forms) for forms in index.values())
+    print(f"[OK] {len(set(terms))} terminu, {len(index)} sklonnych, {total} odvozenych tvaru")
+
+    redundant = redundant_entries(term_files, lexicon)
+    count = sum(len(entries) for entries in redundant.values())
+    print(f"Rucne zapsane varianty, ktere index odvodi sam: {count}")
+    if args.details:
+        for name, entries in redundant.items():
+            print(f"  {name}: " + ", ".join(f"{variant} ({term})" for variant, term in entries))
+
+    if current == content:
+        print("Index je aktualni")
+        return
+    if args.check:
+        print(f"[ERROR] Index {VARIANTS_PATH} je zastaraly, spust scripts/czech_inflection.py")
+        sys.exit(1)
+    VARIANTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(VARIANTS_PATH, "w", encoding="utf-8", newline="\n") as f:
+        f.write(content)
+    print(f"[OK] Index zapsan do {VARIANTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,30 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Script to fix ambiguous person names in term_links JSON files.
-- Fixes ambiguous names by using birth/death years or preferring dance context
-- Removes known broken links
+Rule engine that fixes term_links JSON files from a declarative rules file.
+
+All fixes live in data/term_fix_rules.json:
+- "files": per-file overrides, {file name: {term: url}}; a null url removes the term
+- "spelling": Wikipedia page title rewrites applied to every link, {wrong title: correct title}
+- "ambiguous": default link for an ambiguous name in every file, {term: url}
+- "remove": terms and urls to drop from every file, {"terms": [...], "urls": [...]}
+
+Precedence for a single term: removal, then the per-file override, then the
+ambiguous-name default; the spelling rewrite is applied to whatever url results.
+The rules are compiled into lookup tables once, every term file is read once
+and written only if its content changed. Each change is printed as a unified diff.
+
+Usage:
+    python scripts/fix_term_links.py              # apply the rules
+    python scripts/fix_term_links.py --dry-run    # print the diff only
+    python scripts/fix_term_links.py --check      # exit 1 if any file would change
 """
 
+import argparse
+import difflib
 import json
-from pathlib import Path
 import sys
+from pathlib import Path
 
 # Set UTF-8 encoding for output
 if sys.platform == 'win32':
@@ -16,142 +32,165 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
-# Known fixes for ambiguous names - prefer dance-related personalities
-AMBIGUOUS_FIXES = {
-    # Taglioni family - multiple dance-related people
-    # In T18: "Taglioni" points to Paul_Taglioni but should be Filippo_Taglioni (dance choreographer)
-    # But we need context - if it's "P. Taglioni" or "Paul Taglioni" -> Paul_Taglioni is correct
-    # If just "Taglioni" -> usually means Filippo (the father/choreographer)
-    
-    # Gluck - could be Christoph Willibald Gluck (composer) - correct
-    # But might conflict with other Glucks - usually composer is the right one
-    
-    # Fokine/Fokin - check if link is correct
-    # T16: "Michail Fokine" -> "Michail_Fokin" (should be Michail_Fokine)
-    
-    # Nižinskij - check spelling
-    # T16: "Vaslav Nižinskij" -> "Vaclav_Nižinskij" (should be Vaslav_Nižinskij)
-    
-    # Check for names that need birth/death year disambiguation
-}
-
-# Specific file fixes
-FILE_FIXES = {
-    'T16_terms.json': {
-        # Fix Fokine/Fokin spelling
-        'Michail Fokine': 'https://cs.wikipedia.org/wiki/Michail_Fokine',
-        'M. Fokine': 'https://cs.wikipedia.org/wiki/Michail_Fokine',
-        'Fokine': 'https://cs.wikipedia.org/wiki/Michail_Fokine',
-        # Fix Nižinskij spelling
-        'Vaslav Nižinskij': 'https://cs.wikipedia.org/wiki/Vaslav_Nižinskij',
-        'V. Nižinskij': 'https://cs.wikipedia.org/wiki/Vaslav_Nižinskij',
-        'Nižinskij': 'https://cs.wikipedia.org/wiki/Vaslav_Nižinskij',
-    },
-    'T18_terms.json': {
-        # Taglioni - if just "Taglioni" without first name, prefer Filippo (choreographer)
-        # But "P. Taglioni" or "Pavel Taglioni" should point to Paul/Paolo Taglioni
-        # Current mapping seems correct: "Taglioni" -> Paul_Taglioni
-        # However, in dance context, "Taglioni" usually refers to Filippo Taglioni
-        # Let's check if "Pavel Taglioni" exists - if so, current is correct
-        # If "Taglioni" alone should be Filippo, change it
-        'Taglioni': 'https://cs.wikipedia.org/wiki/Filippo_Taglioni',  # Prefer Filippo (father/choreographer)
-    },
-    'T19_terms.json': {
-        # Check "M. Ek" - could be Mats Ek or Malin Ek
-        # From context: Mats Ek is the choreographer, Malin Ek is his twin sister (costume designer)
-        # "M. Ek" without context usually refers to Mats Ek (the choreographer)
-        'M. Ek': 'https://cs.wikipedia.org/wiki/Mats_Ek',  # Ensure it's Mats, not Malin
-        # "Andres Ek" should be Mats Ek's father (Andres), but link might be wrong
-        # Current: "Andres Ek": "https://cs.wikipedia.org/wiki/Mats_Ek" - this seems wrong
-        # Andres Ek is Mats Ek's father, an actor - might not have separate Wikipedia page
-        # Keep as is for now, but note it might need fixing
-    },
-    'T15_terms.json': {
-        # "Taglioni" alone in T15 should refer to Paolo Taglioni (not Paulina)
-        # From context: "P. Taglioni" in American ballet development refers to Paolo Taglioni (1808-1884)
-        # who toured in America, not Paulina Taglioni (his daughter, less prominent)
-        'Taglioni': 'https://cs.wikipedia.org/wiki/Paolo_Taglioni',  # Prefer Paolo over Paulina for standalone "Taglioni"
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TERM_LINKS_DIR = PROJECT_ROOT / 'data' / 'term_links'
+RULES_PATH = PROJECT_ROOT / 'data' / 'term_fix_rules.json'
+RULES_VERSION = 1
+
+WIKI_PATH = '/wiki/'
+
+
+def load_rules(path=RULES_PATH):
+    """Load the rules file and check its version."""
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+    if rules.get('version') != RULES_VERSION:
+        raise ValueError(f"{path}: unsupported rules version {rules.get('version')!r}")
+    return rules
+
+
+def compile_rules(rules):
+    """
+    Compile the rules into lookup tables.
+
+    Returns a dict with "files" ({file name: {term: url or None}}), "spelling"
+    ({title: title}), "ambiguous" ({term: url}), "remove_terms" and "remove_urls" (sets).
+    """
+    remove = rules.get('remove') or {}
+    return {
+        'files': {name: dict(overrides) for name, overrides in (rules.get('files') or {}).items()},
+        'spelling': dict(rules.get('spelling') or {}),
+        'ambiguous': dict(rules.get('ambiguous') or {}),
+        'remove_terms': set(remove.get('terms') or []),
+        'remove_urls': set(remove.get('urls') or []),
     }
-}
-
-# Links to remove (known non-existent pages)
-LINKS_TO_REMOVE = {
-    # Add specific term -> file mappings for links to remove
-}
-
-def process_file(file_path, fixes):
-    """Process a single file with fixes."""
-    print(f"\nProcessing {file_path}...")
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"  Error reading file: {e}")
-        return False
-    
-    if 'terms' not in data:
-        print(f"  No 'terms' key found")
-        return False
-    
-    terms = data['terms']
-    changed = False
-    changes = []
-    
-    # Apply fixes
-    for term, new_url in fixes.items():
-        if term in terms:
-            old_url = terms[term]
-            if old_url != new_url:
-                terms[term] = new_url
-                changed = True
-                changes.append((term, old_url, new_url))
-                print(f"  FIXED: {term}")
-                print(f"    Old: {old_url}")
-                print(f"    New: {new_url}")
-    
-    # Remove broken links
-    if file_path.name in LINKS_TO_REMOVE:
-        for term in LINKS_TO_REMOVE[file_path.name]:
-            if term in terms:
-                old_url = terms.pop(term)
-                changed = True
-                changes.append((term, old_url, None))
-                print(f"  REMOVED: {term} -> {old_url}")
-    
-    if changed:
-        # Save file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"  ✓ Saved changes to {file_path}")
-        return True
-    else:
-        print(f"  No changes needed")
-        return False
+
+
+def fix_spelling(url, spelling):
+    """Rewrite the page title of a Wikipedia url if it has a spelling rule (whole title only)."""
+    if not spelling or WIKI_PATH not in url:
+        return url
+    base, title = url.rsplit(WIKI_PATH, 1)
+    title, hash_mark, fragment = title.partition('#')
+    correct = spelling.get(title)
+    if correct is None:
+        return url
+    return f"{base}{WIKI_PATH}{correct}{hash_mark}{fragment}"
+
+
+def fix_term(term, url, overrides, compiled):
+    """Return the fixed url of one term, or None if the term should be removed."""
+    if term in compiled['remove_terms'] or url in compiled['remove_urls']:
+        return None
+    if term in overrides:
+        url = overrides[term]
+        if url is None:
+            return None
+    elif term in compiled['ambiguous']:
+        url = compiled['ambiguous'][term]
+    return fix_spelling(url, compiled['spelling'])
+
+
+def fix_terms(pairs, overrides, compiled):
+    """
+    Apply the rules to the (term, url) pairs of one file.
+
+    Duplicate keys collapse into one entry (the last value wins, as in json.load).
+    Returns the fixed {term: url} dict in the original order.
+    """
+    fixed = {}
+    for term, url in pairs:
+        fixed.pop(term, None)
+        new_url = fix_term(term, url, overrides, compiled)
+        if new_url is not None:
+            fixed[term] = new_url
+    return fixed
+
+
+def process_file(path, compiled):
+    """
+    Fix one term file.
+
+    Returns (original text, fixed text); the two are equal if no rule applies.
+    Files without rule changes are left byte for byte as they are (including
+    duplicate keys and formatting). Raises ValueError if the file is not valid JSON.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    data = json.loads(text, object_pairs_hook=lambda pairs: pairs)
+    data = dict(data)
+    pairs = data.get('terms') or []
+    overrides = compiled['files'].get(path.name, {})
+    fixed = fix_terms(pairs, overrides, compiled)
+    if fixed == dict(pairs):
+        return text, text
+    data['terms'] = fixed
+    # Trailing whitespace of the original file is kept so the diff shows only the fixes
+    new_text = json.dumps(data, ensure_ascii=False, indent=2) + text[len(text.rstrip()):]
+    return text, new_text
+
+
+def print_diff(path, text, new_text):
+    """Print a unified diff of one file relative to the project root."""
+    name = path.relative_to(PROJECT_ROOT).as_posix()
+    diff = difflib.unified_diff(
+        text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+        fromfile=f"a/{name}", tofile=f"b/{name}", n=1,
+    )
+    for line in diff:
+        print(line, end='' if line.endswith('\n') else '\n')
+
+
+def run(term_links_dir=TERM_LINKS_DIR, rules_path=RULES_PATH, write=True):
+    """
+    Apply the rules to every term file in a single pass.
+
+    Returns (number of files checked, list of changed file names, list of unreadable file names).
+    """
+    compiled = compile_rules(load_rules(rules_path))
+    paths = sorted(term_links_dir.glob('*.json'))
+    changed = []
+    errors = []
+    for path in paths:
+        try:
+            text, new_text = process_file(path, compiled)
+        except ValueError as e:
+            print(f"[ERROR] {path.name}: invalid JSON ({e}), skipped")
+            errors.append(path.name)
+            continue
+        if new_text == text:
+            continue
+        print_diff(path, text, new_text)
+        changed.append(path.name)
+        if write:
+            with open(path, 'w', encoding='utf-8', newline='\n') as f:
+                f.write(new_text)
+
+    unknown = sorted(set(compiled['files']) - {path.name for path in paths})
+    for name in unknown:
+        print(f"[WARNING] Rules reference {name}, which does not exist in {term_links_dir.name}/")
+    return len(paths), changed, errors
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Fix term_links JSON files from data/term_fix_rules.json.')
+    parser.add_argument('--rules', type=Path, default=RULES_PATH, help='rules file (default: %(default)s)')
+    parser.add_argument('--dry-run', action='store_true', help='print the diff without writing any file')
+    parser.add_argument('--check', action='store_true',
+                        help='print the diff without writing and exit 1 if any file would change')
+    return parser.parse_args(argv)
+
 
 def main():
-    """Main function."""
-    term_links_dir = Path('data/term_links')
-    
-    if not term_links_dir.exists():
-        print(f"Directory {term_links_dir} does not exist!")
-        return
-    
-    total_changed = 0
-    
-    # Process each file with fixes
-    for filename, fixes in FILE_FIXES.items():
-        file_path = term_links_dir / filename
-        if file_path.exists():
-            if process_file(file_path, fixes):
-                total_changed += 1
-        else:
-            print(f"  File {filename} not found")
-    
-    print("\n" + "="*80)
-    print(f"SUMMARY: {total_changed} file(s) updated")
-    print("="*80)
+    args = parse_args()
+    write = not (args.dry_run or args.check)
+    checked, changed, errors = run(rules_path=args.rules, write=write)
+
+    action = 'updated' if write else 'would change'
+    print(f"\nFiles checked: {checked}, {action}: {len(changed)}, unreadable: {len(errors)}")
+    if args.check and changed:
+        sys.exit(1)
+
 
 if __name__ == '__main__':
     main()
-
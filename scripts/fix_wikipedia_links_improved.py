@@ -1,59 +1,38 @@
 """
 Improved script to check Wikipedia links and find English equivalents
 for Czech pages that don't exist
+
+English equivalents come from interlanguage links (langlinks) looked up in
+batches through the Wikipedia API and cached locally; CZECH_TO_ENGLISH_MAPPINGS
+only overrides the lookup for pages where it gets things wrong.
 """
 
+import argparse
+import asyncio
 import json
 import os
 import sys
-import time
-import urllib.request
-import urllib.error
-import urllib.parse
 from urllib.parse import urlparse, unquote
 
+from link_checker import add_arguments, checker_from_args
+from link_index import check_index, index_term_links, normalize_url
+from wiki_api import add_arguments as add_wiki_arguments, page_url, resolver_from_args, wiki_page_of
+
 # Fix encoding for Windows console
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
-def check_url(url, timeout=5):
+async def check_url(checker, url):
     """Check if a URL exists (returns True if status 200, False otherwise)"""
-    try:
-        # Normalize Wikipedia URLs - properly encode the page name
-        parsed = urllib.parse.urlparse(url)
-        if 'wikipedia.org' in parsed.netloc and '/wiki/' in parsed.path:
-            # Extract the page name and encode it properly
-            path_parts = parsed.path.split('/wiki/')
-            if len(path_parts) == 2:
-                page_name = path_parts[1]
-                # Wikipedia URLs need proper UTF-8 encoding
-                # Keep underscores as-is, encode everything else
-                encoded_page = urllib.parse.quote(page_name, safe='_')
-                normalized_path = '/wiki/' + encoded_page
-                url = urllib.parse.urlunparse((parsed.scheme, parsed.netloc, normalized_path, parsed.params, parsed.query, parsed.fragment))
-        
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'Mozilla/5.0 (compatible; LinkChecker/1.0)')
-        # Follow redirects (Wikipedia often redirects)
-        opener = urllib.request.build_opener(urllib.request.HTTPRedirectHandler())
-        response = opener.open(req, timeout=timeout)
-        status = response.getcode()
-        response.close()
-        # Accept 200 (OK) - redirects are handled automatically
-        return status == 200
-    except urllib.error.HTTPError as e:
-        # 404 means page doesn't exist
-        return e.code != 404
-    except (urllib.error.URLError, Exception):
+    # The checker percent-encodes Wikipedia page names and follows redirects
+    response = await checker.fetch(url, method='GET')
+    status = response['status']
+    if status is None:
         return False
-
-def to_english_wiki(cs_url):
-    """Convert Czech Wikipedia URL to English"""
-    if 'cs.wikipedia.org' not in cs_url:
-        return cs_url
-    return cs_url.replace('cs.wikipedia.org', 'en.wikipedia.org')
+    # Accept 200 (OK); other HTTP errors than 404 don't mean the page doesn't exist
+    return status == 200 or (status >= 300 and status != 404)
 
 def get_page_name(url):
     """Extract page name from Wikipedia URL"""
@@ -62,27 +41,8 @@ def get_page_name(url):
     page_name = url.split('/wiki/')[1]
     return unquote(page_name)
 
-def search_wikipedia_en(page_name):
-    """Search for English Wikipedia page using API"""
-    # Try direct page name first
-    en_url = f"https://en.wikipedia.org/wiki/{urllib.parse.quote(page_name)}"
-    if check_url(en_url):
-        return en_url
-    
-    # Try to use Wikipedia API to search
-    try:
-        search_url = "https://en.wikipedia.org/api/rest_v1/page/summary/" + urllib.parse.quote(page_name)
-        req = urllib.request.Request(search_url)
-        req.add_header('User-Agent', 'Mozilla/5.0 (compatible; LinkChecker/1.0)')
-        with urllib.request.urlopen(req, timeout=5) as response:
-            if response.status == 200:
-                return f"https://en.wikipedia.org/wiki/{urllib.parse.quote(page_name)}"
-    except:
-        pass
-    
-    return None
-
-# Common Czech to English Wikipedia page name mappings
+# Manual overrides: Czech page name -> English page name, used instead of the
+# interlanguage link lookup (only needed where the lookup finds the wrong page)
 CZECH_TO_ENGLISH_MAPPINGS = {
     'Islám': 'Islam',
     'Křesťanství': 'Christianity',
@@ -183,49 +143,91 @@ CZECH_TO_ENGLISH_MAPPINGS = {
     'Kazuo_Óno': 'Kazuo_Ohno',
 }
 
-def find_english_equivalent(cs_url):
-    """Try to find English Wikipedia equivalent for a Czech URL"""
-    page_name = get_page_name(cs_url)
-    if not page_name:
-        return None
-    
-    # Try direct mapping first
-    if page_name in CZECH_TO_ENGLISH_MAPPINGS:
-        en_page = CZECH_TO_ENGLISH_MAPPINGS[page_name]
-        en_url = f"https://en.wikipedia.org/wiki/{urllib.parse.quote(en_page)}"
-        if check_url(en_url):
-            return en_url
-    
-    # Try direct conversion (same page name)
-    en_url = to_english_wiki(cs_url)
-    if check_url(en_url):
-        return en_url
-    
-    # Try Wikipedia API search
-    en_url = search_wikipedia_en(page_name)
-    if en_url:
-        return en_url
-    
-    return None
+def english_candidates(url):
+    """
+    Candidate English page titles for a missing Wikipedia page.
 
-def check_and_fix_link(original_url):
-    """Check if link exists, try to find English version if Czech doesn't exist"""
-    if 'wikipedia.org' not in original_url:
-        return {'exists': True, 'url': original_url}
-    
-    # Check if original (Czech) link exists
-    if check_url(original_url):
-        return {'exists': True, 'url': original_url}
-    
-    # Try to find English equivalent
-    en_url = find_english_equivalent(original_url)
-    if en_url:
-        return {'exists': True, 'url': en_url, 'replaced': True}
-    
-    return {'exists': False, 'url': original_url}
+    Returns a list of (title, source): the override from CZECH_TO_ENGLISH_MAPPINGS
+    first, then the same title (confirmed by its interlanguage link, see
+    find_english_equivalents)
+    """
+    page = wiki_page_of(url)
+    if not page:
+        return []
+    page_name = get_page_name(url).split('#')[0]
+    candidates = []
+    override = CZECH_TO_ENGLISH_MAPPINGS.get(page_name) or CZECH_TO_ENGLISH_MAPPINGS.get(page[1])
+    if override:
+        candidates.append((override.replace('_', ' '), 'override'))
+    if page[0] != 'en.wikipedia.org':
+        candidates.append((page[1], 'same title'))
+    return candidates
 
-def process_terms_file(file_path):
-    """Process a terms JSON file"""
+async def find_english_equivalents(resolver, urls):
+    """
+    Find replacements for missing Wikipedia pages with one batched lookup.
+
+    All candidate titles are resolved on en.wikipedia.org together with their
+    interlanguage link back to the original wiki. An override is taken as it is.
+    An English page of the same title is only trusted when it is an article (not
+    a disambiguation page); if it links to an existing article in the original
+    language, that article is used instead, because the page just has another
+    title there.
+
+    Returns:
+        {normalize_url(url): {'url': replacement, 'source': how it was found}}
+        for the URLs a replacement was found for
+    """
+    candidates = {url: english_candidates(url) for url in urls}
+    by_lang = {}
+    for url, url_candidates in candidates.items():
+        if url_candidates:
+            host = wiki_page_of(url)[0]
+            by_lang.setdefault(host.split('.')[0], set()).update(title for title, _ in url_candidates)
+
+    langs = list(by_lang)
+    results = await asyncio.gather(*(
+        resolver.resolve('en.wikipedia.org', sorted(by_lang[lang]), langlinks=lang) for lang in langs
+    ))
+    infos = dict(zip(langs, results))
+
+    replacements = {}
+    for url, url_candidates in candidates.items():
+        if not url_candidates:
+            continue
+        host = wiki_page_of(url)[0]
+        lang = host.split('.')[0]
+        for title, source in url_candidates:
+            info = infos[lang].get(title)
+            if not info or not info['exists']:
+                continue
+            if source == 'override':
+                replacement = page_url('en.wikipedia.org', info['title'], info['fragment'])
+            elif info['disambiguation']:
+                continue
+            elif info['langlinks'].get(lang):
+                replacement = page_url(host, info['langlinks'][lang])
+                source = 'langlink'
+            else:
+                replacement = page_url('en.wikipedia.org', info['title'], info['fragment'])
+            replacements[normalize_url(url)] = {'url': replacement, 'source': source}
+            break
+    return replacements
+
+async def link_exists(checker, url, page=None):
+    """
+    Check if a link exists
+
+    page is what the Wikipedia API reported about the link (None if it was not resolved)
+    """
+    if 'wikipedia.org' not in url:
+        return True
+    if page is not None:
+        return page['exists']
+    return await check_url(checker, url)
+
+def process_terms_file(file_path, checks):
+    """Process a terms JSON file using results of the corpus-wide check"""
     print(f"\nProcessing {os.path.basename(file_path)}...")
     
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -244,11 +246,11 @@ def process_terms_file(file_path):
     
     for term, url in terms.items():
         print(f"Checking: {term} -> {url}")
-        result = check_and_fix_link(url)
+        result = checks[normalize_url(url)] if url else {'exists': True, 'url': url}
         
         if result['exists']:
             if result.get('replaced'):
-                print(f"  [FIXED] {url} -> {result['url']}")
+                print(f"  [FIXED] {url} -> {result['url']} ({result['source']})")
                 new_terms[term] = result['url']
                 results['fixed'] += 1
             else:
@@ -257,9 +259,6 @@ def process_terms_file(file_path):
         else:
             print(f"  [REMOVE] {term} (page doesn't exist)")
             results['removed'] += 1
-        
-        # Small delay to avoid overwhelming Wikipedia servers
-        time.sleep(0.1)
     
     # Write updated file
     data['terms'] = new_terms
@@ -275,8 +274,40 @@ def process_terms_file(file_path):
     
     return results
 
+async def process_all_files(file_paths, checker, resolver):
+    """Check every distinct URL of all terms files once, then process the files in order"""
+    index = index_term_links(file_paths)
+    index.print_stats('term links')
+    # Existence of all Wikipedia pages is resolved in batches through the API first
+    pages = await resolver.resolve_urls(index.request_url(key) for key in index.keys())
+    exists = await check_index(
+        index, lambda url: link_exists(checker, url, pages.get(normalize_url(url)))
+    )
+    
+    # Replacements for missing pages, again in batches
+    missing = [index.request_url(key) for key, found in exists.items() if not found]
+    replacements = await find_english_equivalents(resolver, missing)
+    
+    checks = {}
+    for key, found in exists.items():
+        if found:
+            checks[key] = {'exists': True, 'url': index.request_url(key)}
+        elif key in replacements:
+            checks[key] = dict(replacements[key], exists=True, replaced=True)
+        else:
+            checks[key] = {'exists': False, 'url': index.request_url(key)}
+    return [process_terms_file(file_path, checks) for file_path in file_paths]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Check Wikipedia links and find English equivalents for missing Czech pages')
+    add_arguments(parser)
+    add_wiki_arguments(parser)
+    parser.set_defaults(timeout=5.0)
+    return parser.parse_args()
+
 def main():
     """Main function"""
+    args = parse_args()
     script_dir = os.path.dirname(os.path.abspath(__file__))
     term_links_dir = os.path.join(script_dir, '..', 'data', 'term_links')
     
@@ -290,10 +321,17 @@ def main():
         'unchanged': 0
     }
     
-    for file in files:
-        file_path = os.path.join(term_links_dir, file)
-        results = process_terms_file(file_path)
-        
+    checker = checker_from_args(args)
+    resolver = resolver_from_args(args, checker)
+    try:
+        file_results = asyncio.run(process_all_files(
+            [os.path.join(term_links_dir, file) for file in files], checker, resolver
+        ))
+    finally:
+        checker.close()
+        resolver.close()
+    
+    for results in file_results:
         all_results['total'] += results['total']
         all_results['fixed'] += results['fixed']
         all_results['removed'] += results['removed']
@@ -304,6 +342,8 @@ def main():
     print(f"Fixed (Czech -> English): {all_results['fixed']}")
     print(f"Removed (non-existent): {all_results['removed']}")
     print(f"Unchanged: {all_results['unchanged']}")
+    resolver.print_stats()
+    checker.print_stats()
 
 if __name__ == '__main__':
     main()
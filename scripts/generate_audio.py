@@ -4,17 +4,39 @@ Generátor audio souborů z audio-scénářů pomocí Edge TTS (Microsoft)
 
 Vytváří MP3 audio soubory z textových scénářů s použitím Microsoft Edge TTS.
 Edge TTS je zcela zdarma, nevyžaduje API klíč a podporuje češtinu s přirozenými hlasy.
+
+Použití:
+    python scripts/generate_audio.py T01                      # jedno téma
+    python scripts/generate_audio.py --all                    # všechna témata se scénářem
+    python scripts/generate_audio.py T01 --output-dir /tmp/audio-nahled   # mimo assets/audio
+
+Backend se volí přepínačem --backend {edge,silent} nebo proměnnou prostředí
+TTS_BACKEND (výchozí "edge"). Backend "silent" vrací tiché MP3 rámce (viz
+tts_backends.py), proto vyžaduje --output-dir mimo assets/audio. S --output-dir
+se do výstupního adresáře zapíše i manifest a topic JSON ani přepisy v data/
+se nemění. Zátěžový test bez sítě obstará scripts/benchmark_audio.py.
 """
 
 import os
 import sys
+import time
 import asyncio
+import argparse
+import random
 import re
-import edge_tts
 import json
+import hashlib
+import tempfile
+import unicodedata
+from bisect import bisect_right
 from pathlib import Path
 from typing import Optional
 
+from captions import align_words, caption_paths, parse_word_boundary, write_captions
+from mp3_frames import estimate_duration, extract_audio_frames, iter_frames
+from tts_cache import SentenceCache
+from tts_backends import BACKENDS, TTSBackend, create_backend
+
 # Fix Windows console encoding for Czech characters
 if sys.platform == "win32":
     try:
@@ -27,6 +49,50 @@ if sys.platform == "win32":
 PROJECT_ROOT = Path(__file__).parent.parent
 AUDIO_SCRIPTS_DIR = PROJECT_ROOT / "data" / "audio_scripts"
 AUDIO_OUTPUT_DIR = PROJECT_ROOT / "assets" / "audio"
+# Přepisy jednotlivých částí - načítají se na stránce až po rozbalení přepisu
+TRANSCRIPTS_DIR = PROJECT_ROOT / "data" / "transcripts"
+
+# Výchozí TTS backend (edge nebo silent), lze přepsat přepínačem --backend
+DEFAULT_BACKEND = os.getenv("TTS_BACKEND", "edge")
+
+# Výchozí počet současně generovaných částí v dávkovém režimu
+DEFAULT_CONCURRENCY = 4
+
+# Manifest s otisky vstupů pro každý vygenerovaný MP3 soubor
+AUDIO_MANIFEST_PATH = AUDIO_OUTPUT_DIR / "manifest.json"
+MANIFEST_VERSION = 1
+
+# Verze generátoru - změna verze TTS backendu nebo způsobu skládání audia zneplatní otisky v manifestu
+AUDIO_PIPELINE_VERSION = 4
+
+# Dělení textu na bloky pro syntézu: věty, které nejsou v cache, se skládají do bloků
+# do této délky (jeden požadavek na blok); delší věty se rozdělí na hranicích slov
+DEFAULT_CHUNK_CHARS = int(os.getenv("EDGE_TTS_CHUNK_CHARS", "1500"))
+DEFAULT_CHUNK_CONCURRENCY = int(os.getenv("EDGE_TTS_CHUNK_CONCURRENCY", "4"))
+
+# Centrální plánovač všech požadavků na TTS: limit požadavků za sekundu,
+# limit souběžných požadavků a exponenciální čekání s náhodným rozptylem při chybách
+DEFAULT_REQUESTS_PER_SECOND = float(os.getenv("EDGE_TTS_RPS", "5"))
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("EDGE_TTS_MAX_IN_FLIGHT", "8"))
+CHUNK_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0  # sekundy, zdvojnásobuje se s každým pokusem
+RETRY_MAX_DELAY = 30.0
+
+# Zápis výstupu: MP3 se skládá v dočasném souboru a do assets/audio se přesune až hotový
+WRITE_BUFFER_SIZE = 64 * 1024
+PARTIAL_SUFFIX = ".part"
+PROGRESS_INTERVAL = 2.0  # sekundy mezi výpisy průběhu
+
+# Lokální cache syntetizovaných vět (sdílená napříč tématy)
+SENTENCE_CACHE_DIR = Path(os.getenv("EDGE_TTS_CACHE_DIR", str(PROJECT_ROOT / ".cache" / "tts_sentences")))
+SENTENCE_CACHE_MAX_MB = int(os.getenv("EDGE_TTS_CACHE_MAX_MB", "500"))
+
+# Katalog hlasů se ukládá na disk, aby se nestahoval při každém běhu
+VOICES_CACHE_PATH = PROJECT_ROOT / ".cache" / "voices.json"
+VOICES_CACHE_TTL = float(os.getenv("EDGE_TTS_VOICES_TTL_HOURS", "168")) * 3600
+
+# Konec věty: interpunkce následovaná mezerou
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])\s+')
 
 # České hlasy
 CZECH_VOICES = {
@@ -35,10 +101,88 @@ CZECH_VOICES = {
 }
 
 
-async def list_czech_voices():
+def engine_version(backend: TTSBackend) -> str:
+    """Vrátí identifikaci generátoru (backend + verze skládání audia) pro otisky vstupů"""
+    return f"{backend.version}+pipeline/{AUDIO_PIPELINE_VERSION}"
+
+
+# Katalog českých hlasů v paměti procesu: verze backendu -> (hlasy, index pro vyhledávání)
+_voice_catalogue: dict[str, tuple[list[dict], dict[str, str]]] = {}
+
+
+def _fold_voice_name(name: str) -> str:
+    """Převede název hlasu na malá písmena bez diakritiky ("Antonín" -> "antonin")"""
+    decomposed = unicodedata.normalize("NFKD", name.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def build_voice_index(voices: list[dict]) -> dict[str, str]:
+    """
+    Sestaví slovník pro vyhledání hlasu: ShortName, FriendlyName i samotné jméno
+    (např. "vlasta" z "cs-CZ-VlastaNeural") -> ShortName
+    """
+    index = {}
+    for voice in voices:
+        short_name = voice.get("ShortName", "")
+        if not short_name:
+            continue
+        keys = [short_name, voice.get("FriendlyName", "")]
+        match = re.match(r'[a-z]{2}-[A-Z]{2}-(.+?)(?:Neural)?$', short_name)
+        if match:
+            keys.append(match.group(1))
+        for key in keys:
+            if key:
+                index.setdefault(_fold_voice_name(key), short_name)
+    return index
+
+
+def _read_voices_cache(version: str) -> Optional[list[dict]]:
+    """Načte katalog hlasů z disku, pokud je pro daný backend a ještě nevypršel"""
+    try:
+        with open(VOICES_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("backend") != version:
+        return None
+    if time.time() - cached.get("fetched_at", 0) > VOICES_CACHE_TTL:
+        return None
+    return cached.get("voices")
+
+
+def _write_voices_cache(version: str, voices: list[dict]):
+    """Uloží katalog hlasů na disk"""
+    try:
+        VOICES_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(VOICES_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"backend": version, "fetched_at": time.time(), "voices": voices}, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"[WARNING] Nepodarilo se ulozit katalog hlasu: {e}")
+
+
+async def get_czech_voices(backend: TTSBackend, refresh: bool = False) -> tuple[list[dict], dict[str, str]]:
+    """
+    Vrátí české hlasy a index pro jejich vyhledání.
+
+    Pořadí zdrojů: paměť procesu -> cache na disku (platnost EDGE_TTS_VOICES_TTL_HOURS,
+    výchozí týden) -> stažení z backendu. refresh=True vynutí stažení.
+    """
+    if not refresh and backend.version in _voice_catalogue:
+        return _voice_catalogue[backend.version]
+    
+    czech_voices = None if refresh else _read_voices_cache(backend.version)
+    if czech_voices is None:
+        voices = await backend.list_voices()
+        czech_voices = [v for v in voices if v["Locale"].startswith("cs-CZ")]
+        _write_voices_cache(backend.version, czech_voices)
+    
+    _voice_catalogue[backend.version] = (czech_voices, build_voice_index(czech_voices))
+    return _voice_catalogue[backend.version]
+
+
+async def list_czech_voices(backend: TTSBackend, refresh: bool = False):
     """Vypíše seznam dostupných českých hlasů"""
-    voices = await edge_tts.list_voices()
-    czech_voices = [v for v in voices if v["Locale"].startswith("cs-CZ")]
+    czech_voices, _ = await get_czech_voices(backend, refresh)
     
     print("\nDostupne ceske hlasy:")
     for voice in czech_voices:
@@ -51,33 +195,402 @@ async def list_czech_voices():
     return czech_voices
 
 
-async def find_voice_by_name(search_name: str) -> Optional[str]:
+async def find_voice_by_name(search_name: str, backend: TTSBackend, refresh: bool = False) -> Optional[str]:
     """
     Najde voice ID podle názvu hlasu (např. "Jana", "Vlasta", "Antonín")
     """
-    voices = await edge_tts.list_voices()
-    czech_voices = [v for v in voices if v["Locale"].startswith("cs-CZ")]
+    _, index = await get_czech_voices(backend, refresh)
     
-    search_lower = search_name.lower()
-    for voice in czech_voices:
-        friendly_name = voice.get("FriendlyName", "").lower()
-        short_name = voice.get("ShortName", "").lower()
-        
-        if search_lower in friendly_name or search_lower in short_name:
-            return voice.get("ShortName")
+    search_key = _fold_voice_name(search_name)
+    if search_key in index:
+        return index[search_key]
+    
+    # Částečná shoda (např. "antonin neural")
+    for key, short_name in index.items():
+        if search_key in key:
+            return short_name
     
     return None
 
 
+def split_into_sentences(text: str) -> list[str]:
+    """Rozdělí text na věty podle koncové interpunkce"""
+    return [sentence for sentence in SENTENCE_BOUNDARY.split(text.strip()) if sentence]
+
+
+def split_text_into_sentences(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> list[str]:
+    """
+    Rozdělí text na věty - jednotky, po kterých se audio ukládá do cache.
+
+    Věta delší než max_chars znaků se rozdělí na hranicích slov, aby se vešla
+    do jednoho bloku pro syntézu.
+    """
+    chunks = []
+    for sentence in split_into_sentences(text):
+        if len(sentence) <= max_chars:
+            chunks.append(sentence)
+            continue
+        # Příliš dlouhá věta - rozděl ji po slovech
+        current = ""
+        for word in sentence.split():
+            if current and len(current) + 1 + len(word) > max_chars:
+                chunks.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def pack_sentences(sentences: list[str], cached: list[bool], max_chars: int = DEFAULT_CHUNK_CHARS) -> list[list[int]]:
+    """
+    Seskupí věty do bloků pro syntézu a vrátí indexy vět každého bloku.
+
+    Věta nalezená v cache tvoří samostatný blok (nesyntetizuje se). Po sobě jdoucí
+    věty, které v cache nejsou, se skládají do bloků do délky max_chars znaků,
+    takže se syntetizují jedním požadavkem místo jednoho požadavku na větu.
+    """
+    batches = []
+    current: list[int] = []
+    length = 0
+    for index, sentence in enumerate(sentences):
+        if cached[index]:
+            if current:
+                batches.append(current)
+                current, length = [], 0
+            batches.append([index])
+            continue
+        if current and length + 1 + len(sentence) > max_chars:
+            batches.append(current)
+            current, length = [], 0
+        length += len(sentence) + (1 if current else 0)
+        current.append(index)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def split_batch_audio(
+    sentences: list[str], audio: bytes, words: list[tuple[int, int, str]]
+) -> Optional[list[tuple[bytes, list[tuple[int, int, str]]]]]:
+    """
+    Rozdělí audio bloku více vět zpět na jednotlivé věty pro cache.
+
+    Věty se v textu bloku najdou podle časů slov; řez leží uprostřed mezi koncem
+    posledního slova jedné věty a začátkem prvního slova další, zaokrouhlený na
+    hranici MP3 rámce. Časy slov se posunou na začátek své věty.
+
+    Returns:
+        (MP3 rámce, časy slov) pro každou větu, nebo None pokud se některou větu
+        nepodařilo najít (blok se pak použije vcelku a do cache se neuloží)
+    """
+    frames = list(iter_frames(audio))
+    if not frames:
+        return None
+    frame_ms = frames[0][1]["samples"] / frames[0][1]["sample_rate"] * 1000
+
+    # Pozice začátku každé věty v textu bloku (věty jsou spojené mezerou)
+    starts = []
+    position = 0
+    for sentence in sentences:
+        starts.append(position)
+        position += len(sentence) + 1
+
+    # Věta každého slova; nenalezené slovo patří k větě předchozího slova
+    sentence_words: list[list[tuple[int, int, str]]] = [[] for _ in sentences]
+    found = [False] * len(sentences)
+    current = 0
+    for word, (_, _, char_start, _) in zip(words, align_words(" ".join(sentences), words)):
+        if char_start != -1:
+            current = max(current, bisect_right(starts, char_start) - 1)
+            found[current] = True
+        sentence_words[current].append(word)
+    if not all(found):
+        return None
+
+    cuts = [0]
+    for index in range(1, len(sentences)):
+        previous_end = sentence_words[index - 1][-1][1]
+        next_start = sentence_words[index][0][0]
+        cut = round((previous_end + next_start) / 2 / frame_ms)
+        cuts.append(min(len(frames), max(cuts[-1], cut)))
+    cuts.append(len(frames))
+
+    pieces = []
+    for index, sentence_word_times in enumerate(sentence_words):
+        first, last = cuts[index], cuts[index + 1]
+        begin = frames[first][0] if first < len(frames) else len(audio)
+        end = frames[last][0] if last < len(frames) else len(audio)
+        shift = round(first * frame_ms)
+        pieces.append((
+            audio[begin:end],
+            [(max(0, start - shift), max(0, stop - shift), word) for start, stop, word in sentence_word_times],
+        ))
+    return pieces
+
+
+async def synthesize_chunk_async(
+    backend: TTSBackend, text: str, voice: str, rate: str, pitch: str
+) -> tuple[bytes, list[tuple[int, int, str]]]:
+    """
+    Syntetizuje jeden blok textu a vrátí MP3 data a časy vyslovených slov.
+
+    Časy slov (začátek ms, konec ms, slovo) pocházejí z událostí WordBoundary
+    ve stejném streamu jako audio, nevyžadují tedy žádný další požadavek.
+    """
+    audio = bytearray()
+    words = []
+    async for chunk in backend.stream(text, voice, rate, pitch):
+        if chunk["type"] == "audio":
+            audio.extend(chunk["data"])
+        else:
+            word = parse_word_boundary(chunk)
+            if word:
+                words.append(word)
+    if not audio:
+        raise RuntimeError(f"TTS backend {backend.name} nevratil zadna audio data")
+    return bytes(audio), words
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Rozhodne, zda má smysl požadavek opakovat. Chyby vstupu (např. neplatný hlas)
+    jsou trvalé, síťové chyby, časové limity a omezení služby jsou přechodné.
+    """
+    return not isinstance(error, (ValueError, TypeError, KeyError))
+
+
+class SynthesisScheduler:
+    """
+    Centrální plánovač, přes který prochází každý požadavek na syntézu.
+
+    - token bucket omezuje počet požadavků za sekundu,
+    - semafor omezuje počet současně běžících požadavků,
+    - přechodné chyby se opakují s exponenciálním čekáním a náhodným rozptylem,
+    - při chybách se rychlost požadavků sníží na polovinu a po úspěších
+      postupně vrací k nastavené hodnotě (adaptivní zpomalení při omezení služby).
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_attempts: int = CHUNK_MAX_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY
+    ):
+        self.max_rate = max(0.01, requests_per_second)
+        self.min_rate = min(self.max_rate, 0.2)
+        self.rate = self.max_rate
+        self.burst = max(1.0, self.max_rate)
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._bucket_lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max(1, max_in_flight))
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        # Klíče (názvy výstupních souborů), u kterých bylo nutné některý požadavek opakovat
+        self.retried_keys: set[str] = set()
+
+    async def _acquire_token(self):
+        """Počká na volný token v token bucketu"""
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def _on_success(self):
+        # Aditivní návrat k nastavené rychlosti
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def _on_transient_error(self):
+        # Multiplikativní zpomalení
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponenciální čekání s plným náhodným rozptylem (full jitter)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def run(self, key: str, label: str, request):
+        """
+        Provede požadavek (bezparametrickou korutinovou funkci) pod kontrolou plánovače.
+
+        Args:
+            key: Klíč pro statistiku opakování (název výstupního souboru)
+            label: Popis požadavku pro výpis
+            request: Funkce vracející novou korutinu pro každý pokus
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            await self._acquire_token()
+            try:
+                async with self._in_flight:
+                    self.requests += 1
+                    result = await request()
+                self._on_success()
+                return result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not is_transient_error(e) or attempt == self.max_attempts:
+                    self.failures += 1
+                    raise
+                self._on_transient_error()
+                self.retries += 1
+                self.retried_keys.add(key)
+                delay = self.backoff_delay(attempt)
+                print(f"[RETRY] {label}: pokus {attempt}/{self.max_attempts} selhal ({e}), "
+                      f"opakuji za {delay:.1f} s")
+                await asyncio.sleep(delay)
+
+    def print_stats(self):
+        """Vypíše statistiku plánovače"""
+        print(f"\nPlanovac TTS pozadavku:")
+        print(f"  Pozadavky: {self.requests}, opakovani: {self.retries}, trvale chyby: {self.failures}")
+        print(f"  Rychlost na konci behu: {self.rate:.2f}/{self.max_rate:.2f} pozadavku/s")
+
+
+async def synthesize_chunk_with_retry(
+    backend: TTSBackend,
+    key: str,
+    label: str,
+    text: str,
+    voice: str,
+    rate: str,
+    pitch: str,
+    scheduler: SynthesisScheduler,
+    cache: Optional[SentenceCache] = None
+) -> tuple[bytes, list[tuple[int, int, str]]]:
+    """
+    Vrátí MP3 rámce a časy slov bloku textu - z cache vět, nebo syntézou přes
+    centrální plánovač. Při přechodné chybě syntézy se opakuje jen tento blok.
+    """
+    cache_key = SentenceCache.make_key(text, voice, rate, pitch, backend.version) if cache else None
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    audio, words = await scheduler.run(
+        key, label, lambda: synthesize_chunk_async(backend, text, voice, rate, pitch)
+    )
+    audio = extract_audio_frames(audio)
+    if cache:
+        cache.put(cache_key, audio, words)
+    return audio, words
+
+
+async def synthesize_batch_with_retry(
+    backend: TTSBackend,
+    key: str,
+    label: str,
+    sentences: list[str],
+    voice: str,
+    rate: str,
+    pitch: str,
+    scheduler: SynthesisScheduler,
+    cache: Optional[SentenceCache] = None,
+    cached: bool = False
+) -> list[tuple[bytes, list[tuple[int, int, str]]]]:
+    """
+    Vrátí (MP3 rámce, časy slov) pro každou větu bloku.
+
+    Blok s jedinou větou z cache (cached=True) se vezme z cache. Ostatní bloky
+    obsahují jen věty, které v cache nejsou; syntetizují se jedním požadavkem přes
+    centrální plánovač, audio se rozdělí po větách a každá věta se uloží do cache
+    zvlášť. Pokud se rozdělení nepodaří, první věta nese audio celého bloku
+    a ostatní jsou prázdné.
+    """
+    if cached:
+        # Pokud věta mezitím z cache zmizela, syntetizuje se samostatně
+        return [await synthesize_chunk_with_retry(backend, key, label, sentences[0], voice, rate, pitch, scheduler, cache)]
+    text = " ".join(sentences)
+    audio, words = await scheduler.run(
+        key, label, lambda: synthesize_chunk_async(backend, text, voice, rate, pitch)
+    )
+    audio = extract_audio_frames(audio)
+    pieces = [(audio, words)] if len(sentences) == 1 else split_batch_audio(sentences, audio, words)
+    if pieces is None:
+        print(f"[WARNING] {label}: audio bloku se nepodarilo rozdelit po vetach, do cache se neulozi")
+        return [(audio, words)] + [(b"", [])] * (len(sentences) - 1)
+    if cache:
+        for sentence, (sentence_audio, sentence_words) in zip(sentences, pieces):
+            cache.put(SentenceCache.make_key(sentence, voice, rate, pitch, backend.version), sentence_audio, sentence_words)
+    return pieces
+
+
+class SynthesisProgress:
+    """Průběžná statistika zapsaných dat a délky audia za celý běh"""
+
+    def __init__(self, total_parts: int, interval: float = PROGRESS_INTERVAL):
+        self.total_parts = total_parts
+        self.done_parts = 0
+        self.bytes_written = 0
+        self.audio_seconds = 0.0
+        self.interval = interval
+        self._last_report = time.perf_counter()
+
+    def add(self, data: bytes):
+        """Započítá zapsaný blok a případně vypíše průběh"""
+        self.bytes_written += len(data)
+        self.audio_seconds += estimate_duration(data)
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report()
+
+    def part_done(self):
+        self.done_parts += 1
+
+    def report(self):
+        print(f"[PRUBEH] {self.bytes_written / (1024 * 1024):.1f} MB, {self.audio_seconds:.1f} s audia "
+              f"({self.done_parts}/{self.total_parts} casti hotovo)")
+
+
+def cleanup_partial_outputs(directory: Path = AUDIO_OUTPUT_DIR):
+    """Smaže nedokončené dočasné soubory, které zůstaly po násilně ukončeném běhu"""
+    if not directory.exists():
+        return
+    for partial in directory.glob(f".*{PARTIAL_SUFFIX}"):
+        try:
+            partial.unlink()
+            print(f"[WARNING] Smazan nedokonceny soubor z predchoziho behu: {partial.name}")
+        except OSError:
+            pass
+
+
 async def generate_audio_async(
     text: str,
     voice: str,
     output_path: Path,
     rate: str = "+0%",
-    pitch: str = "+0Hz"
+    pitch: str = "+0Hz",
+    max_chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    chunk_concurrency: int = DEFAULT_CHUNK_CONCURRENCY,
+    cache: Optional[SentenceCache] = None,
+    progress: Optional[SynthesisProgress] = None,
+    backend: Optional[TTSBackend] = None,
+    scheduler: Optional[SynthesisScheduler] = None
 ) -> bool:
     """
-    Vygeneruje audio soubor z textu pomocí Edge TTS
+    Vygeneruje audio soubor z textu pomocí TTS backendu (výchozí je Edge TTS)
+    
+    Text se rozdělí na věty; věty nalezené v cache se nesyntetizují znovu, ostatní
+    se skládají do bloků do max_chunk_chars znaků, které se syntetizují souběžně
+    a po větách ukládají do cache. Hotové věty se v pořadí zapisují po MP3 rámcích
+    do dočasného souboru a ten se do cílové cesty přesune atomicky až po dokončení,
+    takže přerušený běh nikdy nezanechá useknuté MP3. V paměti je najednou jen
+    omezené okno rozpracovaných bloků. Z časů slov ze stejného streamu se vedle MP3
+    zapíšou titulky .vtt a index slov .words.json.
     
     Args:
         text: Text k převedení na řeč
@@ -85,20 +598,33 @@ async def generate_audio_async(
         output_path: Cesta pro uložení MP3 souboru
         rate: Rychlost řeči (např. "+10%" pro rychleji, "-10%" pro pomaleji)
         pitch: Výška hlasu (např. "+10Hz" pro vyšší, "-10Hz" pro nižší)
+        max_chunk_chars: Maximální délka bloku vět syntetizovaného jedním požadavkem (ve znacích)
+        chunk_concurrency: Počet bloků jedné části rozpracovaných dopředu (okno je dvojnásobné)
+        cache: Cache syntetizovaných vět (volitelné)
+        progress: Sdílená statistika průběhu (volitelné)
+        backend: TTS backend (výchozí Edge TTS)
+        scheduler: Centrální plánovač požadavků (výchozí nový s výchozími limity)
     
     Returns:
         True pokud bylo generování úspěšné, False jinak
     """
     try:
-        print(f"Generuji audio... (delka textu: {len(text)} znaku)")
+        if backend is None:
+            backend = create_backend("edge")
+        if scheduler is None:
+            scheduler = SynthesisScheduler()
+        sentences = split_text_into_sentences(text, max_chunk_chars)
+        print(f"Generuji audio {output_path.name}... (delka textu: {len(text)} znaku, {len(sentences)} vet)")
         print(f"Pouzivam hlas: {voice}")
         
         # Vytvoř výstupní adresář
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Vygeneruj audio
-        communicate = edge_tts.Communicate(text, voice, rate=rate, pitch=pitch)
-        await communicate.save(str(output_path))
+        words, duration_ms = await write_chunks_atomically(
+            backend, sentences, voice, output_path, rate, pitch, max_chunk_chars, chunk_concurrency,
+            cache, progress, scheduler
+        )
+        write_captions(output_path, text, words, duration_ms)
         
         file_size = output_path.stat().st_size / 1024  # KB
         print(f"[OK] Audio uspesne vygenerovano: {output_path}")
@@ -110,6 +636,153 @@ async def generate_audio_async(
         return False
 
 
+async def write_chunks_atomically(
+    backend: TTSBackend,
+    sentences: list[str],
+    voice: str,
+    output_path: Path,
+    rate: str,
+    pitch: str,
+    max_chunk_chars: int,
+    chunk_concurrency: int,
+    cache: Optional[SentenceCache],
+    progress: Optional[SynthesisProgress],
+    scheduler: SynthesisScheduler
+) -> tuple[list[tuple[int, int, str]], int]:
+    """
+    Složí věty do bloků (věta z cache je samostatný blok), syntetizuje bloky
+    v klouzavém okně a věty v pořadí zapisuje do dočasného souboru, který se
+    po úspěšném dokončení atomicky přejmenuje na output_path.
+    
+    Returns:
+        (časy slov posunuté na začátek celého MP3, délka audia v ms)
+    """
+    keys = [SentenceCache.make_key(sentence, voice, rate, pitch, backend.version) for sentence in sentences] \
+        if cache else []
+    cached = [cache.contains(key) for key in keys] if cache else [False] * len(sentences)
+    batches = pack_sentences(sentences, cached, max_chunk_chars)
+
+    words = []
+    elapsed_ms = 0.0
+    window = max(1, chunk_concurrency) * 2
+    pending: dict[int, asyncio.Task] = {}
+    next_to_start = 0
+    
+    fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, prefix=f".{output_path.stem}.", suffix=PARTIAL_SUFFIX)
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb", buffering=WRITE_BUFFER_SIZE) as out:
+            for index in range(len(batches)):
+                # Rozjeď syntézu bloků v okně před aktuálně zapisovaným blokem
+                while next_to_start < len(batches) and next_to_start < index + window:
+                    batch = batches[next_to_start]
+                    pending[next_to_start] = asyncio.ensure_future(synthesize_batch_with_retry(
+                        backend, output_path.name, f"{output_path.name} blok {next_to_start + 1}/{len(batches)}",
+                        [sentences[i] for i in batch], voice, rate, pitch, scheduler, cache, cached[batch[0]]
+                    ))
+                    next_to_start += 1
+                
+                for audio, chunk_words in await pending.pop(index):
+                    out.write(audio)
+                    # Časy slov jsou relativní k větě - posuň je o délku už zapsaného audia
+                    # (výstup Edge TTS má konstantní bitrate, odhad délky je tedy přesný)
+                    offset = round(elapsed_ms)
+                    words.extend((start + offset, end + offset, word) for start, end, word in chunk_words)
+                    elapsed_ms += estimate_duration(audio) * 1000
+                    if progress:
+                        progress.add(audio)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, output_path)
+        return words, round(elapsed_ms)
+    finally:
+        for task in pending.values():
+            task.cancel()
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def compute_audio_hash(text: str, voice: str, rate: str, pitch: str, engine: str) -> str:
+    """Spočítá otisk všech vstupů, které ovlivňují výsledné audio"""
+    payload = json.dumps(
+        {"text": text, "voice": voice, "rate": rate, "pitch": pitch, "engine": engine},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(path: Path = AUDIO_MANIFEST_PATH) -> dict:
+    """Načte manifest audio souborů (název MP3 -> otisk vstupů)"""
+    if not path.exists():
+        return {"version": MANIFEST_VERSION, "files": {}}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"[WARNING] Nepodarilo se nacist manifest, vse se vygeneruje znovu: {e}")
+        return {"version": MANIFEST_VERSION, "files": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "files": {}}
+    manifest.setdefault("files", {})
+    return manifest
+
+
+def save_manifest(manifest: dict, path: Path = AUDIO_MANIFEST_PATH):
+    """Uloží manifest audio souborů"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def is_published_output_dir(output_dir: Path) -> bool:
+    """Zjistí, zda adresář je assets/audio nebo leží uvnitř (publikované audio kurzu)"""
+    published = AUDIO_OUTPUT_DIR.resolve()
+    output_dir = output_dir.resolve()
+    return output_dir == published or published in output_dir.parents
+
+
+def is_part_up_to_date(manifest: dict, part: dict, audio_hash: str) -> bool:
+    """Zjistí, zda MP3 (včetně titulků) pro danou část existuje a odpovídá aktuálním vstupům"""
+    entry = manifest["files"].get(part["audio_filename"])
+    if not entry or entry.get("hash") != audio_hash:
+        return False
+    return part["output_path"].exists() and all(path.exists() for path in caption_paths(part["output_path"]))
+
+
+def transcript_path_for(part: dict) -> Path:
+    """Vrátí cestu k souboru s přepisem části (klíčem je název scénáře, např. T01_part1)"""
+    return TRANSCRIPTS_DIR / f"{part['script_path'].stem}.txt"
+
+
+def write_transcript(part: dict) -> str:
+    """
+    Zapíše přepis části (text scénáře) do samostatného souboru, pokud se změnil.
+
+    Přepis je přesně text, ze kterého vzniklo audio, takže pozice znaků
+    v indexu slov (.words.json) odpovídají tomuto souboru.
+
+    Returns:
+        Relativní cesta k přepisu pro topic JSON
+    """
+    path = transcript_path_for(part)
+    content = part["text"] + "\n"
+    try:
+        current = path.read_text(encoding="utf-8")
+    except OSError:
+        current = None
+    if current != content:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".txt.tmp")
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    return path.relative_to(PROJECT_ROOT).as_posix()
+
+
 def read_script(script_path: Path) -> Optional[str]:
     """Přečte text ze scénáře"""
     try:
@@ -279,24 +952,62 @@ def sanitize_filename(text: str) -> str:
     return text
 
 
-async def main_async():
-    """Hlavní asynchronní funkce"""
-    # Získej název souboru z argumentů nebo použij T01
-    if len(sys.argv) > 1:
-        topic_id = sys.argv[1].upper()
-        if not topic_id.startswith("T"):
-            topic_id = f"T{topic_id}"
-    else:
-        topic_id = "T01"
-    
-    # Najdi všechny audio-scénáře pro toto téma
+def normalize_topic_id(raw: str) -> str:
+    """Převede zadané ID tématu ("1", "t1", "T01") na kanonický tvar "T01" """
+    topic_id = raw.strip().upper()
+    if not topic_id.startswith("T"):
+        topic_id = f"T{topic_id}"
+    number = topic_id[1:]
+    if number.isdigit():
+        topic_id = f"T{int(number):02d}"
+    return topic_id
+
+
+def parse_topic_selection(selection: str) -> list[str]:
+    """
+    Rozparsuje výběr témat z příkazové řádky.
+
+    Podporuje výčet i rozsahy, např. "T01,T05-T12" -> ["T01", "T05", "T06", ..., "T12"].
+    Duplicity jsou odstraněny, pořadí zůstává zachováno.
+    """
+    topic_ids = []
+    for item in selection.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if "-" in item:
+            start, end = (normalize_topic_id(part) for part in item.split("-", 1))
+            start_num, end_num = int(start[1:]), int(end[1:])
+            if start_num > end_num:
+                raise ValueError(f"Neplatny rozsah temat: {item}")
+            topic_ids.extend(f"T{num:02d}" for num in range(start_num, end_num + 1))
+        else:
+            topic_ids.append(normalize_topic_id(item))
+    return list(dict.fromkeys(topic_ids))
+
+
+def find_all_topic_ids() -> list[str]:
+    """Vrátí seřazená ID všech témat, pro která existuje alespoň jeden audio-scénář"""
+    topic_ids = set()
+    for script_path in AUDIO_SCRIPTS_DIR.glob("T*.txt"):
+        match = re.match(r'(T\d+)', script_path.stem)
+        if match:
+            topic_ids.add(match.group(1))
+    return sorted(topic_ids)
+
+
+def plan_topic(topic_id: str, voice_override: Optional[str] = None, output_dir: Path = AUDIO_OUTPUT_DIR) -> Optional[dict]:
+    """
+    Připraví plán generování pro jedno téma - načte scénáře, určí hlas a názvy výstupních souborů.
+    Pokud je zadán voice_override, použije se místo automatického výběru hlasu.
+    MP3 soubory se zapisují do output_dir (výchozí assets/audio).
+
+    Returns:
+        Slovník s informacemi o tématu a seznamem částí ("parts"), nebo None pokud téma nemá scénář
+    """
     script_paths = find_audio_scripts(topic_id)
-    
     if not script_paths:
-        print(f"[ERROR] Zadny scenar nenalezen pro tema {topic_id}")
-        print(f"  Hledano v: {AUDIO_SCRIPTS_DIR}")
-        print(f"  Ocekavane soubory: {topic_id}.txt nebo {topic_id}_part*.txt")
-        sys.exit(1)
+        return None
     
     print(f"[OK] Nalezeno {len(script_paths)} scenar(u) pro tema {topic_id}")
     for i, path in enumerate(script_paths, 1):
@@ -308,52 +1019,27 @@ async def main_async():
     topic_order = topic_info.get("order", int(topic_id[1:]) if len(topic_id) > 1 else 1) if topic_info else int(topic_id[1:]) if len(topic_id) > 1 else 1
     
     # Získej hlas - střídá se podle čísla tématu
-    voice = os.getenv("EDGE_TTS_VOICE")
+    voice = voice_override
     
     if not voice:
         # Automaticky urči hlas podle čísla tématu
         voice = get_voice_for_topic(topic_id)
         voice_gender = "zeny" if voice == CZECH_VOICES["female"] else "muzsky"
-        print(f"\n[OK] Automaticky vybrany hlas ({voice_gender}): {voice}")
+        print(f"[OK] Automaticky vybrany hlas ({voice_gender}): {voice}")
     else:
-        print(f"\n[OK] Pouzivam hlas z prostredi: {voice}")
-    
-    # Pokud uživatel chce vidět seznam hlasů
-    if "--list-voices" in sys.argv:
-        await list_czech_voices()
-        return
-    
-    # Nastavení rychlosti a výšky hlasu (lze upravit podle potřeby)
-    # Rychlost: +10% = rychleji, -10% = pomaleji
-    # Výška: +10Hz = vyšší, -10Hz = nižší
-    rate = os.getenv("EDGE_TTS_RATE", "+0%")
-    pitch = os.getenv("EDGE_TTS_PITCH", "+0Hz")
-    
-    print(f"\nNastaveni:")
-    print(f"  Hlas: {voice}")
-    print(f"  Rychlost: {rate}")
-    print(f"  Vyska: {pitch}")
-    print()
+        print(f"[OK] Pouzivam hlas z prostredi: {voice}")
     
     # Vytvoř bezpečný název tématu pro soubory
     safe_title = sanitize_filename(topic_title)
     
-    # Vygeneruj audio pro každý scénář
-    audio_files = []
-    
+    parts = []
     for i, script_path in enumerate(script_paths, 1):
-        print(f"\n{'='*60}")
-        print(f"Zpracovavani scenare {i}/{len(script_paths)}: {script_path.name}")
-        print(f"{'='*60}")
-        
         # Přečti scénář
         text = read_script(script_path)
         if not text:
             print(f"[WARNING] Preskakuji scenar {script_path.name} kvuli chybe")
             continue
         
-        print(f"Text nacten ({len(text)} znaku, ~{len(text.split())} slov)")
-        
         # Urči název souboru
         if len(script_paths) == 1:
             # Jeden soubor: "Otazka-X-Nazev-tematu.mp3"
@@ -363,19 +1049,8 @@ async def main_async():
         else:
             # Více souborů: "Otazka-X-Nazev-tematu-cast-Y.mp3"
             # Zkus extrahovat číslo části z názvu souboru (např. "part1" -> 1)
-            part_match = None
-            if "_part" in script_path.stem.lower():
-                try:
-                    # Najdi číslo za "_part"
-                    match = re.search(r'_part(\d+)', script_path.stem, re.IGNORECASE)
-                    if match:
-                        part_number = int(match.group(1))
-                    else:
-                        part_number = i
-                except:
-                    part_number = i
-            else:
-                part_number = i
+            match = re.search(r'_part(\d+)', script_path.stem, re.IGNORECASE)
+            part_number = int(match.group(1)) if match else i
             
             # Zkus extrahovat smysluplný název z obsahu
             content_title = extract_content_title(text)
@@ -388,38 +1063,281 @@ async def main_async():
             
             audio_filename = f"Otazka-{topic_order}-{safe_title}-cast-{part_number}.mp3"
         
-        output_path = AUDIO_OUTPUT_DIR / audio_filename
-        
-        # Vygeneruj audio
-        success = await generate_audio_async(text, voice, output_path, rate, pitch)
-        
-        if success:
-            print(f"[OK] Audio soubor vytvoren: {output_path}")
+        parts.append({
+            "script_path": script_path,
+            "text": text,
+            "output_path": output_dir / audio_filename,
+            "audio_filename": audio_filename,
+            "audio_title": audio_title,
+            "part": part_number,
+        })
+    
+    return {
+        "topic_id": topic_id,
+        "topic_info": topic_info,
+        "topic_title": topic_title,
+        "topic_order": topic_order,
+        "voice": voice,
+        "parts": parts,
+    }
+
+
+async def generate_part_async(
+    part: dict,
+    voice: str,
+    rate: str,
+    pitch: str,
+    semaphore: asyncio.Semaphore,
+    manifest: dict,
+    force: bool = False,
+    cache: Optional[SentenceCache] = None,
+    progress: Optional[SynthesisProgress] = None,
+    backend: Optional[TTSBackend] = None,
+    scheduler: Optional[SynthesisScheduler] = None
+) -> tuple[str, float, float]:
+    """
+    Vygeneruje audio pro jednu část tématu; počet současně běžících syntéz omezuje semafor.
+    Části, jejichž vstupy se od posledního běhu nezměnily, se přeskočí (pokud není force).
+
+    Returns:
+        (stav, čas začátku, čas konce) - stav je "generated", "skipped" nebo "failed",
+        časy jsou z time.perf_counter()
+    """
+    if backend is None:
+        backend = create_backend("edge")
+    engine = engine_version(backend)
+    audio_hash = compute_audio_hash(part["text"], voice, rate, pitch, engine)
+    if not force and is_part_up_to_date(manifest, part, audio_hash):
+        now = time.perf_counter()
+        print(f"[SKIP] {part['audio_filename']} je aktualni")
+        if progress:
+            progress.part_done()
+        return "skipped", now, now
+    
+    async with semaphore:
+        started = time.perf_counter()
+        print(f"\n[{part['script_path'].name}] Text nacten ({len(part['text'])} znaku, ~{len(part['text'].split())} slov)")
+        success = await generate_audio_async(
+            part["text"], voice, part["output_path"], rate, pitch,
+            cache=cache, progress=progress, backend=backend, scheduler=scheduler
+        )
+        if progress:
+            progress.part_done()
+        if not success:
+            return "failed", started, time.perf_counter()
+        manifest["files"][part["audio_filename"]] = {
+            "hash": audio_hash,
+            "script": part["script_path"].name,
+            "voice": voice,
+            "rate": rate,
+            "pitch": pitch,
+            "engine": engine,
+        }
+        return "generated", started, time.perf_counter()
+
+
+async def process_topic_async(
+    plan: dict,
+    rate: str,
+    pitch: str,
+    semaphore: asyncio.Semaphore,
+    manifest: dict,
+    force: bool = False,
+    cache: Optional[SentenceCache] = None,
+    progress: Optional[SynthesisProgress] = None,
+    backend: Optional[TTSBackend] = None,
+    scheduler: Optional[SynthesisScheduler] = None,
+    output_dir: Optional[Path] = None
+) -> dict:
+    """
+    Vygeneruje všechny části jednoho tématu (souběžně) a aktualizuje topic JSON.
+
+    S output_dir (výstup mimo assets/audio) se manifest ukládá do output_dir
+    a topic JSON ani přepisy v data/transcripts se nemění.
+
+    Returns:
+        Statistiky tématu: počet částí, úspěšné a přeskočené části, počet syntetizovaných znaků
+        a čas zpracování
+    """
+    topic_id = plan["topic_id"]
+    parts = plan["parts"]
+    
+    results = await asyncio.gather(*(
+        generate_part_async(
+            part, plan["voice"], rate, pitch, semaphore, manifest, force, cache, progress, backend, scheduler
+        )
+        for part in parts
+    ))
+    
+    # Ulož manifest průběžně, aby přerušený dávkový běh nepřišel o hotová témata
+    if any(status == "generated" for status, _, _ in results):
+        save_manifest(manifest, output_dir / "manifest.json" if output_dir else AUDIO_MANIFEST_PATH)
+    
+    # Cesty v topic JSON jsou relativní ke kořeni webu; výstup mimo assets/audio se vypíše celou cestou
+    src_dir = output_dir.as_posix() if output_dir else "assets/audio"
+    audio_files = []
+    chars = 0
+    skipped = 0
+    for part, (status, _, _) in zip(parts, results):
+        if status == "generated":
+            chars += len(part["text"])
+        elif status == "skipped":
+            skipped += 1
+        if status != "failed":
+            vtt_path, index_path = caption_paths(part["output_path"])
             audio_files.append({
-                "src": f"assets/audio/{audio_filename}",
-                "title": audio_title,
-                "part": part_number if len(script_paths) > 1 else None
+                "src": f"{src_dir}/{part['audio_filename']}",
+                "title": part["audio_title"],
+                "part": part["part"],
+                "captions": f"{src_dir}/{vtt_path.name}",
+                "words": f"{src_dir}/{index_path.name}",
+                "transcriptSource": transcript_path_for(part).relative_to(PROJECT_ROOT).as_posix()
+                                    if output_dir else write_transcript(part)
             })
         else:
-            print(f"[ERROR] Nepodarilo se vygenerovat audio pro {script_path.name}")
+            print(f"[ERROR] Nepodarilo se vygenerovat audio pro {part['script_path'].name}")
+    
+    # Aktualizuj topic JSON s novými názvy souborů (jen pokud se něco skutečně generovalo)
+    if audio_files and len(audio_files) > skipped and plan["topic_info"] and not output_dir:
+        update_topic_audio_reference(topic_id, plan["topic_info"], audio_files, plan["topic_title"], plan["topic_order"])
+    
+    # Čas tématu = od startu první části do dokončení poslední
+    elapsed = max(end for _, _, end in results) - min(start for _, start, _ in results) if results else 0.0
+    
+    return {
+        "topic_id": topic_id,
+        "parts": len(parts),
+        "ok": len(audio_files),
+        "skipped": skipped,
+        "chars": chars,
+        "elapsed": elapsed,
+        "audio_files": audio_files,
+    }
+
+
+async def main_async(args: argparse.Namespace):
+    """Hlavní asynchronní funkce"""
+    backend = create_backend(args.backend)
     
-    # Aktualizuj topic JSON s novými názvy souborů
-    if audio_files and topic_info:
-        update_topic_audio_reference(topic_id, topic_info, audio_files, topic_title, topic_order)
+    # Pokud uživatel chce vidět seznam hlasů
+    if args.list_voices:
+        await list_czech_voices(backend, args.refresh_voices)
+        return
+    
+    # Publikované audio kurzu smí přepsat jen skutečný backend; jiný výstup jde mimo assets/audio
+    output_dir = args.output_dir
+    if output_dir and is_published_output_dir(output_dir):
+        print(f"[ERROR] --output-dir musi lezet mimo {AUDIO_OUTPUT_DIR} (bez nej se zapisuje primo tam)")
+        sys.exit(1)
+    if backend.name == "silent" and not output_dir:
+        print(f"[ERROR] Backend silent vytvari tiche audio, zadejte --output-dir mimo {AUDIO_OUTPUT_DIR}")
+        sys.exit(1)
+    
+    # Hlas z prostředí lze zadat i jménem (např. "Vlasta") - dohledá se v katalogu
+    voice_override = os.getenv("EDGE_TTS_VOICE")
+    if voice_override and not re.match(r'^[a-z]{2}-[A-Z]{2}-', voice_override):
+        resolved = await find_voice_by_name(voice_override, backend, args.refresh_voices)
+        if not resolved:
+            print(f"[ERROR] Hlas '{voice_override}' nebyl nalezen, viz --list-voices")
+            sys.exit(1)
+        voice_override = resolved
+    elif args.refresh_voices:
+        await get_czech_voices(backend, refresh=True)
+    
+    # Urči, která témata zpracovat
+    batch_mode = args.all or bool(args.topics)
+    if args.all:
+        topic_ids = find_all_topic_ids()
+    elif args.topics:
+        try:
+            topic_ids = parse_topic_selection(args.topics)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+    else:
+        topic_ids = [normalize_topic_id(args.topic or "T01")]
+    
+    # Nastavení rychlosti a výšky hlasu (lze upravit podle potřeby)
+    # Rychlost: +10% = rychleji, -10% = pomaleji
+    # Výška: +10Hz = vyšší, -10Hz = nižší
+    rate = os.getenv("EDGE_TTS_RATE", "+0%")
+    pitch = os.getenv("EDGE_TTS_PITCH", "+0Hz")
+    concurrency = max(1, args.concurrency)
+    
+    print(f"\nNastaveni:")
+    print(f"  Temata: {', '.join(topic_ids)}")
+    print(f"  Rychlost: {rate}")
+    print(f"  Vyska: {pitch}")
+    print(f"  Soubeznost: {concurrency}")
+    print()
+    
+    # Najdi scénáře a připrav plán pro každé téma
+    plans = []
+    for topic_id in topic_ids:
+        plan = plan_topic(topic_id, voice_override, output_dir or AUDIO_OUTPUT_DIR)
+        if plan is None:
+            print(f"[ERROR] Zadny scenar nenalezen pro tema {topic_id}")
+            print(f"  Hledano v: {AUDIO_SCRIPTS_DIR}")
+            print(f"  Ocekavane soubory: {topic_id}.txt nebo {topic_id}_part*.txt")
+            if not batch_mode:
+                sys.exit(1)
+            continue
+        plans.append(plan)
+    
+    # Všechny části všech témat běží v jedné smyčce událostí, souběžnost omezuje semafor
+    semaphore = asyncio.Semaphore(concurrency)
+    manifest = load_manifest(output_dir / "manifest.json" if output_dir else AUDIO_MANIFEST_PATH)
+    # Tiché věty nemají ve sdílené cache co dělat - vytlačily by z ní skutečné nahrávky
+    cache_dir = output_dir / ".tts_sentences" if backend.name == "silent" else SENTENCE_CACHE_DIR
+    cache = SentenceCache(cache_dir, SENTENCE_CACHE_MAX_MB * 1024 * 1024)
+    scheduler = SynthesisScheduler(args.rps, args.max_in_flight)
+    progress = SynthesisProgress(sum(len(plan["parts"]) for plan in plans))
+    cleanup_partial_outputs(output_dir or AUDIO_OUTPUT_DIR)
+    batch_start = time.perf_counter()
+    topic_stats = await asyncio.gather(*(
+        process_topic_async(
+            plan, rate, pitch, semaphore, manifest, args.force, cache, progress, backend, scheduler, output_dir
+        )
+        for plan in plans
+    ))
+    batch_elapsed = time.perf_counter() - batch_start
+    progress.report()
+    cache.print_stats()
+    scheduler.print_stats()
     
     # Shrnutí
     print(f"\n{'='*60}")
-    if audio_files:
-        print(f"[OK] Hotovo! Vytvoreno {len(audio_files)} audio souboru pro tema {topic_id}")
-        for audio_file in audio_files:
-            print(f"  - {audio_file['src']}")
-    else:
+    total_parts = sum(stats["parts"] for stats in topic_stats)
+    total_ok = sum(stats["ok"] for stats in topic_stats)
+    total_skipped = sum(stats["skipped"] for stats in topic_stats)
+    total_chars = sum(stats["chars"] for stats in topic_stats)
+    
+    if not total_ok:
         print(f"[ERROR] Nepodarilo se vytvorit zadne audio soubory")
         sys.exit(1)
     
-    print(f"\nTip: Chcete-li pouzit jiny hlas, spustte:")
-    print(f"  python scripts/generate_audio.py {topic_id} --list-voices")
-    print(f"  A pak nastavte: $env:EDGE_TTS_VOICE='cs-CZ-JmenoNeural'")
+    for stats in topic_stats:
+        status = "[OK]" if stats["ok"] == stats["parts"] else "[ERROR]"
+        print(f"{status} {stats['topic_id']}: {stats['ok']}/{stats['parts']} casti "
+              f"({stats['skipped']} beze zmeny), {stats['chars']} znaku, {stats['elapsed']:.1f} s")
+        for audio_file in stats["audio_files"]:
+            print(f"  - {audio_file['src']}")
+    
+    throughput = total_chars / batch_elapsed if batch_elapsed > 0 else 0.0
+    print(f"\n[OK] Hotovo! Pripraveno {total_ok}/{total_parts} audio souboru pro {len(topic_stats)} tema(t)")
+    print(f"  Preskoceno (beze zmeny): {total_skipped}")
+    print(f"  Opakovani: {len(scheduler.retried_keys)} casti s opakovanym pozadavkem, "
+          f"{total_parts - total_ok} casti trvale selhalo")
+    print(f"  Celkovy cas: {batch_elapsed:.1f} s")
+    print(f"  Propustnost: {throughput:.0f} znaku/s")
+    
+    if not batch_mode:
+        print(f"\nTip: Chcete-li pouzit jiny hlas, spustte:")
+        print(f"  python scripts/generate_audio.py {topic_ids[0]} --list-voices")
+        print(f"  A pak nastavte: $env:EDGE_TTS_VOICE='cs-CZ-JmenoNeural' (nebo jen jmeno, napr. 'Vlasta')")
+    
+    if total_ok < total_parts:
+        sys.exit(1)
 
 
 def update_topic_audio_reference(topic_id: str, topic_info: dict, audio_files: list[dict], topic_title: str, topic_order: int):
@@ -429,7 +1347,9 @@ def update_topic_audio_reference(topic_id: str, topic_info: dict, audio_files: l
     Args:
         topic_id: ID tématu (např. "T01")
         topic_info: Data z topic JSON
-        audio_files: Seznam slovníků s klíči "src", "title", "part" (volitelné)
+        audio_files: Seznam slovníků s klíči "src", "title", "part" (volitelné),
+            "captions" (titulky .vtt), "words" (index slov .words.json)
+            a "transcriptSource" (soubor s přepisem)
         topic_title: Název tématu
         topic_order: Pořadí tématu
     """
@@ -444,8 +1364,11 @@ def update_topic_audio_reference(topic_id: str, topic_info: dict, audio_files: l
         if len(audio_files) == 1:
             topic_info["audio"]["src"] = audio_files[0]["src"]
             topic_info["audio"]["title"] = audio_files[0]["title"]
-            if "transcript" in audio_files[0]:
-                topic_info["audio"]["transcript"] = audio_files[0]["transcript"]
+            # Přepis je v samostatném souboru, v topic JSON zůstává jen odkaz
+            topic_info["audio"].pop("transcript", None)
+            for key in ("transcriptSource", "captions", "words"):
+                if key in audio_files[0]:
+                    topic_info["audio"][key] = audio_files[0][key]
         else:
             # Pro více souborů použij pole
             topic_info["audio"]["files"] = audio_files
@@ -471,10 +1394,44 @@ def update_topic_audio_reference(topic_id: str, topic_info: dict, audio_files: l
         print(f"[WARNING] Nepodarilo se aktualizovat topic JSON: {e}")
 
 
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Zpracuje argumenty příkazové řádky"""
+    parser = argparse.ArgumentParser(
+        description="Generátor audio souborů z audio-scénářů pomocí Edge TTS"
+    )
+    parser.add_argument("topic", nargs="?", help="ID tématu (např. T01), výchozí je T01")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument("--all", action="store_true",
+                           help="vygenerovat audio pro všechna témata se scénářem")
+    selection.add_argument("--topics", metavar="VYBER",
+                           help="výběr témat, např. T01,T05-T12")
+    parser.add_argument("--concurrency", type=int,
+                        default=int(os.getenv("EDGE_TTS_CONCURRENCY", DEFAULT_CONCURRENCY)),
+                        help=f"maximální počet současně generovaných částí (výchozí {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--rps", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help=f"maximální počet TTS požadavků za sekundu (výchozí {DEFAULT_REQUESTS_PER_SECOND:g})")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help=f"maximální počet současně běžících TTS požadavků (výchozí {DEFAULT_MAX_IN_FLIGHT})")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="TTS backend; silent je offline náhrada s tichým audiem a vyžaduje --output-dir "
+                             "(výchozí %(default)s, lze nastavit i proměnnou TTS_BACKEND)")
+    parser.add_argument("--output-dir", type=Path, metavar="ADRESAR",
+                        help="zapsat MP3, titulky a manifest do adresáře mimo assets/audio; "
+                             "topic JSON ani přepisy se nemění")
+    parser.add_argument("--force", action="store_true",
+                        help="vygenerovat znovu i části, které se od posledního běhu nezměnily")
+    parser.add_argument("--list-voices", action="store_true",
+                        help="vypsat dostupné české hlasy")
+    parser.add_argument("--refresh-voices", action="store_true",
+                        help="znovu stáhnout katalog hlasů (jinak se používá cache na disku)")
+    return parser.parse_args(argv)
+
+
 def main():
     """Hlavní funkce - wrapper pro asynchronní kód"""
+    args = parse_args()
     try:
-        asyncio.run(main_async())
+        asyncio.run(main_async(args))
     except KeyboardInterrupt:
         print("\n\n[ERROR] Preruseno uzivatelem")
         sys.exit(1)
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pooled HTTP client shared by the maintenance scripts.
+
+The link tools talk to a handful of hosts (mostly cs/en.wikipedia.org)
+thousands of times. Opening a new TCP+TLS connection for every check costs
+more than the check itself, so this client keeps idle keep-alive connections
+per host and reuses them. All requests carry the same User-Agent.
+
+If httpx with HTTP/2 support is installed (pip install "httpx[http2]"), it is
+used instead and requests to one host are multiplexed over a single
+connection. Otherwise the client uses http.client from the standard library
+(HTTP/1.1), so the scripts need no extra dependencies.
+
+Retries of failed checks are left to LinkChecker; the client only repeats a
+request once when a reused keep-alive connection turns out to be closed by
+the server.
+"""
+
+import http.client
+import socket
+import ssl
+import threading
+import urllib.parse
+import urllib.request
+
+try:
+    import httpx
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+except ImportError:
+    httpx = None
+
+USER_AGENT = 'Mozilla/5.0 (compatible; DejinyTanceLinkChecker/1.0)'
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_IDLE_PER_HOST = 8
+DEFAULT_MAX_REDIRECTS = 10
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+# Unread rest of a body up to this size is read to keep the connection;
+# a longer one is cheaper to drop together with the connection
+MAX_DRAIN_BYTES = 64 * 1024
+
+
+def normalize_request_url(url):
+    """Percent-encode non-ASCII characters in the path and query and IDNA-encode the host."""
+    parsed = urllib.parse.urlsplit(url)
+    path = urllib.parse.quote(parsed.path, safe="/%:@!$&'()*+,;=-._~")
+    query = urllib.parse.quote(parsed.query, safe="=&%:@!$'()*+,;/?-._~")
+    netloc = parsed.netloc
+    try:
+        netloc.encode('ascii')
+    except UnicodeEncodeError:
+        netloc = netloc.encode('idna').decode('ascii')
+    return urllib.parse.urlunsplit((parsed.scheme, netloc, path, query, ''))
+
+
+def _error_result(url, error):
+    return {'url': url, 'status': None, 'final_url': url, 'headers': {}, 'body': None, 'error': error}
+
+
+class HttpClient:
+    """
+    Thread-safe HTTP client with per-host keep-alive connection pools.
+
+    Usage:
+        client = HttpClient()
+        result = client.request(url, method='HEAD')
+        client.print_stats()
+        client.close()
+    """
+
+    def __init__(self, max_idle_per_host=DEFAULT_MAX_IDLE_PER_HOST, max_redirects=DEFAULT_MAX_REDIRECTS,
+                 user_agent=USER_AGENT, http2=True):
+        """
+        Args:
+            max_idle_per_host: How many idle connections are kept open per host
+            max_redirects: Maximum number of redirects followed for one request
+            user_agent: User-Agent header sent with every request
+            http2: Use HTTP/2 through httpx when it is installed
+        """
+        self.max_idle_per_host = max(1, max_idle_per_host)
+        self.max_redirects = max_redirects
+        self.user_agent = user_agent
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+        self._proxies = urllib.request.getproxies()
+        self.requests = 0
+        self.connections = 0
+        self.reused = 0
+        self._httpx = None
+        self._streams = {}
+        if http2 and httpx is not None:
+            self._httpx = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                max_redirects=max_redirects,
+                headers={'User-Agent': user_agent},
+                limits=httpx.Limits(max_keepalive_connections=self.max_idle_per_host * 4),
+            )
+
+    @property
+    def protocol(self):
+        return 'HTTP/2 (httpx)' if self._httpx is not None else 'HTTP/1.1 keep-alive'
+
+    def request(self, url, method='HEAD', timeout=DEFAULT_TIMEOUT, read_body=0, headers=None):
+        """
+        Perform one HTTP request (following redirects) and describe the outcome.
+
+        Returns a dict with keys:
+            url, status (int or None), final_url, headers (dict, lowercase keys),
+            body (str or None, at most read_body bytes), error (str or None)
+        """
+        request_headers = {'User-Agent': self.user_agent}
+        if headers:
+            request_headers.update(headers)
+        try:
+            if self._httpx is not None:
+                return self._request_httpx(url, method, timeout, read_body, request_headers)
+            return self._request_pooled(url, method, timeout, read_body, request_headers)
+        except (socket.timeout, TimeoutError):
+            return _error_result(url, 'Timeout')
+        except (ssl.SSLError, ConnectionError, OSError, http.client.HTTPException) as e:
+            return _error_result(url, f"Connection Error: {str(e)[:50]}")
+        except Exception as e:
+            if httpx is not None and isinstance(e, httpx.TimeoutException):
+                return _error_result(url, 'Timeout')
+            if httpx is not None and isinstance(e, httpx.TooManyRedirects):
+                return _error_result(url, 'Too Many Redirects')
+            if httpx is not None and isinstance(e, httpx.TransportError):
+                return _error_result(url, f"Connection Error: {str(e)[:50]}")
+            return _error_result(url, f"Unexpected Error: {str(e)[:50]}")
+
+    # --- standard library backend -------------------------------------------------
+
+    def _proxy_for(self, scheme, host):
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        parsed = urllib.parse.urlsplit(proxy)
+        return parsed.hostname, parsed.port or 8080
+
+    def _new_connection(self, scheme, host, port, timeout):
+        proxy = self._proxy_for(scheme, host)
+        if scheme == 'https':
+            if proxy:
+                conn = http.client.HTTPSConnection(proxy[0], proxy[1], timeout=timeout, context=self._ssl_context)
+                conn.set_tunnel(host, port)
+            else:
+                conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+            conn.absolute_target = False
+        else:
+            if proxy:
+                conn = http.client.HTTPConnection(proxy[0], proxy[1], timeout=timeout)
+            else:
+                conn = http.client.HTTPConnection(host, port, timeout=timeout)
+            # A plain HTTP proxy expects the full URL in the request line
+            conn.absolute_target = bool(proxy)
+        return conn
+
+    def _acquire(self, key, timeout):
+        """Return (connection, reused) - an idle pooled connection if there is one."""
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        return self._new_connection(*key, timeout), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _exchange(self, url, method, timeout, headers):
+        """Send one request (no redirects). Returns (key, connection, response)."""
+        parsed = urllib.parse.urlsplit(url)
+        scheme = parsed.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise ValueError(f"unsupported URL scheme: {scheme or url}")
+        key = (scheme, parsed.hostname, parsed.port or (443 if scheme == 'https' else 80))
+        target = urllib.parse.urlunsplit(('', '', parsed.path or '/', parsed.query, ''))
+
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request(method, url if conn.absolute_target else target, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused:
+                    # The server closed the idle connection meanwhile, try a fresh one
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            with self._lock:
+                self.requests += 1
+                if reused:
+                    self.reused += 1
+                else:
+                    self.connections += 1
+            return key, conn, response
+
+    def _finish(self, key, conn, response, limit):
+        """Read at most limit bytes of the body and return the connection to the pool if possible."""
+        try:
+            data = response.read(limit) if limit else b''
+            if not response.isclosed() and response.length is not None and response.length <= MAX_DRAIN_BYTES:
+                response.read()
+        except BaseException:
+            # A half-read response leaves the connection in an unknown state, never reuse it
+            conn.close()
+            raise
+        if response.isclosed() and not response.will_close:
+            self._release(key, conn)
+        else:
+            conn.close()
+        return data
+
+    def _request_pooled(self, url, method, timeout, read_body, headers):
+        request_url = normalize_request_url(url)
+        for _ in range(self.max_redirects + 1):
+            key, conn, response = self._exchange(request_url, method, timeout, headers)
+            response_headers = {name.lower(): value for name, value in response.getheaders()}
+            location = response_headers.get('location')
+            if response.status in REDIRECT_STATUSES and location:
+                self._finish(key, conn, response, 0)
+                request_url = normalize_request_url(urllib.parse.urljoin(request_url, location))
+                if response.status == 303 and method != 'HEAD':
+                    method = 'GET'
+                continue
+
+            body = None
+            if read_body and method == 'GET':
+                charset = response.headers.get_content_charset() or 'utf-8'
+                body = self._finish(key, conn, response, read_body).decode(charset, errors='replace')
+            else:
+                self._finish(key, conn, response, 0)
+            return {
+                'url': url,
+                'status': response.status,
+                'final_url': request_url,
+                'headers': response_headers,
+                'body': body,
+                'error': None,
+            }
+        return _error_result(url, 'Too Many Redirects')
+
+    # --- httpx backend (HTTP/2) ---------------------------------------------------
+
+    def _request_httpx(self, url, method, timeout, read_body, headers):
+        with self._httpx.stream(method, normalize_request_url(url), headers=headers, timeout=timeout) as response:
+            body = None
+            if read_body and method == 'GET':
+                data = b''
+                for chunk in response.iter_bytes():
+                    data += chunk
+                    if len(data) >= read_body:
+                        break
+                body = data[:read_body].decode(response.encoding or 'utf-8', errors='replace')
+            # One network stream per connection; a stream seen before means a reused connection
+            streams = [r.extensions.get('network_stream') for r in response.history + [response]]
+            with self._lock:
+                for stream in streams:
+                    self.requests += 1
+                    if stream is not None and id(stream) in self._streams:
+                        self.reused += 1
+                    else:
+                        self.connections += 1
+                        if stream is not None:
+                            self._streams[id(stream)] = stream
+            return {
+                'url': url,
+                'status': response.status_code,
+                'final_url': str(response.url),
+                'headers': {name.lower(): value for name, value in response.headers.items()},
+                'body': body,
+                'error': None,
+            }
+
+    def print_stats(self):
+        """Print how many connections were opened and how many requests reused one."""
+        share = f" ({100 * self.reused / self.requests:.0f} %)" if self.requests else ''
+        print(f"HTTP connections ({self.protocol}): {self.connections} opened for {self.requests} requests, "
+              f"{self.reused} requests on a reused connection{share}")
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+        if self._httpx is not None:
+            self._httpx.close()
+            self._streams.clear()
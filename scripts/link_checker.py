@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared asyncio engine for checking links.
+
+Used by check_wiki_links.py, validate_resource_links.py and
+fix_wikipedia_links_improved.py. Many URLs are checked concurrently, but:
+- a global cap limits the number of requests in flight,
+- per host, an AIMD controller adapts the number of parallel requests: it
+  widens while responses are healthy and halves on 429/503, and the host is
+  paused for as long as its Retry-After asks (other hosts keep going),
+- a per-host politeness delay spaces out request starts on the same host,
+- throttled URLs are requeued rather than reported as broken; 403 Forbidden
+  is treated the same way (it often means "too many requests" from a bot
+  filter) and a URL still throttled at the end is reported as undecided,
+- every request has a timeout, transient failures are retried with backoff,
+- optionally, results are kept in a persistent LinkStatusStore and reused
+  or cheaply revalidated (304) on the next run.
+
+HTTP itself goes through the pooled HttpClient (http_client.py) in a
+bounded thread pool, so checks to the same host reuse keep-alive connections.
+"""
+
+import asyncio
+import random
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from http_client import DEFAULT_TIMEOUT, HttpClient
+from link_status_store import DEFAULT_STORE_PATH, LinkStatusStore
+
+DEFAULT_MAX_IN_FLIGHT = 16
+DEFAULT_PER_HOST = 8
+DEFAULT_HOST_DELAY = 0.1
+DEFAULT_RETRIES = 2
+
+# Status codes that are worth retrying (rate limiting, temporary server errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Status codes that mean "slow down"; 403 is not decisive either way (bot filters,
+# rate limits), so it goes through the same pause and requeue path
+THROTTLE_STATUSES = {403, 429, 503}
+
+# Per-host AIMD controller
+INITIAL_HOST_LIMIT = 2          # parallel requests to a new host, grows up to per_host
+MAX_HOST_DELAY = 10.0           # politeness gap never grows beyond this
+MAX_RETRY_AFTER = 300.0         # longer Retry-After values are capped
+MAX_REQUEUES = 8                # how many times one URL is requeued after throttling
+MAX_FORBIDDEN_REQUEUES = 2      # the same for 403 without Retry-After (often permanent)
+
+# Status codes that mean "this server does not do HEAD", retry as GET
+HEAD_NOT_SUPPORTED = {405, 501}
+
+
+def host_of(url):
+    """Return the lowercase host name of a URL (the key for per-host limits)."""
+    return (urllib.parse.urlsplit(url).hostname or '').lower()
+
+
+def retry_after_seconds(headers):
+    """Return the Retry-After header (seconds or HTTP date) in seconds, or None."""
+    value = (headers or {}).get('retry-after')
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(0.0, seconds), MAX_RETRY_AFTER)
+
+
+def is_throttled(result):
+    """True if the server asked us to slow down or refused without saying why (403, 429, 503)."""
+    return result['status'] in THROTTLE_STATUSES
+
+
+class _HostState:
+    """
+    Adaptive concurrency (AIMD) and politeness schedule for one host.
+
+    Healthy responses raise the number of parallel requests by about one per
+    round trip up to max_limit (ten times slower close to the limit where the
+    host throttled before) and let the gap between requests shrink back to
+    base_delay. A throttling response halves the limit, doubles the gap and
+    pauses the host for Retry-After seconds (or an exponential backoff).
+    """
+
+    def __init__(self, max_limit, delay):
+        self.max_limit = max_limit
+        self.limit = float(min(max_limit, INITIAL_HOST_LIMIT))
+        self.active = 0
+        self.condition = asyncio.Condition()
+        self.base_delay = delay
+        self.delay = delay
+        self.next_start = 0.0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.throttled_at = float('inf')
+        self.throttle_streak = 0
+        self.throttled = 0
+
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.active < int(self.limit))
+            self.active += 1
+
+    async def release(self):
+        async with self.condition:
+            self.active -= 1
+            # The limit may have grown, wake up everyone who can start now
+            self.condition.notify_all()
+
+    def on_response(self, result, started, method='GET'):
+        """Adapt the limit to a response of a request started at the monotonic time started."""
+        # A 403 to HEAD is retried as GET first, only the GET answer counts as throttling
+        if is_throttled(result) and not (method == 'HEAD' and result['status'] == 403):
+            self.throttled += 1
+            # Requests that were already running when the limit was cut belong to the
+            # same overload, they only extend the pause
+            if started >= self.last_decrease:
+                self.last_decrease = time.monotonic()
+                self.throttle_streak += 1
+                self.throttled_at = self.limit
+                self.limit = max(1.0, self.limit / 2)
+                self.delay = min(MAX_HOST_DELAY, max(self.delay * 2, self.base_delay, 0.05))
+            pause = retry_after_seconds(result['headers'])
+            if pause is None:
+                pause = min(MAX_RETRY_AFTER, random.uniform(0.5, 1.0) * 2 ** self.throttle_streak)
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+        elif result['error'] == 'Timeout':
+            # A timeout may mean an overloaded server, back off a little
+            if started >= self.last_decrease:
+                self.last_decrease = time.monotonic()
+                self.limit = max(1.0, self.limit * 0.75)
+        elif result['status'] is not None:
+            self.throttle_streak = 0
+            # Near the limit where the host throttled last time, probe ten times slower
+            step = 1 / self.limit if self.limit + 1 < self.throttled_at else 0.1 / self.limit
+            self.limit = min(float(self.max_limit), self.limit + step)
+            self.delay = max(self.base_delay, self.delay * 0.9)
+
+
+class LinkChecker:
+    """
+    Concurrent link checker with global and per-host limits.
+
+    Usage:
+        checker = LinkChecker(max_in_flight=16, per_host=4)
+        results = await checker.check_many(urls)          # {url: result}
+        result = await checker.fetch(url, method='GET', read_body=65536)
+        checker.close()   # also saves the status store
+    """
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT, per_host=DEFAULT_PER_HOST,
+                 timeout=DEFAULT_TIMEOUT, host_delay=DEFAULT_HOST_DELAY, retries=DEFAULT_RETRIES,
+                 host_limits=None, host_delays=None, store=None, client=None):
+        """
+        Args:
+            max_in_flight: Maximum number of requests running at once (all hosts)
+            per_host: Default maximum number of parallel requests to one host
+                (the adaptive limit of each host starts lower and grows up to it)
+            timeout: Timeout of a single request in seconds
+            host_delay: Default minimum gap in seconds between request starts on one host
+            retries: How many times a timeout, connection error or 5xx is retried
+                (throttled URLs are requeued up to MAX_REQUEUES times on top of that)
+            host_limits: Optional {host: cap} overrides of per_host
+            host_delays: Optional {host: seconds} overrides of host_delay
+            store: Optional LinkStatusStore with results of previous runs
+            client: HttpClient to use (by default a new one, closed by close())
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.per_host = max(1, per_host)
+        self.timeout = timeout
+        self.host_delay = host_delay
+        self.retries = max(0, retries)
+        self.host_limits = dict(host_limits or {})
+        self.host_delays = dict(host_delays or {})
+        self._global = asyncio.Semaphore(self.max_in_flight)
+        self._hosts = {}
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='link-check')
+        self.store = store
+        self._own_client = client is None
+        self.client = client or HttpClient(max_idle_per_host=max(self.per_host, *self.host_limits.values(), 1))
+        self.requests = 0
+        self.retried = 0
+        self.requeued = 0
+        self.cache_hits = 0
+        self.not_modified = 0
+
+    def _host(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(self.host_limits.get(host, self.per_host), self.host_delays.get(host, self.host_delay))
+            self._hosts[host] = state
+        return state
+
+    async def _wait_turn(self, state):
+        """Reserve the next start slot on a host and sleep until it comes (and the host is not paused)."""
+        while True:
+            now = time.monotonic()
+            start = max(now, state.next_start, state.paused_until)
+            state.next_start = start + state.delay
+            if start > now:
+                await asyncio.sleep(start - now)
+            # A throttling response may have paused the host meanwhile
+            if time.monotonic() >= state.paused_until:
+                return
+
+    async def _request_once(self, url, method, read_body, headers):
+        state = self._host(host_of(url))
+        await state.acquire()
+        try:
+            while True:
+                # Sleep through the politeness gap and any Retry-After pause before taking
+                # a global slot, so a paused host never holds slots that other hosts could use
+                await self._wait_turn(state)
+                async with self._global:
+                    if time.monotonic() < state.paused_until:
+                        # The host was paused while we waited for the slot, give the slot back
+                        continue
+                    started = time.monotonic()
+                    self.requests += 1
+                    loop = asyncio.get_running_loop()
+                    try:
+                        result = await asyncio.wait_for(
+                            loop.run_in_executor(self._executor, self.client.request, url, method, self.timeout, read_body, headers),
+                            timeout=self.timeout * 2,
+                        )
+                    except asyncio.TimeoutError:
+                        result = {'url': url, 'status': None, 'final_url': url, 'headers': {}, 'body': None, 'error': 'Timeout'}
+                break
+            state.on_response(result, started, method)
+            return result
+        finally:
+            await state.release()
+
+    async def fetch(self, url, method='HEAD', read_body=0, headers=None):
+        """
+        Request one URL under the global and per-host limits, with retries.
+
+        A HEAD request that the server rejects (405/501) or refuses (403) is repeated as GET.
+        A URL the host still throttles after MAX_REQUEUES comes back with
+        result['undecided'] set: it is neither valid nor broken.
+        With a status store, a fresh decisive stored result (2xx/3xx, 404/410) is returned
+        without any request and an expired one is revalidated with a conditional request;
+        transient failures are never reused. Requests that
+        need the page body or custom headers always go to the network.
+        """
+        use_store = self.store is not None and not read_body and not headers
+        if use_store:
+            cached = self.store.get_fresh(url)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+            headers = self.store.validators(url) or None
+
+        result = await self._fetch_with_retries(url, method, read_body, headers)
+
+        if use_store:
+            if result['status'] == 304 and headers:
+                self.not_modified += 1
+                result = self.store.revalidated(url)
+            else:
+                self.store.update(url, result)
+        return result
+
+    async def _fetch_with_retries(self, url, method, read_body, headers):
+        attempt = 0
+        requeues = 0
+        while True:
+            result = await self._request_once(url, method, read_body, headers)
+            if method == 'HEAD' and (result['status'] in HEAD_NOT_SUPPORTED or result['status'] == 403):
+                # Some servers refuse HEAD only; 403 gets a GET before it counts as throttling,
+                # and requeues of this URL go straight to GET
+                method = 'GET'
+                result = await self._request_once(url, method, read_body, headers)
+            if is_throttled(result):
+                limit = MAX_FORBIDDEN_REQUEUES if result['status'] == 403 and 'retry-after' not in result['headers'] \
+                    else MAX_REQUEUES
+                if requeues >= limit:
+                    # Still throttled: the result says nothing about the link itself
+                    result['undecided'] = True
+                    return result
+                # The host asked us to slow down and is paused now; the URL goes back
+                # to the queue of the host instead of being reported as broken
+                requeues += 1
+                self.requeued += 1
+                continue
+            transient = result['error'] in ('Timeout',) or (result['error'] or '').startswith('Connection Error') \
+                or result['status'] in RETRY_STATUSES
+            if not transient or attempt == self.retries:
+                return result
+            attempt += 1
+            self.retried += 1
+            # Exponential backoff with jitter; only this URL waits, the slots are free meanwhile
+            await asyncio.sleep(random.uniform(0.5, 1.0) * 2 ** (attempt - 1))
+
+    async def check_many(self, urls, method='HEAD', read_body=0):
+        """Check many URLs concurrently, each distinct URL once. Returns {url: result}."""
+        unique = list(dict.fromkeys(url for url in urls if url))
+        results = await asyncio.gather(*(self.fetch(url, method, read_body) for url in unique))
+        return dict(zip(unique, results))
+
+    def print_stats(self):
+        """Print how many requests were made and how many were saved by the status store."""
+        print(f"Requests made: {self.requests} ({self.retried} retried, {self.requeued} requeued after throttling)")
+        throttled = {host: state for host, state in self._hosts.items() if state.throttled}
+        if throttled:
+            print("Throttled hosts: " + ", ".join(
+                f"{host} ({state.throttled}x, now {int(state.limit)} parallel)" for host, state in sorted(throttled.items())
+            ))
+        self.client.print_stats()
+        if self.store is not None:
+            print(f"Link status store: {self.cache_hits} reused without request, "
+                  f"{self.not_modified} revalidated (304), {len(self.store)} URLs stored")
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._own_client:
+            self.client.close()
+        if self.store is not None:
+            self.store.save()
+
+
+def add_arguments(parser):
+    """Add the shared command line options of the link checker to an argparse parser."""
+    parser.add_argument('--max-in-flight', type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help=f'maximum requests in flight across all hosts (default {DEFAULT_MAX_IN_FLIGHT})')
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST,
+                        help=f'maximum parallel requests to one host, the adaptive limit grows up to it (default {DEFAULT_PER_HOST})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'timeout of one request in seconds (default {DEFAULT_TIMEOUT:g})')
+    parser.add_argument('--host-delay', type=float, default=DEFAULT_HOST_DELAY,
+                        help=f'minimum gap between requests to the same host in seconds (default {DEFAULT_HOST_DELAY:g})')
+    parser.add_argument('--status-store', type=Path, default=DEFAULT_STORE_PATH,
+                        help='file with link statuses from previous runs (default .cache/link_status.json)')
+    parser.add_argument('--no-store', action='store_true',
+                        help='do not read or write the link status store (check everything from scratch)')
+    parser.add_argument('--revalidate', action='store_true',
+                        help='revalidate all stored statuses now, even those that have not expired')
+
+
+def checker_from_args(args, **overrides):
+    """Create a LinkChecker from options added by add_arguments()."""
+    options = {
+        'max_in_flight': args.max_in_flight,
+        'per_host': args.per_host,
+        'timeout': args.timeout,
+        'host_delay': args.host_delay,
+    }
+    if not args.no_store:
+        options['store'] = LinkStatusStore(args.status_store, refresh=args.revalidate)
+    options.update(overrides)
+    return LinkChecker(**options)
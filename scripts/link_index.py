@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Corpus-wide index of links, so every distinct URL is checked only once.
+
+The term_links files hold thousands of term -> URL entries, but many terms
+in different topics point to the same page. The index maps each normalized
+URL to every place that uses it (file + term, or file + resource position).
+The link scripts check each indexed URL once and then fan the result back
+out to all of its locations.
+"""
+
+import asyncio
+import json
+from urllib.parse import quote, unquote, urlsplit, urlunsplit
+
+# Characters that stay unescaped in a normalized path / query
+_PATH_SAFE = "/:@!$&'()*+,;=-._~"
+_QUERY_SAFE = "=&:@!$'()*+,;/?-._~"
+
+
+def normalize_url(url):
+    """
+    Return the canonical form of a URL used as the index key.
+
+    - scheme and host are lowercased, default ports and the fragment are dropped
+    - percent-encoding is unified (encoded and raw UTF-8 forms give the same key)
+    - Wikipedia page titles use underscores instead of spaces
+    """
+    url = (url or '').strip()
+    parsed = urlsplit(url)
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    if parsed.port and not (scheme == 'http' and parsed.port == 80 or scheme == 'https' and parsed.port == 443):
+        host = f"{host}:{parsed.port}"
+    path = unquote(parsed.path) or '/'
+    if host.endswith('wikipedia.org') and path.startswith('/wiki/'):
+        path = path.replace(' ', '_')
+    path = quote(path, safe=_PATH_SAFE)
+    query = quote(unquote(parsed.query), safe=_QUERY_SAFE)
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class LinkIndex:
+    """Map of normalized URL -> all locations that use it."""
+
+    def __init__(self):
+        self._locations = {}
+        self._request_urls = {}
+        self.entries = 0
+
+    def add(self, url, location):
+        """Register one use of a URL (location is any tuple describing where it is)."""
+        if not url:
+            return
+        key = normalize_url(url)
+        if key not in self._locations:
+            self._locations[key] = []
+            # The URL as written in the data is what gets requested
+            self._request_urls[key] = url
+        self._locations[key].append(location)
+        self.entries += 1
+
+    def __len__(self):
+        return len(self._locations)
+
+    def keys(self):
+        return list(self._locations)
+
+    def request_url(self, key):
+        """URL to request for a normalized key (the first spelling seen in the data)."""
+        return self._request_urls[key]
+
+    def locations(self, key):
+        return self._locations.get(key, [])
+
+    def print_stats(self, label='links'):
+        saved = self.entries - len(self)
+        print(f"Indexed {self.entries} {label}, {len(self)} distinct URLs "
+              f"({saved} duplicate checks avoided)")
+
+
+def index_term_links(json_files):
+    """Index term_links files. Locations are (file_path, term)."""
+    index = LinkIndex()
+    for json_file in json_files:
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error reading {json_file}: {e}")
+            continue
+        for term, url in data.get('terms', {}).items():
+            index.add(url, (json_file, term))
+    return index
+
+
+def index_resources(json_files):
+    """Index resource files. Locations are (file_path, section_index, resource_index)."""
+    index = LinkIndex()
+    for json_file in json_files:
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error reading {json_file}: {e}")
+            continue
+        for section_index, section in enumerate(data.get('sections', [])):
+            for resource_index, resource in enumerate(section.get('resources', [])):
+                index.add(resource.get('url', ''), (json_file, section_index, resource_index))
+    return index
+
+
+async def check_index(index, check):
+    """
+    Check every distinct URL of the index exactly once.
+
+    Args:
+        index: LinkIndex to check
+        check: async function url -> result
+
+    Returns:
+        {normalized URL: result}; look results up with normalize_url(url)
+    """
+    keys = index.keys()
+    results = await asyncio.gather(*(check(index.request_url(key)) for key in keys))
+    return dict(zip(keys, results))
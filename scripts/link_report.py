@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming JSONL report of link checks with a checkpoint for --resume.
+
+Every decided URL is appended to the report as one JSON line the moment its
+check completes, so nothing is lost when a long run crashes or is stopped
+with Ctrl-C. A small checkpoint file next to the report says whether the run
+finished; with --resume an unfinished run continues and URLs already in the
+report are not checked again. URLs whose check was undecided (the host still
+throttled them) are recorded with "valid": null and checked again on resume,
+also after a finished run.
+The final summary is computed from the report (the last line of a URL wins).
+
+Report line:
+    {"key": normalized URL, "url": ..., "valid": true/false/null, "error": ...,
+     "locations": [[file, ...], ...], "checked_at": "2026-01-01T12:00:00"}
+"""
+
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+from link_index import normalize_url
+
+REPORTS_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'link_reports'
+CHECKPOINT_VERSION = 1
+
+
+class LinkReport:
+    """Append-only JSONL report of decided URLs, resumable after an interrupted run."""
+
+    def __init__(self, path, resume=False):
+        """
+        Args:
+            path: JSONL report file (the checkpoint is stored next to it)
+            resume: Continue an unfinished previous run instead of starting over
+        """
+        self.path = Path(path)
+        self.checkpoint_path = self.path.with_suffix('.checkpoint.json')
+        self.decided = {}
+        self.resumed = 0
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        if resume:
+            self._load_unfinished()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a' if self.decided else 'w', encoding='utf-8')
+        self._write_checkpoint(finished=False)
+
+    def _load_unfinished(self):
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            print(f"No interrupted run to resume ({self.checkpoint_path} not found), starting a new one")
+            return
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            print("The previous run used another report format, starting a new one")
+            return
+        undecided = set()
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # The last line of a crashed run may be cut off
+                        continue
+                    if record['valid'] is None:
+                        # Undecided (throttled) URLs are checked again
+                        self.decided.pop(record['key'], None)
+                        undecided.add(record['key'])
+                    else:
+                        self.decided[record['key']] = record
+                        undecided.discard(record['key'])
+        if checkpoint.get('finished') and not undecided:
+            self.decided = {}
+            print("The previous run finished, starting a new one")
+            return
+        if checkpoint.get('finished'):
+            print(f"The previous run finished with {len(undecided)} undecided URLs, checking them again")
+        self.resumed = len(self.decided)
+        if self.decided:
+            self.started_at = checkpoint.get('started_at', self.started_at)
+        print(f"Resuming the run from {self.started_at}: {self.resumed} URLs already decided")
+
+    def _write_checkpoint(self, finished):
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'report': self.path.name,
+            'started_at': self.started_at,
+            'finished': finished,
+        }
+        tmp_path = self.checkpoint_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def get(self, key):
+        """Return the record of an already decided URL, or None."""
+        return self.decided.get(key)
+
+    def add(self, key, url, valid, error, locations):
+        """Append one checked URL to the report (flushed immediately); valid None means undecided."""
+        record = {
+            'key': key,
+            'url': url,
+            'valid': valid,
+            'error': error,
+            'locations': [[str(part) for part in location] for location in locations],
+            'checked_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        if valid is not None:
+            self.decided[key] = record
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def wrap(self, index, check):
+        """
+        Wrap an async check (url -> (is_valid, error)) for check_index():
+        decided URLs are answered from the report, new results are appended to it.
+        """
+        async def reported_check(url):
+            key = normalize_url(url)
+            record = self.get(key)
+            if record is not None:
+                return record['valid'], record['error']
+            is_valid, error = await check(url)
+            self.add(key, url, is_valid, error, index.locations(key))
+            return is_valid, error
+        return reported_check
+
+    def finish(self):
+        """Mark the run as finished (a later --resume starts a new run)."""
+        self._file.close()
+        self._write_checkpoint(finished=True)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def summarize_report(path):
+    """Compute a summary of a JSONL report (a URL checked again after resume counts once)."""
+    summary = {'urls': 0, 'valid': 0, 'invalid': 0, 'undecided': 0, 'uses': 0, 'invalid_uses': 0,
+               'errors': Counter()}
+    records = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            records[record['key']] = record
+    for record in records.values():
+        uses = len(record.get('locations', []))
+        summary['urls'] += 1
+        summary['uses'] += uses
+        if record['valid']:
+            summary['valid'] += 1
+        elif record['valid'] is None:
+            summary['undecided'] += 1
+        else:
+            summary['invalid'] += 1
+            summary['invalid_uses'] += uses
+            summary['errors'][record['error'] or 'unknown'] += 1
+    return summary
+
+
+def print_report_summary(path):
+    """Print the summary of a JSONL report."""
+    summary = summarize_report(path)
+    print(f"Report: {path}")
+    print(f"  {summary['urls']} distinct URLs used {summary['uses']} times: "
+          f"{summary['valid']} valid, {summary['invalid']} invalid ({summary['invalid_uses']} uses), "
+          f"{summary['undecided']} undecided (checked again with --resume or the next run)")
+    for error, count in summary['errors'].most_common(10):
+        print(f"  {count:5d}x {error}")
+
+
+def add_arguments(parser, name):
+    """Add the report and resume options to an argparse parser (name = report file name)."""
+    parser.add_argument('--report', type=Path, default=REPORTS_DIR / f'{name}.jsonl',
+                        help=f'JSONL report with one line per checked URL (default .cache/link_reports/{name}.jsonl)')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue an interrupted run, URLs already decided in the report are not checked again')
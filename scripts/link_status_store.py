@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent on-disk store of link check results.
+
+For every URL it remembers the status, final URL, ETag, Last-Modified and
+when it was checked. A result is reused without any request while it is
+fresh; how long it stays fresh depends on the outcome class (a working
+page is trusted for a month, a missing one for a week). Only decisive
+outcomes are kept: a timeout, connection error, 403, 429 or 5xx says
+nothing lasting about the link, so such URLs are always requested again.
+Expired entries are revalidated with If-None-Match / If-Modified-Since, so
+an unchanged page costs a cheap 304 instead of a full check.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from link_index import normalize_url
+
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'link_status.json'
+STORE_VERSION = 1
+
+DAY = 24 * 60 * 60
+
+# Outcome classes that decide the link; the others (client_error, rate_limited,
+# server_error, timeout, error) are transient or ambiguous and never reused
+DECISIVE_OUTCOMES = {'ok', 'not_found'}
+
+# How long (seconds) a result of each decisive outcome class is reused without a request
+DEFAULT_TTLS = {
+    'ok': 30 * DAY,            # 2xx / 3xx
+    'not_found': 7 * DAY,      # 404 / 410
+}
+
+
+def outcome_class(result):
+    """Classify a check result for choosing its TTL."""
+    status = result.get('status')
+    error = result.get('error')
+    if status is None:
+        return 'timeout' if error == 'Timeout' else 'error'
+    if status < 400:
+        return 'ok'
+    if status in (404, 410):
+        return 'not_found'
+    if status == 429:
+        return 'rate_limited'
+    if status >= 500:
+        return 'server_error'
+    return 'client_error'
+
+
+class LinkStatusStore:
+    """URL -> last known check result, with per-outcome TTLs and HTTP validators."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH, ttls=None, refresh=False):
+        """
+        Args:
+            path: JSON file with the stored results
+            ttls: Optional overrides of DEFAULT_TTLS ({outcome class: seconds});
+                  only the classes in DECISIVE_OUTCOMES are ever reused
+            refresh: Treat every entry as expired (revalidate everything)
+        """
+        self.path = Path(path)
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.refresh = refresh
+        self._entries = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[WARNING] Could not read link status store {self.path}, starting empty: {e}")
+            return
+        if data.get('version') == STORE_VERSION:
+            self._entries = data.get('links', {})
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_fresh(self, url):
+        """Return the stored result if it is still fresh, otherwise None."""
+        if self.refresh:
+            return None
+        entry = self._entries.get(normalize_url(url))
+        if not entry or entry.get('outcome') not in DECISIVE_OUTCOMES:
+            return None
+        ttl = self.ttls.get(entry['outcome'], 0)
+        if time.time() - entry.get('checked_at', 0) >= ttl:
+            return None
+        return self._as_result(url, entry)
+
+    def validators(self, url):
+        """Conditional request headers for revalidating a stored result."""
+        entry = self._entries.get(normalize_url(url))
+        headers = {}
+        # Only a working page can be confirmed by 304 Not Modified
+        if entry and entry.get('outcome') == 'ok':
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, url):
+        """Mark a stored result as confirmed by 304 Not Modified and return it."""
+        entry = self._entries[normalize_url(url)]
+        entry['checked_at'] = time.time()
+        self._dirty = True
+        return self._as_result(url, entry)
+
+    def update(self, url, result):
+        """
+        Store a new check result.
+
+        Non-decisive results (and undecided ones) are not stored, so the last
+        decisive result and its validators are kept for the next revalidation.
+        """
+        outcome = outcome_class(result)
+        if outcome not in DECISIVE_OUTCOMES or result.get('undecided'):
+            return
+        headers = result.get('headers') or {}
+        self._entries[normalize_url(url)] = {
+            'status': result.get('status'),
+            'final_url': result.get('final_url') or url,
+            'error': result.get('error'),
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified'),
+            'outcome': outcome,
+            'checked_at': time.time(),
+        }
+        self._dirty = True
+
+    @staticmethod
+    def _as_result(url, entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['etag'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['last-modified'] = entry['last_modified']
+        return {
+            'url': url,
+            'status': entry.get('status'),
+            'final_url': entry.get('final_url') or url,
+            'headers': headers,
+            'body': None,
+            'error': entry.get('error'),
+        }
+
+    def save(self):
+        """Write the store to disk (atomically), if anything changed."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'links': self._entries}, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
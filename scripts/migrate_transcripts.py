@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Přesune přepisy audia z topic JSON do samostatných souborů
+
+Přepisy vložené přímo v data/topics/TXX.json (audio.files[].transcript,
+u témat s jedním audiem audio.transcript) se zapíšou do data/transcripts/
+pod stejným klíčem, jaký používá generate_audio.py (TXX_partN nebo TXX),
+a v topic JSON se nahradí odkazem transcriptSource. Stránka tématu pak
+přepis stahuje až po jeho rozbalení.
+
+Použití:
+    python scripts/migrate_transcripts.py           # všechna témata
+    python scripts/migrate_transcripts.py T01 T02   # vybraná témata
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Fix Windows console encoding for Czech characters
+if sys.platform == "win32":
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+from generate_audio import PROJECT_ROOT, TRANSCRIPTS_DIR, normalize_topic_id
+
+TOPICS_DIR = PROJECT_ROOT / "data" / "topics"
+
+
+def write_sidecar(key: str, transcript: str) -> str:
+    """Zapíše přepis do data/transcripts/<key>.txt a vrátí relativní cestu"""
+    TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = TRANSCRIPTS_DIR / f"{key}.txt"
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(transcript.strip() + "\n")
+    return path.relative_to(PROJECT_ROOT).as_posix()
+
+
+def migrate_topic(topic_path: Path) -> int:
+    """
+    Přesune vložené přepisy jednoho tématu do samostatných souborů.
+
+    Returns:
+        Počet přesunutých přepisů
+    """
+    with open(topic_path, "r", encoding="utf-8") as f:
+        topic = json.load(f)
+
+    topic_id = topic.get("id", topic_path.stem)
+    audio = topic.get("audio")
+    if not audio:
+        return 0
+
+    moved = 0
+    files = audio.get("files") or []
+    if len(files) > 1:
+        for index, audio_file in enumerate(files, 1):
+            transcript = audio_file.pop("transcript", None)
+            if transcript and transcript.strip():
+                audio_file["transcriptSource"] = write_sidecar(f"{topic_id}_part{audio_file.get('part', index)}", transcript)
+                moved += 1
+    else:
+        # Téma s jedním audiem - stránka zobrazuje audio.transcript
+        transcript = audio.pop("transcript", None)
+        if transcript and transcript.strip():
+            audio["transcriptSource"] = write_sidecar(topic_id, transcript)
+            moved += 1
+
+    if moved:
+        with open(topic_path, "w", encoding="utf-8") as f:
+            json.dump(topic, f, ensure_ascii=False, indent=2)
+    return moved
+
+
+def main():
+    if len(sys.argv) > 1:
+        topic_paths = [TOPICS_DIR / f"{normalize_topic_id(arg)}.json" for arg in sys.argv[1:]]
+    else:
+        topic_paths = sorted(TOPICS_DIR.glob("T*.json"))
+
+    total = 0
+    for topic_path in topic_paths:
+        if not topic_path.exists():
+            print(f"[ERROR] Topic JSON neexistuje: {topic_path}")
+            continue
+        size_before = topic_path.stat().st_size
+        moved = migrate_topic(topic_path)
+        if moved:
+            print(f"[OK] {topic_path.name}: presunuto {moved} prepis(u), "
+                  f"{size_before / 1024:.1f} KB -> {topic_path.stat().st_size / 1024:.1f} KB")
+        total += moved
+
+    print(f"\nCelkem presunuto prepisu: {total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local mock web for testing and benchmarking the link checkers offline.
+
+One HTTP server on 127.0.0.1 simulates Wikipedia and any number of
+third-party hosts. The link tools reach it as an HTTP proxy, so synthetic
+URLs keep their real-looking host names (http://cs.wikipedia.org/...,
+http://site7.example/...) and per-host limits behave as on the internet:
+
+    http_proxy=http://127.0.0.1:8765 python scripts/validate_resource_links.py
+
+Every URL behaves the same on every request; whether it is missing,
+redirects or is a disambiguation page is derived from a hash of its path:
+- /wiki/<title>                         article (HEAD/GET), 404, 301 or disambiguation
+- /w/api.php?action=query               batched titles with redirects, pageprops, langlinks
+- /api/rest_v1/page/summary/<title>     page summary JSON
+- any other path                        third-party page (200, 404 or 301)
+
+Latency, error rates, 429 responses (with Retry-After) and slowly streamed
+bodies are configurable.
+
+Usage:
+    python scripts/mock_web.py --port 8765 --latency 0.05 --rate-429 0.01
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+DEFAULT_PORT = 8765
+
+
+def _bucket(text, salt):
+    """Stable pseudo-random number in [0, 1) for a text."""
+    digest = hashlib.blake2b(f"{salt}:{text}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') / 2 ** 64
+
+
+class MockWebConfig:
+    """Behaviour of the mock web (rates are fractions of URLs, times in seconds)."""
+
+    def __init__(self, latency=0.02, jitter=0.01, rate_404=0.05, rate_redirect=0.05,
+                 rate_disambiguation=0.03, rate_langlink=0.5, rate_429=0.0, retry_after=1,
+                 body_kb=64, slow_body=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_404 = rate_404
+        self.rate_redirect = rate_redirect
+        self.rate_disambiguation = rate_disambiguation
+        self.rate_langlink = rate_langlink
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.body_kb = body_kb
+        self.slow_body = slow_body
+
+    def is_missing(self, key):
+        return _bucket(key, 'missing') < self.rate_404
+
+    def is_redirect(self, key):
+        return not self.is_missing(key) and _bucket(key, 'redirect') < self.rate_redirect
+
+    def is_disambiguation(self, key):
+        return _bucket(key, 'disambiguation') < self.rate_disambiguation
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MockWeb/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def config(self):
+        return self.server.config
+
+    def _target(self):
+        """(host, path, query) of the request; proxy requests carry the full URL."""
+        parsed = urlsplit(self.path)
+        host = (parsed.hostname if parsed.scheme else (self.headers.get('Host') or '').split(':')[0]) or 'localhost'
+        return host.lower(), unquote(parsed.path) or '/', parsed.query
+
+    def _send(self, status, body=b'', content_type='text/html; charset=utf-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command == 'GET' and body:
+            if self.config.slow_body and len(body) > 4096:
+                # Stream the body in pieces so readers that stop early save real time
+                pieces = 16
+                size = -(-len(body) // pieces)
+                for start in range(0, len(body), size):
+                    self.wfile.write(body[start:start + size])
+                    self.wfile.flush()
+                    time.sleep(self.config.slow_body / pieces)
+            else:
+                self.wfile.write(body)
+        self.server.stats.record(status, len(body) if self.command == 'GET' else 0)
+
+    def _page_body(self, title, disambiguation=False):
+        note = 'rozcestník' if disambiguation else 'článek'
+        filler = ('<p>' + 'Lorem ipsum dolor sit amet. ' * 36 + '</p>\n') * (self.config.body_kb)
+        return f"<html><head><title>{title}</title></head><body><h1>{title}</h1>{filler}<p>{note}</p></body></html>".encode('utf-8')
+
+    def _handle(self):
+        host, path, query = self._target()
+        stats = self.server.stats
+        stats.enter(host)
+        try:
+            config = self.config
+            delay = config.latency + random.uniform(-config.jitter, config.jitter)
+            if delay > 0:
+                time.sleep(delay)
+            if config.rate_429 and random.random() < config.rate_429:
+                self._send(429, b'slow down', headers={'Retry-After': str(config.retry_after)})
+                return
+            if path == '/w/api.php':
+                self._api(host, parse_qs(query))
+            elif path.startswith('/api/rest_v1/page/summary/'):
+                self._summary(path[len('/api/rest_v1/page/summary/'):])
+            elif path.startswith('/wiki/'):
+                self._article(host, path[len('/wiki/'):])
+            else:
+                self._page(host, path)
+        finally:
+            stats.leave(host)
+
+    def _article(self, host, title):
+        key = title.replace(' ', '_')
+        if self.config.is_missing(key):
+            self._send(404, b'<html><body>Tento clanek neexistuje</body></html>')
+        elif self.config.is_redirect(key) and not key.endswith('_(cil)'):
+            self._send(301, headers={'Location': f"http://{host}/wiki/{quote(key + '_(cil)')}"})
+        else:
+            self._send(200, self._page_body(title, self.config.is_disambiguation(key)))
+
+    def _page(self, host, path):
+        key = f"{host}{path}"
+        if self.config.is_missing(key):
+            self._send(404, b'<html><body>Not found</body></html>')
+        elif self.config.is_redirect(key) and not path.endswith('/final'):
+            self._send(301, headers={'Location': f"http://{host}{path.rstrip('/')}/final"})
+        else:
+            self._send(200, self._page_body(path))
+
+    def _summary(self, title):
+        key = unquote(title).replace(' ', '_')
+        if self.config.is_missing(key):
+            self._send(404, b'{"type":"not_found"}', 'application/json')
+            return
+        body = json.dumps({
+            'type': 'disambiguation' if self.config.is_disambiguation(key) else 'standard',
+            'title': key.replace('_', ' '),
+            'extract': 'Lorem ipsum dolor sit amet.',
+        }).encode('utf-8')
+        self._send(200, body, 'application/json')
+
+    def _api(self, host, params):
+        titles = params.get('titles', [''])[0].split('|')
+        lllang = params.get('lllang', [None])[0]
+        normalized, redirects, pages = [], [], []
+        for title in titles:
+            norm = title.replace('_', ' ').strip()
+            norm = norm[:1].upper() + norm[1:]
+            if norm != title:
+                normalized.append({'from': title, 'to': norm})
+            key = norm.replace(' ', '_')
+            if self.config.is_missing(key):
+                pages.append({'ns': 0, 'title': norm, 'missing': True})
+                continue
+            if self.config.is_redirect(key):
+                target = norm + ' (cil)'
+                redirects.append({'from': norm, 'to': target})
+                norm = target
+            page = {'pageid': int(_bucket(norm, 'id') * 10 ** 7), 'ns': 0, 'title': norm}
+            if self.config.is_disambiguation(key):
+                page['pageprops'] = {'disambiguation': ''}
+            if lllang and _bucket(key, 'langlink') < self.config.rate_langlink:
+                page['langlinks'] = [{'lang': lllang, 'title': norm + f' ({lllang})'}]
+            pages.append(page)
+        body = json.dumps({
+            'batchcomplete': True,
+            'query': {'normalized': normalized, 'redirects': redirects, 'pages': pages},
+        }).encode('utf-8')
+        self._send(200, body, 'application/json; charset=utf-8')
+
+    def do_HEAD(self):
+        self._handle()
+
+    def do_GET(self):
+        self._handle()
+
+
+class MockWebStats:
+    """Request counters of the mock web (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.bytes_sent = 0
+            self.statuses = {}
+            self.active = {}
+            self.peak = {}
+
+    def enter(self, host):
+        with self._lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+
+    def leave(self, host):
+        with self._lock:
+            self.active[host] -= 1
+
+    def record(self, status, body_bytes):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += body_bytes
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'bytes_sent': self.bytes_sent,
+                'statuses': dict(self.statuses),
+                'peak_per_host': max(self.peak.values(), default=0),
+            }
+
+
+class MockWeb:
+    """
+    The mock web server running in a background thread.
+
+    Usage:
+        with MockWeb(MockWebConfig(latency=0.01)) as web:
+            os.environ['http_proxy'] = web.proxy_url
+            ...
+            print(web.stats.snapshot())
+    """
+
+    def __init__(self, config=None, port=0):
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), _Handler)
+        self.server.daemon_threads = True
+        self.server.config = config or MockWebConfig()
+        self.server.stats = MockWebStats()
+        self.stats = self.server.stats
+        self._thread = None
+
+    @property
+    def proxy_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='mock-web', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def add_arguments(parser):
+    """Add the mock web behaviour options to an argparse parser."""
+    parser.add_argument('--latency', type=float, default=0.02, help='mean response latency in seconds (default 0.02)')
+    parser.add_argument('--jitter', type=float, default=0.01, help='random latency spread in seconds (default 0.01)')
+    parser.add_argument('--rate-404', type=float, default=0.05, help='share of missing pages (default 0.05)')
+    parser.add_argument('--rate-redirect', type=float, default=0.05, help='share of redirecting pages (default 0.05)')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='share of responses that are 429 (default 0)')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After of 429 responses in seconds (default 1)')
+    parser.add_argument('--body-kb', type=int, default=64, help='approximate size of page bodies in kB (default 64)')
+    parser.add_argument('--slow-body', type=float, default=0.0,
+                        help='seconds it takes to stream a page body (default 0, all at once)')
+
+
+def config_from_args(args):
+    """Create a MockWebConfig from options added by add_arguments()."""
+    return MockWebConfig(
+        latency=args.latency, jitter=args.jitter, rate_404=args.rate_404, rate_redirect=args.rate_redirect,
+        rate_429=args.rate_429, retry_after=args.retry_after, body_kb=args.body_kb, slow_body=args.slow_body,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the local mock web for the link checkers.')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'port to listen on (default {DEFAULT_PORT})')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    web = MockWeb(config_from_args(args), port=args.port)
+    print(f"Mock web listening on {web.proxy_url}")
+    print(f"Use it as a proxy, e.g.: http_proxy={web.proxy_url} python scripts/check_wiki_links.py "
+          f"--no-store --wiki-api 'http://{{host}}/w/api.php' --wiki-rest 'http://{{host}}/api/rest_v1'")
+    try:
+        web.server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStopped. {web.stats.snapshot()}")
+
+
+if __name__ == '__main__':
+    main()
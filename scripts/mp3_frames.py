@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Práce s MP3 soubory na úrovni rámců (frames)
+
+Umožňuje spojit více MP3 streamů do jednoho souboru přesně na hranicích rámců -
+bez ID3 tagů a hlavičkových rámců Xing/Info uprostřed výsledného souboru,
+takže přehrávač nenarazí na "díru" ani poškozená data na místě spoje.
+"""
+
+from typing import Iterator, Optional
+
+# Bitrate v kbps podle (verze MPEG, vrstva) a indexu v hlavičce
+_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+# Vzorkovací frekvence podle verze MPEG (1, 2, 2.5)
+_SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    2.5: [11025, 12000, 8000],
+}
+
+# Značky hlavičkových rámců s informacemi o VBR (neobsahují zvuk)
+_INFO_FRAME_TAGS = (b"Xing", b"Info", b"VBRI")
+
+
+def parse_frame_header(data: bytes, offset: int = 0) -> Optional[dict]:
+    """
+    Rozparsuje 4bajtovou hlavičku MP3 rámce na dané pozici.
+
+    Returns:
+        Slovník s klíči "length" (bajty), "samples", "sample_rate", "bitrate" (kbps),
+        nebo None pokud na pozici není platná hlavička
+    """
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2 = data[offset], data[offset + 1], data[offset + 2]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    padding = (b2 >> 1) & 0x01
+
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    version = {0: 2.5, 2: 2, 3: 1}[version_bits]
+    layer = 4 - layer_bits
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    elif layer == 2:
+        samples = 1152
+        length = 144 * bitrate * 1000 // sample_rate + padding
+    else:
+        samples = 1152 if version == 1 else 576
+        length = (samples // 8) * bitrate * 1000 // sample_rate + padding
+
+    return {
+        "length": length,
+        "samples": samples,
+        "sample_rate": sample_rate,
+        "bitrate": bitrate,
+    }
+
+
+def _skip_id3v2(data: bytes) -> int:
+    """Vrátí pozici za ID3v2 tagem na začátku dat (nebo 0, pokud tag chybí)"""
+    if len(data) >= 10 and data[:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def iter_frames(data: bytes) -> Iterator[tuple[int, dict]]:
+    """
+    Projde MP3 data a vrací (pozice, hlavička) pro každý zvukový rámec.
+
+    ID3v2/ID3v1 tagy a bajty mimo rámce jsou přeskočeny. Rámec je uznán jen tehdy,
+    když za ním následuje další platná hlavička nebo konec dat - tím se vyloučí
+    falešné synchronizační značky uvnitř zvukových dat.
+    """
+    end = len(data)
+    if end >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+
+    offset = _skip_id3v2(data)
+    while offset + 4 <= end:
+        header = parse_frame_header(data, offset)
+        if header and offset + header["length"] <= end:
+            next_offset = offset + header["length"]
+            if next_offset + 4 > end or parse_frame_header(data, next_offset):
+                yield offset, header
+                offset = next_offset
+                continue
+        offset += 1
+
+
+def is_info_frame(frame: bytes) -> bool:
+    """Zjistí, zda je rámec hlavičkový Xing/Info/VBRI rámec bez zvuku"""
+    head = frame[:64]
+    return any(tag in head for tag in _INFO_FRAME_TAGS)
+
+
+def extract_audio_frames(data: bytes) -> bytes:
+    """Vrátí pouze zvukové rámce z MP3 dat (bez tagů a hlavičkových rámců)"""
+    frames = []
+    for index, (offset, header) in enumerate(iter_frames(data)):
+        frame = data[offset:offset + header["length"]]
+        if index == 0 and is_info_frame(frame):
+            continue
+        frames.append(frame)
+    return b"".join(frames)
+
+
+def concat_mp3(chunks: list[bytes]) -> bytes:
+    """Spojí více MP3 streamů do jednoho přesně na hranicích rámců"""
+    return b"".join(extract_audio_frames(chunk) for chunk in chunks)
+
+
+def mp3_duration(data: bytes) -> float:
+    """Spočítá délku MP3 dat v sekundách ze součtu délek rámců"""
+    return sum(header["samples"] / header["sample_rate"] for _, header in iter_frames(data))
+
+
+def make_silent_frame(bitrate: int = 48, sample_rate: int = 24000) -> bytes:
+    """
+    Vytvoří platný tichý MP3 rámec (Layer III, mono) s danou bitrate a frekvencí.
+
+    Vedlejší informace rámce jsou nulové, dekodér tedy rámec přehraje jako ticho.
+    """
+    for version, rates in _SAMPLE_RATES.items():
+        if sample_rate in rates:
+            break
+    else:
+        raise ValueError(f"Nepodporovana vzorkovaci frekvence: {sample_rate}")
+    bitrates = _BITRATES[(1 if version == 1 else 2, 3)]
+    if bitrate not in bitrates[1:]:
+        raise ValueError(f"Nepodporovana bitrate pro MPEG {version} Layer III: {bitrate}")
+
+    version_bits = {1: 3, 2: 2, 2.5: 0}[version]
+    header = bytes([
+        0xFF,
+        0xE0 | (version_bits << 3) | (0b01 << 1) | 0x01,  # Layer III, bez CRC
+        (bitrates.index(bitrate) << 4) | (rates.index(sample_rate) << 2),
+        0xC4,  # mono, originál
+    ])
+    length = parse_frame_header(header)["length"]
+    return header + bytes(length - 4)
+
+
+def estimate_duration(data: bytes) -> float:
+    """
+    Rychlý odhad délky MP3 dat v sekundách z bitrate prvního rámce.
+
+    Pro CBR stream (výstup Edge TTS) je výsledek přesný; na rozdíl od mp3_duration
+    neprochází všechny rámce, proto se hodí pro průběžné hlášení postupu.
+    """
+    for _, header in iter_frames(data):
+        return len(data) * 8 / (header["bitrate"] * 1000)
+    return 0.0
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Předem propojí termíny v materiálech, osnovách a přepisech (build krok webu)
+
+Pro každé téma zkompiluje common_terms.json a TXX_terms.json do jednoho
+automatu (term_matcher.TermMatcher) a jedním průchodem propojí termíny
+v materiálech, osnově i přepisech audia. Výsledek se zapíše do
+data/prelinked/ se stejnou strukturou jako data/ (odkazy ve tvaru
+[termín](url), které vykresluje markdownToHtml) a do manifestu
+data/prelinked/manifest.json. Stránka tématu pak termíny v prohlížeči
+nehledá vůbec; témata bez záznamu v manifestu se propojují postaru.
+
+Pro každé téma se zapíše i sloučená tabulka termínů
+data/prelinked/terms/TXX_terms.json (společné + termíny tématu, seřazené
+od nejdelšího, URL jako indexy do tabulky urls). Témata propojovaná
+v prohlížeči tak stáhnou jeden soubor a nic neslučují ani neřadí. Tabulka
+obsahuje jen termíny, které se v obsahu tématu opravdu vyskytují (přehled
+nepoužitých termínů vypíše scripts/term_usage.py).
+
+Propojují se i skloňované tvary termínů z indexu data/inflection/variants.json
+(scripts/czech_inflection.py); do tabulky pro web se dostanou jen tvary,
+které se v obsahu tématu opravdu vyskytly.
+
+Po změně materiálů, osnovy, přepisů, term_links nebo indexu tvarů skript spusť znovu.
+Zapisují se jen soubory, které se změnily.
+
+Použití:
+    python scripts/prerender_term_links.py           # všechna témata
+    python scripts/prerender_term_links.py T01 T02   # vybraná témata
+    python scripts/prerender_term_links.py --check   # jen ověří, že je výstup aktuální
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Optional
+
+# Fix Windows console encoding for Czech characters
+if sys.platform == "win32":
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+from term_matcher import PROJECT_ROOT, TermMatcher, load_topic_terms, load_variants, term_table, with_variants
+
+TOPICS_DIR = PROJECT_ROOT / "data" / "topics"
+PRELINKED_DIR = PROJECT_ROOT / "data" / "prelinked"
+MANIFEST_PATH = PRELINKED_DIR / "manifest.json"
+TERM_TABLES_DIR = PRELINKED_DIR / "terms"
+MANIFEST_VERSION = 1
+TERM_TABLE_VERSION = 1
+
+
+def prelinked_path(source: str) -> str:
+    """data/materials/T01_materials.json -> data/prelinked/materials/T01_materials.json"""
+    relative = Path(source).relative_to("data")
+    return (PRELINKED_DIR / relative).relative_to(PROJECT_ROOT).as_posix()
+
+
+def topic_sources(topic: dict) -> list[tuple[str, str]]:
+    """Vrátí (druh, cesta) všech textových zdrojů tématu, které se propojují"""
+    sources = []
+    if topic.get("materialsSource"):
+        sources.append(("materials", topic["materialsSource"]))
+    if topic.get("summarySource"):
+        sources.append(("text", topic["summarySource"]))
+    audio = topic.get("audio") or {}
+    for entry in [audio] + list(audio.get("files") or []):
+        source = entry.get("transcriptSource")
+        if source and ("text", source) not in sources:
+            sources.append(("text", source))
+    return sources
+
+
+def render_source(kind: str, source: str, matcher: TermMatcher) -> tuple[str, int]:
+    """Propojí jeden zdroj a vrátí (obsah výstupního souboru, počet odkazů)"""
+    with open(PROJECT_ROOT / source, "r", encoding="utf-8") as f:
+        content = f.read()
+    linked = matcher.linked
+    if kind == "text":
+        return matcher.link(content), matcher.linked - linked
+
+    data = json.loads(content)
+    for section in data.get("sections", []):
+        if section.get("content"):
+            section["content"] = matcher.link(section["content"])
+    return json.dumps(data, ensure_ascii=False, indent=2) + "\n", matcher.linked - linked
+
+
+def write_if_changed(path: Path, content: str, check: bool) -> bool:
+    """Zapíše soubor, jen pokud se obsah liší. Vrátí True, pokud se lišil."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    if not check:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+    return True
+
+
+def write_term_table(topic_id: str, terms: dict, check: bool, used=None) -> bool:
+    """
+    Zapíše sloučenou a seřazenou tabulku termínů tématu. Vrátí True, pokud se změnila.
+
+    used omezí tabulku na termíny, které se v obsahu tématu opravdu vyskytují.
+    """
+    table = dict({"version": TERM_TABLE_VERSION}, **term_table(terms, used))
+    path = TERM_TABLES_DIR / f"{topic_id}_terms.json"
+    content = json.dumps(table, ensure_ascii=False, separators=(",", ":")) + "\n"
+    changed = write_if_changed(path, content, check)
+    if changed:
+        print(f"  {'Zastaraly' if check else 'Zapsano'}: {path.relative_to(PROJECT_ROOT).as_posix()}")
+    return changed
+
+
+def prerender_topic(topic_path: Path, check: bool, variants: dict) -> tuple[Optional[dict], int]:
+    """
+    Propojí termíny ve všech zdrojích jednoho tématu.
+
+    Returns:
+        (záznam manifestu nebo None, počet změněných výstupních souborů)
+    """
+    with open(topic_path, "r", encoding="utf-8") as f:
+        topic = json.load(f)
+    topic_id = topic.get("id") or topic_path.stem
+    terms = load_topic_terms(topic_id)
+    matcher = TermMatcher(terms, variants)
+
+    entry = {"terms": len(matcher), "links": 0, "sources": {}}
+    changed = 0
+    for kind, source in topic_sources(topic):
+        if not (PROJECT_ROOT / source).exists():
+            print(f"[WARNING] {topic_id}: zdroj {source} neexistuje, preskakuji")
+            continue
+        try:
+            content, links = render_source(kind, source, matcher)
+        except ValueError as e:
+            # Téma bez záznamu v manifestu se propojí v prohlížeči jako dřív, s úplnou tabulkou termínů
+            print(f"[ERROR] {topic_id}: {source} nelze nacist ({e}), tema se predem nepropoji")
+            return None, changed + int(write_term_table(topic_id, terms, check))
+        target = prelinked_path(source)
+        if write_if_changed(PROJECT_ROOT / target, content, check):
+            changed += 1
+            print(f"  {'Zastaraly' if check else 'Zapsano'}: {target}")
+        entry["sources"][source] = target
+        entry["links"] += links
+
+    # Do tabulky pro web patří jen termíny a tvary, které se v obsahu tématu vyskytují
+    entry["usedTerms"] = len(matcher.counts)
+    entry["usedVariants"] = len(matcher.matched - set(matcher.counts))
+    changed += int(write_term_table(topic_id, with_variants(terms, variants), check, used=matcher.matched))
+
+    # Vložené přepisy zobrazuje stránka u jednoho audia z audio, u více částí z audio.files
+    audio = topic.get("audio") or {}
+    files = list(audio.get("files") or [])
+    shown = files if len(files) > 1 else [audio]
+    if any(item.get("transcript") and not item.get("transcriptSource") for item in shown):
+        print(f"[WARNING] {topic_id}: vlozene prepisy se predem nepropojuji, "
+              f"presun je do souboru (scripts/migrate_transcripts.py)")
+    return entry, changed
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "topics": {}}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Předem propojí termíny v obsahu témat (build krok webu)")
+    parser.add_argument("topics", nargs="*", help="ID témat (výchozí všechna), např. T01 T02")
+    parser.add_argument("--check", action="store_true",
+                        help="nic nezapisovat, jen ověřit aktuálnost výstupu (návratový kód 1 = zastaralý)")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    if args.topics:
+        topic_paths = [TOPICS_DIR / f"{topic_id.upper()}.json" for topic_id in args.topics]
+    else:
+        topic_paths = sorted(TOPICS_DIR.glob("T[0-9][0-9].json"))
+
+    manifest = load_manifest()
+    variants = load_variants()
+    total_changed = 0
+    total_links = 0
+    for topic_path in topic_paths:
+        if not topic_path.exists():
+            print(f"[ERROR] Topic JSON neexistuje: {topic_path}")
+            continue
+        entry, changed = prerender_topic(topic_path, args.check, variants)
+        total_changed += changed
+        if entry is None:
+            manifest["topics"].pop(topic_path.stem, None)
+            continue
+        manifest["topics"][topic_path.stem] = entry
+        total_links += entry["links"]
+        print(f"[OK] {topic_path.stem}: {entry['terms']} terminu ({entry['usedTerms']} pouzitych, "
+              f"{entry['usedVariants']} tvaru), "
+              f"{entry['links']} odkazu v {len(entry['sources'])} souborech")
+
+    manifest["topics"] = dict(sorted(manifest["topics"].items()))
+    manifest_changed = write_if_changed(
+        MANIFEST_PATH, json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", args.check
+    )
+
+    print(f"\nCelkem odkazu: {total_links}, zmenenych souboru: {total_changed + int(manifest_changed)}")
+    if args.check and (total_changed or manifest_changed):
+        print("[ERROR] Predem propojeny obsah je zastaraly, spust scripts/prerender_term_links.py")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Vyhledávání termínů z data/term_links v textu jedním průchodem (Aho–Corasick)
+
+Všechny termíny tématu (common_terms.json + TXX_terms.json) se zkompilují
+do jednoho automatu. Text se pak projde jednou bez ohledu na počet termínů,
+místo aby se pro každý termín stavěl vlastní regulární výraz.
+
+Pravidla odpovídají dosavadnímu propojování v prohlížeči (addTermLinksToHtml):
+- velikost písmen se nerozlišuje,
+- termíny tématu přebíjí společné termíny se stejným klíčem,
+- překrývající se shody vyhrává ta, která začíná dřív, a z nich nejdelší,
+- termín musí stát na hranici slova (u písmen s diakritikou také,
+  takže "balet" se nepropojí uvnitř slova "baletě"),
+- text uvnitř URL adres se nepropojuje.
+
+Skloňované tvary termínů ("Petipovi", "Harappské kultury") se berou z indexu
+data/inflection/variants.json (generuje scripts/czech_inflection.py)
+a propojují se na URL základního termínu.
+"""
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TERM_LINKS_DIR = PROJECT_ROOT / "data" / "term_links"
+COMMON_TERMS_FILE = "common_terms.json"
+VARIANTS_PATH = PROJECT_ROOT / "data" / "inflection" / "variants.json"
+
+URL_PATTERN = re.compile(r"https?://\S+")
+
+
+def read_terms(path: Path) -> dict:
+    """Načte slovník termín -> URL z jednoho souboru term_links (chybějící soubor = prázdný)"""
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {term: url for term, url in data.get("terms", {}).items() if term and term.strip() and url}
+
+
+def load_topic_terms(topic_id: str, term_links_dir: Path = TERM_LINKS_DIR) -> dict:
+    """Společné termíny sloučené s termíny tématu (termíny tématu mají přednost)"""
+    terms = read_terms(term_links_dir / COMMON_TERMS_FILE)
+    terms.update(read_terms(term_links_dir / f"{topic_id}_terms.json"))
+    return terms
+
+
+def load_variants(path: Path = VARIANTS_PATH) -> dict:
+    """Načte index skloňovaných tvarů termín -> [tvary] (chybějící index = žádné tvary)"""
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("variants", {})
+
+
+def fold(text: str) -> str:
+    """Převede text na malá písmena se zachováním délky (pozice shod sedí na původní text)"""
+    return "".join(lower if len(lower := char.lower()) == 1 else char for char in text)
+
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def ordered_terms(terms: dict) -> list[tuple[str, str]]:
+    """
+    Seřadí termíny od nejdelšího (stabilně) a vynechá duplicity lišící se jen velikostí písmen.
+
+    Ze stejně znějících termínů zůstane první, stejně jako při dosavadním
+    propojování v prohlížeči.
+    """
+    seen = set()
+    result = []
+    for term, url in sorted(terms.items(), key=lambda item: -len(item[0])):
+        key = fold(term)
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append((term, url))
+    return result
+
+
+def with_variants(terms: dict, variants: dict) -> dict:
+    """
+    Termíny doplněné o skloňované tvary: tvar -> URL základního termínu.
+
+    Tvar, který je zároveň samostatným termínem, ponechá URL toho termínu.
+    """
+    expanded = dict(terms)
+    keys = {fold(term) for term in terms}
+    for term, url in terms.items():
+        for form in variants.get(term, ()):
+            key = fold(form)
+            if key not in keys:
+                keys.add(key)
+                expanded[form] = url
+    return expanded
+
+
+def term_table(terms: dict, used=None) -> dict:
+    """
+    Kompaktní tabulka termínů pro web: termíny seřazené od nejdelšího a indexy do tabulky URL.
+
+    Termíny se stejnou URL (např. "Bach" a "Johann Sebastian Bach") sdílejí
+    jeden záznam v urls, takže se URL v souboru neopakují. Je-li zadáno used
+    (množina termínů), tabulka obsahuje jen tyto termíny.
+    """
+    urls = []
+    url_index = {}
+    table = {"terms": [], "links": []}
+    for term, url in ordered_terms(terms):
+        if used is not None and term not in used:
+            continue
+        if url not in url_index:
+            url_index[url] = len(urls)
+            urls.append(url)
+        table["terms"].append(term)
+        table["links"].append(url_index[url])
+    table["urls"] = urls
+    return table
+
+
+class TermMatcher:
+    """
+    Automat Aho–Corasick nad termíny jednoho tématu.
+
+    Použití:
+        matcher = TermMatcher(load_topic_terms("T01"), load_variants())
+        for start, end, url in matcher.find(text): ...
+        linked = matcher.link(text)   # "[Petipovi](https://...)"
+
+    Skloňované tvary jsou v automatu jako samostatné vzory; counts a count()
+    je ale počítají k základnímu termínu, matched obsahuje vzory, které
+    link() opravdu propojil (tvary pro tabulku termínů na webu).
+    """
+
+    def __init__(self, terms: dict, variants=None):
+        variants = variants or {}
+        self.terms = ordered_terms(with_variants(terms, variants))
+        self.urls = [url for _, url in self.terms]
+        # Základní termín každého vzoru (u tvaru termín, ze kterého byl odvozen)
+        canonical = {fold(term): term for term, _ in ordered_terms(terms)}
+        self.base_terms = len(canonical)
+        for term in terms:
+            for form in variants.get(term, ()):
+                canonical.setdefault(fold(form), term)
+        self.canonical = [canonical[fold(term)] for term, _ in self.terms]
+        # Kolikrát link() propojil který termín (podle klíče v terms) a které vzory při tom použil
+        self.counts = Counter()
+        self.matched = set()
+        # Uzly automatu: přechody, zpětný odkaz (fail) a nejbližší koncový uzel po zpětných odkazech
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [-1]
+        self._dict_link = [0]
+        self._lengths = []
+        self._bounded = []
+        for index, (term, _) in enumerate(self.terms):
+            self._add(fold(term), index)
+            self._lengths.append(len(term))
+            self._bounded.append((is_word_char(term[0]), is_word_char(term[-1])))
+        self._build()
+
+    def __len__(self):
+        return self.base_terms
+
+    def _add(self, pattern: str, index: int):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(-1)
+                self._dict_link.append(0)
+                self._goto[node][char] = next_node
+            node = next_node
+        self._output[node] = index
+
+    def _build(self):
+        """Dopočítá zpětné odkazy průchodem do šířky"""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                target = self._fail[child]
+                self._dict_link[child] = target if self._output[target] >= 0 else self._dict_link[target]
+                queue.append(child)
+
+    def _candidates(self, text: str, folded: str):
+        """Všechny shody (start, end, index termínu), které stojí na hranicích slov"""
+        goto, fail, output, dict_link = self._goto, self._fail, self._output, self._dict_link
+        length = len(text)
+        node = 0
+        for position, char in enumerate(folded):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = node if output[node] >= 0 else dict_link[node]
+            end = position + 1
+            while match:
+                index = output[match]
+                start = end - self._lengths[index]
+                bounded_start, bounded_end = self._bounded[index]
+                if ((not bounded_start or start == 0 or not is_word_char(text[start - 1]))
+                        and (not bounded_end or end == length or not is_word_char(text[end]))):
+                    yield start, end, index
+                match = dict_link[match]
+
+    @property
+    def linked(self) -> int:
+        """Celkový počet odkazů vytvořených metodou link()"""
+        return sum(self.counts.values())
+
+    def find(self, text: str) -> list[tuple[int, int, str]]:
+        """
+        Najde nepřekrývající se výskyty termínů v textu.
+
+        Returns:
+            Seznam (start, end, url) seřazený podle pozice
+        """
+        return [(start, end, self.urls[index]) for start, end, index in self._select(text)]
+
+    def count(self, text: str) -> Counter:
+        """Spočítá výskyty jednotlivých termínů v textu (termín -> počet)"""
+        return Counter(self.canonical[index] for _, _, index in self._select(text))
+
+    def _select(self, text: str) -> list[tuple[int, int, int]]:
+        """Nepřekrývající se shody (start, end, index termínu), vždy nejlevější a z nich nejdelší"""
+        if not text or not self.terms:
+            return []
+        protected = [match.span() for match in URL_PATTERN.finditer(text)]
+        candidates = sorted(self._candidates(text, fold(text)), key=lambda c: (c[0], c[0] - c[1]))
+        matches = []
+        last_end = 0
+        protected_index = 0
+        for start, end, index in candidates:
+            if start < last_end:
+                continue
+            while protected_index < len(protected) and protected[protected_index][1] <= start:
+                protected_index += 1
+            if protected_index < len(protected) and protected[protected_index][0] < end:
+                continue
+            matches.append((start, end, index))
+            last_end = end
+        return matches
+
+    def link(self, text: str) -> str:
+        """Vrátí text s termíny převedenými na odkazy [termín](url), jak je vykresluje markdownToHtml"""
+        matches = self._select(text)
+        if not matches:
+            return text
+        parts = []
+        position = 0
+        for start, end, index in matches:
+            self.counts[self.canonical[index]] += 1
+            self.matched.add(self.terms[index][0])
+            parts.append(text[position:start])
+            parts.append(f"[{text[start:end]}]({link_target(self.urls[index])})")
+            position = end
+        parts.append(text[position:])
+        return "".join(parts)
+
+
+def link_target(url: str) -> str:
+    """URL bezpečná uvnitř [text](url): závorky a hvězdičky se zakódují, aby je markdown nezměnil"""
+    return url.replace("(", "%28").replace(")", "%29").replace("*", "%2A").replace(" ", "%20")
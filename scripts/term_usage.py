@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Index použití termínů z data/term_links v obsahu témat
+
+Projde všechny textové soubory témat (materiály, osnova, přepisy, audio-scénáře,
+flashcards, kvízy) a sestaví invertovaný index termín -> (téma, pole, počet
+výskytů); skloňované tvary z data/inflection/variants.json se počítají
+k základnímu termínu. Z něj vypíše:
+- nepoužité termíny: jsou v TXX_terms.json, ale v zobrazovaném obsahu tématu
+  (materiály, osnova, přepisy) se nevyskytují, takže se nikdy nepropojí,
+- termíny bez jediného výskytu v celém obsahu (kandidáti na smazání nebo opravu),
+- pokrytí tématu: počet odkazů na 1000 slov, sekce materiálů bez odkazu
+  a termíny jiných témat, které se v obsahu vyskytují, ale tady chybí.
+
+Tabulky termínů pro web (data/prelinked/terms/) obsahují jen použité termíny,
+zapisuje je scripts/prerender_term_links.py.
+
+Použití:
+    python scripts/term_usage.py                        # přehled všech témat
+    python scripts/term_usage.py T01 --details          # s výpisem nepoužitých termínů
+    python scripts/term_usage.py --output usage.json    # uloží index do JSON
+"""
+
+import sys
+import json
+import argparse
+from collections import Counter
+from pathlib import Path
+
+# Fix Windows console encoding for Czech characters
+if sys.platform == "win32":
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+from term_matcher import (PROJECT_ROOT, TERM_LINKS_DIR, COMMON_TERMS_FILE, TermMatcher, load_topic_terms,
+                          load_variants, read_terms)
+from prerender_term_links import TOPICS_DIR, topic_sources
+
+AUDIO_SCRIPTS_DIR = PROJECT_ROOT / "data" / "audio_scripts"
+
+# Pole, ve kterých stránka tématu termíny propojuje
+LINKED_FIELDS = ("materials", "summary", "transcripts")
+
+
+def read_text(path: Path) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def read_json(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def topic_texts(topic: dict) -> list[tuple[str, str, str]]:
+    """
+    Vrátí texty tématu jako seznam (pole, popis, text).
+
+    Popis určuje místo v tématu (např. nadpis sekce materiálů), aby šlo
+    ukázat, kde odkazy chybí. Nečitelné soubory se přeskočí s varováním.
+    """
+    topic_id = topic["id"]
+    texts = []
+
+    def add(field, label, loader):
+        try:
+            texts.extend((field, item_label, text) for item_label, text in loader() if text)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] {topic_id}: {label} nelze nacist ({e})")
+
+    for kind, source in topic_sources(topic):
+        path = PROJECT_ROOT / source
+        if kind == "materials":
+            add("materials", source, lambda: [
+                (section.get("heading") or f"sekce {index + 1}", section.get("content", ""))
+                for index, section in enumerate(read_json(path).get("sections", []))
+            ])
+        elif source == topic.get("summarySource"):
+            add("summary", source, lambda: [(source, read_text(path))])
+        else:
+            add("transcripts", source, lambda: [(source, read_text(path))])
+
+    for path in sorted(AUDIO_SCRIPTS_DIR.glob(f"{topic_id}*.txt")):
+        add("audio_scripts", path.name, lambda: [(path.name, read_text(path))])
+    if topic.get("flashcardSource"):
+        path = PROJECT_ROOT / topic["flashcardSource"]
+        add("flashcards", topic["flashcardSource"], lambda: [
+            (f"karta {index + 1}", f"{card.get('q', '')}\n{card.get('a', '')}")
+            for index, card in enumerate(read_json(path).get("flashcards", []))
+        ])
+    if topic.get("quizSource"):
+        path = PROJECT_ROOT / topic["quizSource"]
+        add("quiz", topic["quizSource"], lambda: [
+            (f"otazka {index + 1}", "\n".join([question.get("question", "")] + list(question.get("answers", []))
+                                                + [question.get("explanation", "")]))
+            for index, question in enumerate(read_json(path).get("questions", []))
+        ])
+    return texts
+
+
+def build_usage(topic_paths: list[Path]) -> dict:
+    """
+    Sestaví invertovaný index a statistiky pokrytí.
+
+    Returns:
+        {"index": {termín: [{"topic", "field", "count"}]}, "topics": {ID: statistiky}}
+    """
+    topics = [read_json(path) for path in topic_paths]
+    topic_ids = [topic["id"] for topic in topics]
+
+    # Všechny termíny všech témat v jednom automatu (pro index a návrhy chybějících odkazů)
+    all_terms = read_terms(TERM_LINKS_DIR / COMMON_TERMS_FILE)
+    for topic_id in topic_ids:
+        for term, url in read_terms(TERM_LINKS_DIR / f"{topic_id}_terms.json").items():
+            all_terms.setdefault(term, url)
+    variants = load_variants()
+    corpus_matcher = TermMatcher(all_terms, variants)
+
+    index = {}
+    stats = {}
+    for topic in topics:
+        topic_id = topic["id"]
+        own_terms = read_terms(TERM_LINKS_DIR / f"{topic_id}_terms.json")
+        matcher = TermMatcher(load_topic_terms(topic_id), variants)
+        own_keys = {term.casefold() for term in matcher.canonical}
+
+        field_counts = {}
+        linked = Counter()
+        suggestions = Counter()
+        words = 0
+        unlinked_sections = []
+        for field, label, text in topic_texts(topic):
+            counts = corpus_matcher.count(text)
+            field_counts.setdefault(field, Counter()).update(counts)
+            if field not in LINKED_FIELDS:
+                continue
+            own = matcher.count(text)
+            linked.update(own)
+            words += len(text.split())
+            if field == "materials" and not own and len(text.split()) >= 30:
+                unlinked_sections.append(label)
+            for term, count in counts.items():
+                if term.casefold() not in own_keys:
+                    suggestions[term] += count
+
+        for field, counts in field_counts.items():
+            for term, count in counts.items():
+                index.setdefault(term, []).append({"topic": topic_id, "field": field, "count": count})
+
+        links = sum(linked.values())
+        stats[topic_id] = {
+            "terms": len(own_terms),
+            "used": sorted(term for term in own_terms if linked[term]),
+            "unused": sorted(term for term in own_terms if not linked[term]),
+            "links": links,
+            "words": words,
+            "links_per_1000_words": round(1000 * links / words, 1) if words else 0.0,
+            "unlinked_sections": unlinked_sections,
+            "missing": dict(suggestions.most_common()),
+        }
+
+    never = sorted(term for term in all_terms if term not in index)
+    common = read_terms(TERM_LINKS_DIR / COMMON_TERMS_FILE)
+    unused_common = sorted(
+        term for term in common
+        if not any(entry["field"] in LINKED_FIELDS for entry in index.get(term, []))
+    )
+    return {"index": index, "topics": stats, "never_matching": never, "unused_common": unused_common}
+
+
+def print_report(usage: dict, details: bool):
+    """Vypíše pokrytí témat a nepoužité termíny"""
+    print(f"{'Tema':<6} {'terminu':>8} {'pouzito':>8} {'odkazu':>7} {'slov':>7} {'na 1000 slov':>13} "
+          f"{'sekci bez odkazu':>17}")
+    total_terms = total_used = 0
+    for topic_id, stats in usage["topics"].items():
+        total_terms += stats["terms"]
+        total_used += len(stats["used"])
+        print(f"{topic_id:<6} {stats['terms']:>8} {len(stats['used']):>8} {stats['links']:>7} {stats['words']:>7} "
+              f"{stats['links_per_1000_words']:>13.1f} {len(stats['unlinked_sections']):>17}")
+
+    print(f"\nCelkem: {total_used} z {total_terms} terminu se v zobrazovanem obsahu vyskytuje, "
+          f"{total_terms - total_used} nepouzitych")
+    print(f"Terminy bez jedineho vyskytu v celem obsahu: {len(usage['never_matching'])}")
+    if usage["unused_common"]:
+        print(f"Nepouzite spolecne terminy: {', '.join(usage['unused_common'])}")
+
+    if not details:
+        print("\nPodrobnosti (nepouzite terminy, sekce bez odkazu, chybejici odkazy): --details")
+        return
+    for topic_id, stats in usage["topics"].items():
+        print(f"\n{topic_id}:")
+        if stats["unused"]:
+            print(f"  Nepouzite ({len(stats['unused'])}): {', '.join(stats['unused'])}")
+        if stats["unlinked_sections"]:
+            print(f"  Sekce materialu bez odkazu: {', '.join(stats['unlinked_sections'])}")
+        if stats["missing"]:
+            missing = [f"{term} ({count}x)" for term, count in list(stats["missing"].items())[:15]]
+            print(f"  Terminy jinych temat bez odkazu zde: {', '.join(missing)}")
+    if usage["never_matching"]:
+        print(f"\nBez jedineho vyskytu: {', '.join(usage['never_matching'])}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Index použití termínů a pokrytí témat odkazy")
+    parser.add_argument("topics", nargs="*", help="ID témat (výchozí všechna), např. T01 T02")
+    parser.add_argument("--details", action="store_true",
+                        help="vypsat nepoužité termíny, sekce bez odkazu a chybějící odkazy po tématech")
+    parser.add_argument("--output", type=Path, help="uložit index a statistiky do JSON souboru")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    if args.topics:
+        topic_paths = [TOPICS_DIR / f"{topic_id.upper()}.json" for topic_id in args.topics]
+        missing = [path for path in topic_paths if not path.exists()]
+        for path in missing:
+            print(f"[ERROR] Topic JSON neexistuje: {path}")
+        topic_paths = [path for path in topic_paths if path.exists()]
+    else:
+        topic_paths = sorted(TOPICS_DIR.glob("T[0-9][0-9].json"))
+
+    usage = build_usage(topic_paths)
+    print_report(usage, args.details)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(usage, f, ensure_ascii=False, indent=2)
+        print(f"\n[OK] Index ulozen do {args.output}")
+
+
+if __name__ == "__main__":
+    main()
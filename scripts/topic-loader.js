@@ -7,6 +7,7 @@ class TopicLoader {
   constructor() {
     this.topics = [];
     this.currentTopicId = null;
+    this.prelinkedManifest = null;
   }
 
   /**
@@ -70,6 +71,9 @@ class TopicLoader {
         throw new Error(`Otázka ${topicId} má neplatnou strukturu: chybí id nebo title`);
       }
       
+      // Use copies of the texts with term links added at build time, if there are any
+      await this.applyPrelinkedSources(topic);
+      
       // Load materials from external file if materialsSource is specified
       if (topic.materialsSource) {
         try {
@@ -193,6 +197,55 @@ class TopicLoader {
     }
   }
 
+  /**
+   * Load the manifest of pre-linked content (written by scripts/prerender_term_links.py)
+   * The manifest is fetched once and shared by all topics.
+   * @returns {Promise<Object>} Manifest entries by topic ID (empty if there is no manifest)
+   */
+  loadPrelinkedManifest() {
+    if (!this.prelinkedManifest) {
+      this.prelinkedManifest = fetch('data/prelinked/manifest.json')
+        .then(response => (response.ok ? response.json() : {}))
+        .then(manifest => manifest.topics || {})
+        .catch(error => {
+          console.warn('Nepodařilo se načíst manifest předem propojeného obsahu:', error);
+          return {};
+        });
+    }
+    return this.prelinkedManifest;
+  }
+
+  /**
+   * Point the topic's text sources to their pre-linked copies and mark the topic as pre-linked
+   * (term links are then already in the texts and are not searched for in the browser)
+   * @param {Object} topic - Topic object
+   */
+  async applyPrelinkedSources(topic) {
+    const entry = (await this.loadPrelinkedManifest())[topic.id];
+    if (!entry || !entry.sources) {
+      return;
+    }
+    const prelinked = (source) => entry.sources[source] || source;
+    
+    if (topic.materialsSource) {
+      topic.materialsSource = prelinked(topic.materialsSource);
+    }
+    if (topic.summarySource) {
+      topic.summarySource = prelinked(topic.summarySource);
+    }
+    if (topic.audio) {
+      if (topic.audio.transcriptSource) {
+        topic.audio.transcriptSource = prelinked(topic.audio.transcriptSource);
+      }
+      (topic.audio.files || []).forEach(file => {
+        if (file.transcriptSource) {
+          file.transcriptSource = prelinked(file.transcriptSource);
+        }
+      });
+    }
+    topic.prelinked = true;
+  }
+
   /**
    * Get topic by ID
    * @param {string} topicId - The topic ID
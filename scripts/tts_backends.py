@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Backendy pro syntézu řeči používané generátorem audia
+
+Generátor pracuje s libovolným backendem, který umí dvě věci:
+- stream(text, voice, rate, pitch): asynchronně vrací události stejného tvaru
+  jako edge_tts.Communicate.stream() ({"type": "audio", "data": ...} a
+  {"type": "WordBoundary", "offset": ..., "duration": ..., "text": ...})
+- list_voices(): vrátí seznam hlasů ve formátu edge_tts.list_voices()
+
+Výchozí backend je Microsoft Edge TTS. Backend "silent" je offline náhrada,
+která s realistickou latencí vrací platné tiché MP3 rámce - slouží k měření
+propustnosti plánování, cache a skládání MP3 bez přístupu k síti.
+"""
+
+import asyncio
+import os
+import random
+from typing import AsyncIterator, Protocol
+
+from mp3_frames import make_silent_frame
+
+
+class TTSBackend(Protocol):
+    """Rozhraní backendu pro syntézu řeči"""
+
+    name: str
+    version: str
+
+    def stream(self, text: str, voice: str, rate: str, pitch: str) -> AsyncIterator[dict]:
+        ...
+
+    async def list_voices(self) -> list[dict]:
+        ...
+
+
+class EdgeTTSBackend:
+    """Microsoft Edge TTS (knihovna edge-tts, zdarma a bez API klíče)"""
+
+    name = "edge"
+
+    def __init__(self):
+        try:
+            import edge_tts
+        except ImportError:
+            raise RuntimeError("Knihovna edge-tts neni nainstalovana (pip install edge-tts)")
+        self._edge_tts = edge_tts
+        self.version = f"edge-tts/{getattr(edge_tts, '__version__', 'unknown')}"
+
+    def _communicate(self, text: str, voice: str, rate: str, pitch: str):
+        # edge-tts 7.x posílá ve výchozím stavu jen hranice vět, hranice slov je nutné vyžádat;
+        # starší verze parametr boundary neznají a hranice slov posílají vždy
+        try:
+            return self._edge_tts.Communicate(text, voice, rate=rate, pitch=pitch, boundary="WordBoundary")
+        except TypeError:
+            return self._edge_tts.Communicate(text, voice, rate=rate, pitch=pitch)
+
+    async def stream(self, text: str, voice: str, rate: str, pitch: str) -> AsyncIterator[dict]:
+        communicate = self._communicate(text, voice, rate, pitch)
+        async for chunk in communicate.stream():
+            yield chunk
+
+    async def list_voices(self) -> list[dict]:
+        return await self._edge_tts.list_voices()
+
+
+class SilentTTSBackend:
+    """
+    Offline náhrada za Edge TTS - vrací tiché MP3 rámce a hranice slov
+    rovnoměrně rozložené po délce audia.
+
+    Délka audia odpovídá délce textu (chars_per_second), odpověď přichází
+    se zadanou latencí (latency ± jitter sekund) a rámce mají zvolenou
+    bitrate a frekvenci, takže objem dat odpovídá skutečnému výstupu.
+    S failure_rate > 0 náhodně selhává jako přetížená služba (ConnectionError),
+    což slouží k ověření opakování a zpomalování požadavků.
+    """
+
+    name = "silent"
+    version = "silent/1"
+
+    def __init__(
+        self,
+        latency: float = 0.3,
+        jitter: float = 0.1,
+        bitrate: int = 48,
+        sample_rate: int = 24000,
+        chars_per_second: float = 15.0,
+        stream_chunk_frames: int = 32,
+        failure_rate: float = 0.0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.chars_per_second = chars_per_second
+        self.stream_chunk_frames = stream_chunk_frames
+        self.failure_rate = failure_rate
+        self.frame = make_silent_frame(bitrate, sample_rate)
+        self.frame_seconds = (1152 if sample_rate >= 32000 else 576) / sample_rate
+
+    async def stream(self, text: str, voice: str, rate: str, pitch: str) -> AsyncIterator[dict]:
+        delay = max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+        await asyncio.sleep(delay)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise ConnectionError("Simulovane preteceni sluzby (silent backend)")
+        total_frames = max(1, round(len(text) / self.chars_per_second / self.frame_seconds))
+        # Hranice slov v jednotkách 100 ns jako u Edge TTS, délka slova úměrná počtu znaků
+        ticks_per_char = int(10_000_000 / self.chars_per_second)
+        offset = 0
+        for word in text.split():
+            duration = len(word) * ticks_per_char
+            yield {"type": "WordBoundary", "offset": offset, "duration": duration, "text": word}
+            offset += duration + ticks_per_char
+        sent = 0
+        while sent < total_frames:
+            count = min(self.stream_chunk_frames, total_frames - sent)
+            yield {"type": "audio", "data": self.frame * count}
+            sent += count
+            # Předej řízení ostatním úlohám, jako by data přicházela po síti
+            await asyncio.sleep(0)
+
+    async def list_voices(self) -> list[dict]:
+        return [
+            {"ShortName": "cs-CZ-VlastaNeural", "FriendlyName": "Silent Vlasta", "Locale": "cs-CZ", "Gender": "Female"},
+            {"ShortName": "cs-CZ-AntoninNeural", "FriendlyName": "Silent Antonin", "Locale": "cs-CZ", "Gender": "Male"},
+        ]
+
+
+BACKENDS = {
+    "edge": EdgeTTSBackend,
+    "silent": SilentTTSBackend,
+}
+
+
+def create_backend(name: str) -> TTSBackend:
+    """
+    Vytvoří backend podle názvu.
+
+    Backend "silent" se konfiguruje proměnnými prostředí SILENT_TTS_LATENCY,
+    SILENT_TTS_JITTER, SILENT_TTS_BITRATE, SILENT_TTS_SAMPLE_RATE
+    a SILENT_TTS_FAILURE_RATE.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Neznamy TTS backend: {name} (dostupne: {', '.join(BACKENDS)})")
+    if name == "silent":
+        return SilentTTSBackend(
+            latency=float(os.getenv("SILENT_TTS_LATENCY", "0.3")),
+            jitter=float(os.getenv("SILENT_TTS_JITTER", "0.1")),
+            bitrate=int(os.getenv("SILENT_TTS_BITRATE", "48")),
+            sample_rate=int(os.getenv("SILENT_TTS_SAMPLE_RATE", "24000")),
+            failure_rate=float(os.getenv("SILENT_TTS_FAILURE_RATE", "0")),
+        )
+    return BACKENDS[name]()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Lokální cache syntetizovaných vět pro generátor audia
+
+Každá věta se ukládá jako samostatný soubor s MP3 rámci a vedle něj soubor
+s časy vyslovených slov (pro titulky). Klíčem je otisk
+normalizované věty, hlasu, rychlosti, výšky hlasu a TTS backendu, takže se opakující se věty
+(úvody, závěrečná shrnutí) syntetizují jen jednou pro všechna témata.
+Velikost cache je omezená, při překročení se mažou nejdéle nepoužité věty (LRU).
+"""
+
+import hashlib
+import json
+import os
+import time
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+
+def normalize_sentence(sentence: str) -> str:
+    """Normalizuje větu pro výpočet klíče (Unicode NFC, sjednocené mezery)"""
+    return " ".join(unicodedata.normalize("NFC", sentence).split())
+
+
+class SentenceCache:
+    """Cache MP3 rámců a časů slov pro jednotlivé věty s LRU mazáním podle velikosti"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evicted = 0
+        # klíč -> (velikost v bajtech, čas posledního použití)
+        self._entries: dict[str, tuple[int, float]] = {}
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        """Projde adresář cache a sestaví index velikostí a časů posledního použití"""
+        if not self.cache_dir.exists():
+            return
+        for sub_dir in self.cache_dir.iterdir():
+            if not sub_dir.is_dir():
+                continue
+            sizes: dict[str, int] = {}
+            for entry in os.scandir(sub_dir):
+                if entry.name.endswith(".mp3"):
+                    stat = entry.stat()
+                    key = entry.name[:-4]
+                    self._entries[key] = (stat.st_size, stat.st_mtime)
+                elif entry.name.endswith(".words.json"):
+                    sizes[entry.name[:-11]] = entry.stat().st_size
+            for key, size in sizes.items():
+                if key in self._entries:
+                    audio_size, last_used = self._entries[key]
+                    self._entries[key] = (audio_size + size, last_used)
+        self._total_bytes = sum(size for size, _ in self._entries.values())
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.mp3"
+
+    def _words_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.words.json"
+
+    @staticmethod
+    def make_key(sentence: str, voice: str, rate: str, pitch: str, engine: str) -> str:
+        """Spočítá klíč věty z normalizovaného textu, nastavení hlasu a verze TTS backendu"""
+        payload = json.dumps(
+            [normalize_sentence(sentence), voice, rate, pitch, engine],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def contains(self, key: str) -> bool:
+        """
+        Zjistí podle indexu (bez čtení souborů), zda je věta v cache.
+
+        Chybějící věta se započítá jako výpadek; nalezená se započítá až při get().
+        """
+        if key in self._entries:
+            return True
+        self.misses += 1
+        return False
+
+    def get(self, key: str) -> Optional[tuple[bytes, list]]:
+        """
+        Vrátí (MP3 rámce, časy slov) věty z cache, nebo None.
+
+        Záznam bez časů slov (z verze před titulky) se bere jako výpadek.
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            with open(self._words_path(key), "r", encoding="utf-8") as f:
+                words = [tuple(word) for word in json.load(f)]
+        except (OSError, ValueError):
+            self._forget(key)
+            self.misses += 1
+            return None
+        # Čas posledního použití se drží v mtime souboru, aby LRU přežilo mezi běhy
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        # Velikost záznamu zahrnuje i soubor s časy slov, mění se jen čas použití
+        size, _ = self._entries[key]
+        self._entries[key] = (size, now)
+        self.hits += 1
+        self.bytes_saved += len(data)
+        return data, words
+
+    def put(self, key: str, data: bytes, words: list):
+        """Uloží MP3 rámce a časy slov věty do cache a případně uvolní místo"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        words_payload = json.dumps(words, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        # Nejdřív časy slov, pak audio - záznam bez audia se při načítání indexu ignoruje
+        for target, payload in ((self._words_path(key), words_payload), (path, data)):
+            tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, target)
+        size = len(data) + len(words_payload)
+        if key in self._entries:
+            self._total_bytes -= self._entries[key][0]
+        self._entries[key] = (size, time.time())
+        self._total_bytes += size
+        self._evict()
+
+    def size_consistent(self) -> bool:
+        """Ověří, že sledovaná velikost cache odpovídá součtu velikostí záznamů"""
+        return self._total_bytes == sum(size for size, _ in self._entries.values())
+
+    def _forget(self, key: str):
+        size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def _evict(self):
+        """Smaže nejdéle nepoužité věty, dokud cache nepřesahuje limit"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        # Uvolni o něco víc než je nutné, aby se mazání nespouštělo po každé nové větě
+        target = int(self.max_bytes * 0.9)
+        for key, _ in sorted(self._entries.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= target:
+                break
+            for path in (self._path(key), self._words_path(key)):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._forget(key)
+            self.evicted += 1
+
+    def print_stats(self):
+        """Vypíše statistiku zásahů a výpadků cache"""
+        lookups = self.hits + self.misses
+        hit_rate = 100.0 * self.hits / lookups if lookups else 0.0
+        print(f"\nCache vet ({self.cache_dir}):")
+        print(f"  Zasahy: {self.hits}, vypadky: {self.misses} ({hit_rate:.0f}% zasahu)")
+        print(f"  Usetreno: {self.bytes_saved / 1024:.1f} KB audia bez syntezy")
+        print(f"  Velikost: {self._total_bytes / (1024 * 1024):.1f} / {self.max_bytes / (1024 * 1024):.0f} MB"
+              f" ({len(self._entries)} vet, smazano {self.evicted})")
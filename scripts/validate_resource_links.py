@@ -5,14 +5,12 @@ Script to validate all links in resource files and remove invalid ones.
 Checks for 404 errors, connection errors, and other HTTP issues.
 """
 
+import argparse
+import asyncio
 import json
 import os
 import sys
 from pathlib import Path
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import time
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -23,74 +21,54 @@ if sys.platform == 'win32':
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def create_session():
-    """Create a requests session with retry strategy."""
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    return session
+from link_checker import add_arguments, checker_from_args
+from link_index import check_index, index_resources, normalize_url
+from link_report import LinkReport, add_arguments as add_report_arguments, print_report_summary
 
-def is_valid_url(url, session, timeout=10):
+async def is_valid_url(url, checker):
     """
-    Check if a URL is valid by making a HEAD request.
-    Returns (is_valid, error_message)
+    Check if a URL is valid by making a HEAD request
+    (the checker retries as GET if the server does not support HEAD).
+    Returns (is_valid, error_message); is_valid is None when the check was undecided
     """
-    try:
-        # Some sites don't support HEAD, so we'll use GET with stream=True
-        # but only read headers
-        response = session.head(url, timeout=timeout, allow_redirects=True)
-        
-        # If HEAD fails, try GET
-        if response.status_code == 405:  # Method Not Allowed
-            response = session.get(url, timeout=timeout, stream=True, allow_redirects=True)
-            # Close the connection immediately since we don't need the body
-            response.close()
-        
-        status_code = response.status_code
-        
-        # Consider 2xx and 3xx as valid
-        if 200 <= status_code < 400:
-            return True, None
-        
-        # 4xx and 5xx are errors
-        if status_code == 404:
-            return False, f"404 Not Found"
-        elif status_code == 403:
-            return False, f"403 Forbidden"
-        elif status_code >= 400:
-            return False, f"HTTP {status_code}"
-        else:
-            return False, f"Unexpected status: {status_code}"
-            
-    except requests.exceptions.Timeout:
-        return False, "Timeout"
-    except requests.exceptions.ConnectionError as e:
-        return False, f"Connection Error: {str(e)[:50]}"
-    except requests.exceptions.TooManyRedirects:
-        return False, "Too Many Redirects"
-    except requests.exceptions.RequestException as e:
-        return False, f"Request Error: {str(e)[:50]}"
-    except Exception as e:
-        return False, f"Unexpected Error: {str(e)[:50]}"
+    response = await checker.fetch(url)
+    if response['error']:
+        return False, response['error']
+    
+    status_code = response['status']
+    
+    # Still throttled after being requeued: the link is not known to be broken nor working
+    if response.get('undecided'):
+        return None, f"Throttled (HTTP {status_code})"
+    
+    # Consider 2xx and 3xx as valid
+    if 200 <= status_code < 400:
+        return True, None
+    
+    # 4xx and 5xx are errors
+    if status_code == 404:
+        return False, f"404 Not Found"
+    elif status_code == 403:
+        # A refusal says nothing about whether the page exists (e.g. a stored result)
+        return None, f"403 Forbidden"
+    elif status_code >= 400:
+        return False, f"HTTP {status_code}"
+    else:
+        return False, f"Unexpected status: {status_code}"
 
-def validate_resource_file(file_path, session):
+def validate_resource_file(file_path, checks):
     """
     Validate all URLs in a resource file and return updated data with invalid links removed.
+    Uses results of the corpus-wide check (see validate_all_files).
     Returns (updated_data, removed_count, total_count)
     """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
     print(f"\n{'='*80}")
     print(f"Validating: {file_path}")
     print(f"{'='*80}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
     removed_count = 0
     total_count = 0
     
@@ -120,24 +98,50 @@ def validate_resource_file(file_path, session):
             print(f"  Checking: {title[:60]}...")
             print(f"    URL: {url}")
             
-            is_valid, error = is_valid_url(url, session)
+            is_valid, error = checks[normalize_url(url)]
             
             if is_valid:
                 print(f"    [OK] Valid")
                 valid_resources.append(resource)
+            elif is_valid is None:
+                # Undecided checks are repeated by the next run (or --resume), the resource stays
+                print(f"    [UNDECIDED] Kept: {error}")
+                valid_resources.append(resource)
             else:
                 print(f"    [INVALID] Invalid: {error}")
                 removed_count += 1
-            
-            # Be nice to servers
-            time.sleep(0.5)
         
         section['resources'] = valid_resources
     
     return data, removed_count, total_count
 
+async def validate_all_files(resource_files, checker, report):
+    """
+    Check every distinct URL of all resource files once, then validate the files in order.
+    Each result is appended to the report as soon as it is known; URLs already in the
+    report (resumed run) are not checked again.
+    Returns [(result, error)] in file order.
+    """
+    index = index_resources(resource_files)
+    index.print_stats('resource links')
+    checks = await check_index(index, report.wrap(index, lambda url: is_valid_url(url, checker)))
+    results = []
+    for file_path in resource_files:
+        try:
+            results.append((validate_resource_file(file_path, checks), None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Validate all links in resource files and remove invalid ones.')
+    add_arguments(parser)
+    add_report_arguments(parser, 'validate_resource_links')
+    return parser.parse_args()
+
 def main():
     """Main function to validate all resource files."""
+    args = parse_args()
     project_root = Path(__file__).parent.parent
     resources_dir = project_root / 'data' / 'resources'
     
@@ -153,17 +157,27 @@ def main():
     
     print(f"Found {len(resource_files)} resource file(s) to validate")
     
-    session = create_session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    checker = checker_from_args(args, retries=3)
+    report = LinkReport(args.report, resume=args.resume)
+    try:
+        results = asyncio.run(validate_all_files(resource_files, checker, report))
+    except KeyboardInterrupt:
+        print(f"\nInterrupted. {len(report.decided)} checked URLs are saved in {report.path}, "
+              f"continue with --resume")
+        return
+    finally:
+        checker.close()
+        report.close()
+    report.finish()
     
     total_removed = 0
     total_checked = 0
     
-    for file_path in resource_files:
+    for file_path, (result, error) in zip(resource_files, results):
         try:
-            updated_data, removed, checked = validate_resource_file(file_path, session)
+            if error:
+                raise error
+            updated_data, removed, checked = result
             total_removed += removed
             total_checked += checked
             
@@ -185,6 +199,8 @@ def main():
     print(f"Total links checked: {total_checked}")
     print(f"Total links removed: {total_removed}")
     print(f"Total links remaining: {total_checked - total_removed}")
+    print_report_summary(report.path)
+    checker.print_stats()
     print(f"{'='*80}")
 
 if __name__ == '__main__':
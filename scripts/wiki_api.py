@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batched Wikipedia page lookups through the MediaWiki query API.
+
+Checking a term link by requesting the article itself costs one request per
+page. The query API answers for up to 50 titles at once and, with
+redirects=1 and the disambiguation page property, tells in one response
+which pages are missing, where redirects lead and which pages are
+disambiguation pages.
+
+The same queries can also return interlanguage links (prop=langlinks), which
+is how English equivalents of Czech pages are found. Single pages that need a
+second look are checked through the REST page summary (a few hundred bytes
+of JSON with the disambiguation flag) instead of downloading the article.
+
+Requests go through the shared LinkChecker, so the per-host limits, timeouts
+and retries apply. Answers are kept in a local cache (WikiPageCache) with the
+TTLs of the link status store. The endpoint is configurable (--wiki-api),
+which lets the scripts run against a local stub server that mimics the API.
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from urllib.parse import quote, unquote, urlencode, urlsplit
+
+from link_index import normalize_url
+from link_status_store import DEFAULT_TTLS
+
+DEFAULT_API_URL = 'https://{host}/w/api.php'
+DEFAULT_REST_URL = 'https://{host}/api/rest_v1'
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'wiki_pages.json'
+CACHE_VERSION = 1
+
+# The API accepts at most 50 titles per query for normal clients
+MAX_TITLES_PER_QUERY = 50
+
+# Upper bound for one API response (50 pages take a few kB)
+API_MAX_BODY = 1024 * 1024
+
+# Upper bound for one page summary (usually 1-3 kB)
+SUMMARY_MAX_BODY = 64 * 1024
+
+
+def wiki_page_of(url):
+    """Return (host, title) of a Wikipedia article URL, or None for other URLs."""
+    parsed = urlsplit(url or '')
+    host = (parsed.hostname or '').lower()
+    if not host.endswith('wikipedia.org') or not parsed.path.startswith('/wiki/'):
+        return None
+    title = unquote(parsed.path[len('/wiki/'):]).replace('_', ' ').strip()
+    if not title:
+        return None
+    return host, title
+
+
+def page_url(host, title, fragment=None):
+    """Build the article URL of a page title."""
+    url = f"https://{host}/wiki/{quote(title.replace(' ', '_'), safe=':/(),!$*+;=@~-._')}"
+    if fragment:
+        url += '#' + quote(fragment.replace(' ', '_'), safe=':/(),!$*+;=@~-._')
+    return url
+
+
+def parse_query_response(data, titles):
+    """
+    Turn one action=query response into page infos for the requested titles.
+
+    Returns:
+        {requested title: page info} where page info is a dict with keys
+        exists, invalid, title (final title), redirected, fragment, disambiguation
+        and langlinks ({language: title}, only when they were requested).
+        Titles the response does not mention are left out.
+    """
+    query = data.get('query') or {}
+    normalized = {item['from']: item['to'] for item in query.get('normalized', [])}
+    redirects = {item['from']: item for item in query.get('redirects', [])}
+    pages = {page.get('title'): page for page in query.get('pages', [])}
+
+    infos = {}
+    for title in titles:
+        current = normalized.get(title, title)
+        fragment = None
+        redirected = False
+        seen = set()
+        while current in redirects and current not in seen:
+            seen.add(current)
+            redirect = redirects[current]
+            current = redirect['to']
+            fragment = redirect.get('tofragment') or fragment
+            redirected = True
+        page = pages.get(current)
+        if page is None:
+            continue
+        infos[title] = {
+            'exists': not page.get('missing') and not page.get('invalid'),
+            'invalid': bool(page.get('invalid')),
+            'title': current,
+            'redirected': redirected,
+            'fragment': fragment,
+            'disambiguation': 'disambiguation' in (page.get('pageprops') or {}),
+            'langlinks': {link['lang']: link['title'] for link in page.get('langlinks', [])},
+        }
+    return infos
+
+
+class WikiPageCache:
+    """Local cache of page infos answered by the API (existing pages 30 days, missing 7 days)."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, refresh=False):
+        """
+        Args:
+            path: JSON file with the cached page infos
+            refresh: Ignore cached entries (they are replaced by fresh answers)
+        """
+        self.path = Path(path)
+        self.refresh = refresh
+        self._entries = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self._entries = data.get('pages', {})
+            except Exception as e:
+                print(f"[WARNING] Could not read Wikipedia page cache {self.path}, starting empty: {e}")
+
+    @staticmethod
+    def _key(host, title, langlinks):
+        return f"{host}|{langlinks or ''}|{title}"
+
+    def get(self, host, title, langlinks=None):
+        """Return the cached page info if it is still fresh, otherwise None."""
+        if self.refresh:
+            return None
+        entry = self._entries.get(self._key(host, title, langlinks))
+        if not entry:
+            return None
+        ttl = DEFAULT_TTLS['ok'] if entry['info']['exists'] else DEFAULT_TTLS['not_found']
+        if time.time() - entry['checked_at'] >= ttl:
+            return None
+        return entry['info']
+
+    def put(self, host, title, langlinks, info):
+        self._entries[self._key(host, title, langlinks)] = {'info': info, 'checked_at': time.time()}
+        self._dirty = True
+
+    def save(self):
+        """Write the cache to disk (atomically), if anything changed."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'pages': self._entries}, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+class WikiResolver:
+    """
+    Resolve Wikipedia article URLs in batches of up to 50 titles per API call.
+
+    Usage:
+        resolver = WikiResolver(checker)
+        pages = await resolver.resolve_urls(urls)   # {normalized URL: page info}
+    """
+
+    def __init__(self, checker, api_url=DEFAULT_API_URL, batch_size=MAX_TITLES_PER_QUERY, cache=None,
+                 rest_url=DEFAULT_REST_URL):
+        """
+        Args:
+            checker: LinkChecker used for the API requests
+            api_url: API endpoint, {host} is replaced with the wiki host
+            batch_size: Titles per query (at most 50)
+            cache: Optional WikiPageCache with answers of previous runs
+            rest_url: REST API base used for page summaries, {host} is replaced too
+        """
+        self.checker = checker
+        self.api_url = api_url
+        self.rest_url = rest_url
+        self.batch_size = max(1, min(batch_size, MAX_TITLES_PER_QUERY))
+        self.cache = cache
+        self.queries = 0
+        self.titles = 0
+        self.cached = 0
+        self.unresolved = 0
+        self.summaries = 0
+
+    async def query(self, host, params):
+        """
+        Run one action=query call on a wiki.
+
+        Returns:
+            Decoded JSON response, or None when the request or the API failed
+        """
+        params = dict({'action': 'query', 'format': 'json', 'formatversion': '2'}, **params)
+        url = self.api_url.format(host=host) + '?' + urlencode(params, quote_via=quote)
+        self.queries += 1
+        response = await self.checker.fetch(url, method='GET', read_body=API_MAX_BODY)
+        if response['status'] != 200 or not response['body']:
+            return None
+        try:
+            data = json.loads(response['body'])
+        except ValueError:
+            return None
+        if 'error' in data:
+            return None
+        return data
+
+    async def page_summary(self, url):
+        """
+        Look up one article through the REST page summary endpoint.
+
+        Returns:
+            {'exists': bool, 'disambiguation': bool, 'title': final title}, or None
+            for URLs that are not Wikipedia articles and when the lookup failed
+        """
+        page = wiki_page_of(url)
+        if not page:
+            return None
+        host, title = page
+        summary_url = f"{self.rest_url.format(host=host)}/page/summary/{quote(title.replace(' ', '_'), safe='')}"
+        self.summaries += 1
+        response = await self.checker.fetch(summary_url, method='GET', read_body=SUMMARY_MAX_BODY)
+        if response['status'] == 404:
+            return {'exists': False, 'disambiguation': False, 'title': title}
+        if response['status'] != 200 or not response['body']:
+            return None
+        try:
+            data = json.loads(response['body'])
+        except ValueError:
+            return None
+        return {
+            'exists': True,
+            'disambiguation': data.get('type') == 'disambiguation',
+            'title': data.get('title', title),
+        }
+
+    async def _resolve_batch(self, host, titles, langlinks):
+        params = {
+            'titles': '|'.join(titles),
+            'redirects': '1',
+            'prop': 'pageprops',
+            'ppprop': 'disambiguation',
+        }
+        if langlinks:
+            params.update({'prop': 'pageprops|langlinks', 'lllang': langlinks, 'lllimit': 'max'})
+        data = await self.query(host, params)
+        if data is None:
+            return {}
+        return parse_query_response(data, titles)
+
+    async def resolve(self, host, titles, langlinks=None):
+        """
+        Resolve page titles of one wiki.
+
+        Args:
+            host: Wiki host (cs.wikipedia.org)
+            titles: Page titles
+            langlinks: Language code whose interlanguage links should be returned too
+
+        Returns:
+            {title: page info}; titles the API could not answer are left out
+        """
+        titles = list(dict.fromkeys(titles))
+        infos = {}
+        pending = []
+        for title in titles:
+            cached = self.cache.get(host, title, langlinks) if self.cache else None
+            if cached is not None:
+                infos[title] = cached
+            else:
+                pending.append(title)
+        self.titles += len(titles)
+        self.cached += len(titles) - len(pending)
+
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        results = await asyncio.gather(*(self._resolve_batch(host, batch, langlinks) for batch in batches))
+        for result in results:
+            infos.update(result)
+            if self.cache:
+                for title, info in result.items():
+                    self.cache.put(host, title, langlinks, info)
+        self.unresolved += len(titles) - len(infos)
+        return infos
+
+    async def resolve_urls(self, urls):
+        """
+        Resolve Wikipedia article URLs, grouped by wiki.
+
+        Returns:
+            {normalize_url(url): page info} with the final article URL added as
+            'url'. Other URLs and titles the API could not answer are left out,
+            callers check those the usual way.
+        """
+        by_host = {}
+        for url in urls:
+            page = wiki_page_of(url)
+            if page:
+                by_host.setdefault(page[0], {}).setdefault(page[1], []).append(url)
+
+        hosts = list(by_host)
+        results = await asyncio.gather(*(self.resolve(host, list(by_host[host])) for host in hosts))
+
+        pages = {}
+        for host, infos in zip(hosts, results):
+            for title, info in infos.items():
+                info = dict(info, url=page_url(host, info['title'], info['fragment']))
+                for url in by_host[host][title]:
+                    pages[normalize_url(url)] = info
+        return pages
+
+    def print_stats(self):
+        """Print how many titles were answered and how many requests that saved."""
+        # Without the API every title costs at least one request of its own
+        saved = self.titles - self.unresolved - self.queries
+        print(f"Wikipedia API: {self.titles} titles resolved in {self.queries} queries, "
+              f"{self.cached} from local cache ({saved} requests saved)"
+              + (f", {self.unresolved} left for direct checks" if self.unresolved else "")
+              + (f", {self.summaries} page summaries" if self.summaries else ""))
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.save()
+
+
+def add_arguments(parser):
+    """Add the Wikipedia API options to an argparse parser."""
+    parser.add_argument('--wiki-api', default=DEFAULT_API_URL,
+                        help='MediaWiki API endpoint, {host} is replaced with the wiki host '
+                             '(point it to a local stub server for testing)')
+    parser.add_argument('--wiki-rest', default=DEFAULT_REST_URL,
+                        help='Wikipedia REST API base used for page summaries, {host} is replaced with the wiki host')
+
+
+def resolver_from_args(args, checker):
+    """
+    Create a WikiResolver from options added by add_arguments().
+
+    The page cache follows the link checker's --no-store and --revalidate options.
+    """
+    cache = None
+    if not getattr(args, 'no_store', False):
+        cache = WikiPageCache(refresh=getattr(args, 'revalidate', False))
+    return WikiResolver(checker, api_url=args.wiki_api, cache=cache, rest_url=args.wiki_rest)